@@ -5,51 +5,134 @@ from langchain.callbacks.base import BaseCallbackHandler
 from typing import Any, Dict, List, Optional
 import json
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
+from collections import deque
+from dataclasses import dataclass, asdict, is_dataclass
 import os
+import functools
+import hashlib
+import importlib
+import socket
+import time
+import atexit
+import queue
+import threading
 import logging
-import requests
-
-# Disable AgentOps to avoid API key requirements
-os.environ['AGENTOPS_API_KEY'] = ''
-os.environ['AGENTOPS_DISABLED'] = 'true'
-os.environ['AGENTOPS_ENABLED'] = 'false'
+import logging.handlers
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        """Serialize to a JSON string; datetimes are encoded in C as ISO-8601 with a Z suffix"""
+        return orjson.dumps(obj, option=orjson.OPT_UTC_Z).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        """Serialize to a JSON string; datetimes are emitted as ISO-8601, dataclasses as objects"""
+        if is_dataclass(obj):
+            obj = asdict(obj)
+        return json.dumps(obj, default=lambda o: o.isoformat() if isinstance(o, datetime) else str(o))
+
+@functools.cache
+def _disable_agentops():
+    """Disable AgentOps to avoid API key requirements (applied once, before any crew is built)"""
+    os.environ['AGENTOPS_API_KEY'] = ''
+    os.environ['AGENTOPS_DISABLED'] = 'true'
+    os.environ['AGENTOPS_ENABLED'] = 'false'
 
 class CrewLoggerCallback(BaseCallbackHandler):
-    """Custom callback handler that integrates with CrewInteractionLogger"""
+    """
+    Custom callback handler that integrates with CrewInteractionLogger.
+
+    Log calls are queued on a bounded queue and dispatched by a single worker task
+    instead of spawning one task per event; events are dropped when the queue is full
+    so logging never back-pressures the crew.
+    """
+
+    MAX_QUEUED_LOGS = 1024
 
     def __init__(self, crew_logger):
         super().__init__()
         self.crew_logger = crew_logger
         self.current_agent = None
         self.current_task = None
+        self.dropped_logs = 0
+        self._log_q = asyncio.Queue(maxsize=self.MAX_QUEUED_LOGS)
+        self._drain_task = None
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+            logging.warning("CrewLoggerCallback created outside an event loop; interaction logging disabled")
+
+    def _queue_log(self, method: str, **kwargs):
+        """Queue a crew_logger call; safe to call from the crew's worker thread"""
+        if self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._put_log, method, kwargs)
+        except RuntimeError:
+            # Event loop already closed
+            pass
+
+    def _put_log(self, method: str, kwargs: Dict[str, Any]):
+        """Runs on the event loop: enqueue the call and make sure the worker is running"""
+        try:
+            self._log_q.put_nowait((method, kwargs))
+        except asyncio.QueueFull:
+            self.dropped_logs += 1
+            return
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = self._loop.create_task(self._drain_logs())
+
+    async def _drain_logs(self):
+        """Dispatch queued log calls in order until the queue is empty"""
+        while not self._log_q.empty():
+            method, kwargs = self._log_q.get_nowait()
+            try:
+                await getattr(self.crew_logger, method)(**kwargs)
+            except Exception as e:
+                logging.error(f"Failed to record crew interaction ({method}): {e}")
+        if self.dropped_logs:
+            logging.warning(f"CrewLoggerCallback dropped {self.dropped_logs} log events (queue full)")
+            self.dropped_logs = 0
 
     def on_agent_start(self, agent, **kwargs):
         """Called when an agent starts"""
         self.current_agent = agent.role
-        asyncio.create_task(self.crew_logger.log_agent_start(
+        self._queue_log(
+            'log_agent_start',
             agent_name=agent.role,
             role=agent.role,
             goal=agent.goal,
-            backstory=getattr(agent, 'backstory', '')
-        ))
+            backstory=getattr(agent, 'backstory', ''),
+            # CrewAI gives every Agent its own UUID; unique even for agents sharing a role
+            agent_id=str(agent.id)
+        )
 
     def on_agent_finish(self, agent, **kwargs):
         """Called when an agent finishes"""
-        asyncio.create_task(self.crew_logger.log_agent_complete(
+        self._queue_log(
+            'log_agent_complete',
             agent_name=agent.role,
             success=True
-        ))
+        )
 
     def on_tool_start(self, tool, input_str, **kwargs):
         """Called when a tool starts"""
         if self.current_agent:
-            asyncio.create_task(self.crew_logger.log_tool_call(
+            self._queue_log(
+                'log_tool_call',
                 agent_name=self.current_agent,
                 tool_name=tool.__class__.__name__,
                 function_name='execute',
                 params={'input': input_str}
-            ))
+            )
 
     def on_tool_end(self, output, **kwargs):
         """Called when a tool ends"""
@@ -60,42 +143,58 @@ class CrewLoggerCallback(BaseCallbackHandler):
         """Called when there's text output"""
         # Log reasoning steps if they contain thought patterns
         if self.current_agent and ('thought:' in text.lower() or 'action:' in text.lower()):
-            asyncio.create_task(self.crew_logger.log_agent_reasoning(
+            self._queue_log(
+                'log_agent_reasoning',
                 agent_name=self.current_agent,
                 thought=text,
                 action='processing'
-            ))
+            )
 
 # Lazy import for LLM classes to improve startup time
-_llm_classes = {}
-
+_PROVIDERS = {
+    'openai': ('langchain_openai', 'ChatOpenAI'),
+    'anthropic': ('langchain_anthropic', 'ChatAnthropic'),
+    'google': ('langchain_google_vertexai', 'ChatVertexAI'),
+    'ollama': ('langchain_community.llms', 'Ollama'),
+}
+
+@functools.lru_cache(maxsize=None)
 def get_llm_class(provider: str):
-    """Lazy load LLM classes to improve startup time"""
-    if provider not in _llm_classes:
-        if provider == 'openai':
-            from langchain_openai import ChatOpenAI
-            _llm_classes[provider] = ChatOpenAI
-        elif provider == 'anthropic':
-            from langchain_anthropic import ChatAnthropic
-            _llm_classes[provider] = ChatAnthropic
-        elif provider == 'google':
-            from langchain_google_vertexai import ChatVertexAI
-            _llm_classes[provider] = ChatVertexAI
-        elif provider == 'ollama':
-            from langchain_community.llms import Ollama
-            _llm_classes[provider] = Ollama
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
-    return _llm_classes[provider]
-
+    """Lazy load LLM classes to improve startup time (resolved once per provider)"""
+    if provider not in _PROVIDERS:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+    _disable_agentops()
+    module_name, class_name = _PROVIDERS[provider]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+# Cached result of the local Ollama reachability probe, refreshed at most every 60 s
+_OLLAMA_HOST = ('localhost', 11434)
+_OLLAMA_PROBE_TTL_SECONDS = 60
+_ollama_available: Optional[bool] = None
+_ollama_probe_ts = 0.0
+
+def is_ollama_available() -> bool:
+    """Check whether a local Ollama server is listening, caching the answer briefly"""
+    global _ollama_available, _ollama_probe_ts
+    now = time.monotonic()
+    if _ollama_available is None or now - _ollama_probe_ts > _OLLAMA_PROBE_TTL_SECONDS:
+        try:
+            # A TCP connect is enough to know the server is up; no HTTP round trip needed
+            with socket.create_connection(_OLLAMA_HOST, timeout=0.2):
+                _ollama_available = True
+        except OSError:
+            _ollama_available = False
+        _ollama_probe_ts = now
+    return _ollama_available
 
 def get_llm_and_model():
     """Get a default LLM instance for fallback scenarios"""
     try:
         # Try to use OpenAI with environment variable
-        openai_api_key = os.getenv('OPENAI_API_KEY')
+        openai_api_key = LLM_ENV.openai_key
         if openai_api_key:
-            from langchain_openai import ChatOpenAI
+            ChatOpenAI = get_llm_class('openai')
             return ChatOpenAI(
                 model="gpt-3.5-turbo",
                 api_key=openai_api_key,
@@ -103,9 +202,9 @@ def get_llm_and_model():
             )
 
         # Try to use Anthropic with environment variable
-        anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
+        anthropic_api_key = LLM_ENV.anthropic_key
         if anthropic_api_key:
-            from langchain_anthropic import ChatAnthropic
+            ChatAnthropic = get_llm_class('anthropic')
             return ChatAnthropic(
                 model="claude-3-haiku-20240307",
                 api_key=anthropic_api_key,
@@ -113,15 +212,9 @@ def get_llm_and_model():
             )
 
         # Try to use Ollama (local)
-        try:
-            from langchain_community.llms import Ollama
-            # Test if Ollama is available
-            import requests
-            response = requests.get('http://localhost:11434/api/tags', timeout=2)
-            if response.status_code == 200:
-                return Ollama(model="llama2", base_url="http://localhost:11434")
-        except:
-            pass
+        if is_ollama_available():
+            Ollama = get_llm_class('ollama')
+            return Ollama(model="llama2", base_url="http://localhost:11434")
 
         # If no LLM is available, raise an error
         raise Exception("No LLM provider available. Please configure OpenAI, Anthropic, or Ollama.")
@@ -131,151 +224,372 @@ def get_llm_and_model():
 
 # BaseTool is now properly imported from crewai.tools
 
+# =====================================================================================
+# Agent Log Payloads
+# =====================================================================================
+
+# Character limits for the previews sent to the client
+_PREVIEW_LIMIT = 200
+_OUTPUT_LIMIT = 500
+_GOAL_PREVIEW_LIMIT = 100
+
+def _truncate(obj, limit: int) -> str:
+    """Return at most limit characters of obj, with "..." appended when it was cut"""
+    if isinstance(obj, bytes):
+        # Decode only the slice that is kept
+        text = obj[:limit].decode('utf-8', errors='replace')
+        return text + "..." if len(obj) > limit else text
+    text = obj if isinstance(obj, str) else str(obj)
+    return text[:limit] + "..." if len(text) > limit else text
+
+@dataclass(slots=True, kw_only=True)
+class TokenLog:
+    """Streamed LLM token delta; stream names the output it belongs to ("report", "architecture")"""
+    type: str = "token"
+    agent: str
+    delta: str
+    stream: str = "report"
+
+@dataclass(slots=True, kw_only=True)
+class AgentActionLog:
+    """Agent tool invocation"""
+    type: str = "agent_action"
+    timestamp: datetime
+    agent_name: str
+    tool: str
+    tool_input: str
+    log: str
+    action_description: str
+
+@dataclass(slots=True, kw_only=True)
+class ToolResultLog:
+    """Successful tool output (truncated)"""
+    type: str = "tool_result"
+    timestamp: datetime
+    agent_name: str
+    output: str
+    status: str = "success"
+
+@dataclass(slots=True, kw_only=True)
+class ToolErrorLog:
+    """Tool failure"""
+    type: str = "tool_error"
+    timestamp: datetime
+    agent_name: str
+    error: str
+    status: str = "error"
+
+@dataclass(slots=True, kw_only=True)
+class AgentFinishLog:
+    """Agent task completion"""
+    type: str = "agent_finish"
+    timestamp: datetime
+    agent_name: str
+    output: str
+    status: str = "completed"
+
+@dataclass(slots=True, kw_only=True)
+class AgentStartLog:
+    """Agent task start"""
+    type: str = "agent_start"
+    timestamp: datetime
+    agent_name: str
+    goal: str
+    status: str = "started"
+
 # =====================================================================================
 # Agent Log Stream Handler for Real-time Monitoring
 # =====================================================================================
 
 class AgentLogStreamHandler(BaseCallbackHandler):
-    """Custom callback handler to stream agent interactions via WebSocket"""
+    """
+    Custom callback handler to stream agent interactions via WebSocket.
+
+    Events are buffered and flushed by a single task on the event loop, which drains
+    everything pending into one frame (a JSON array of the individual log messages)
+    instead of sending one WebSocket frame per event. The buffer is bounded and the
+    event loop is only woken once per flush rather than once per event.
+    """
+
+    # Upper bounds for a single batched frame, whichever is reached first
+    MAX_BATCH_EVENTS = 256
+    MAX_BATCH_BYTES = 4096
+    # When this many messages are buffered (e.g. a stalled client) the oldest are dropped
+    MAX_PENDING_MESSAGES = 1000
+    # How long a flush waits so that bursts (e.g. streamed tokens) share a frame
+    FLUSH_INTERVAL_SECONDS = 0.02
 
     def __init__(self, websocket=None):
         super().__init__()
+        self._pending = deque(maxlen=self.MAX_PENDING_MESSAGES)
+        self.reset(websocket)
+
+    def reset(self, websocket=None):
+        """Start over for a new crew run (the pending buffer is kept and must be empty)"""
         self.websocket = websocket
-        self.current_agent = None
+        self.set_current_agent(None)
         self.current_task = None
-
-    async def send_log(self, log_data: Dict[str, Any]):
-        """Send log data via WebSocket if available"""
-        if self.websocket:
+        self._flush_task = None
+        self._wakeup_scheduled = False
+        self.dropped_messages = 0
+        self._loop = None
+        if websocket:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                logging.warning("AgentLogStreamHandler created outside an event loop; WebSocket logs disabled")
+
+    def _enqueue(self, message: str):
+        """Queue a message for the flush task; safe to call from the crew's worker thread"""
+        if self._loop is None:
+            return
+        if len(self._pending) == self.MAX_PENDING_MESSAGES:
+            self.dropped_messages += 1
+        # deque.append is atomic (and evicts the oldest message once full), so the worker
+        # thread appends directly and only wakes the event loop when no wakeup is on its way
+        self._pending.append(message)
+        if not self._wakeup_scheduled:
+            self._wakeup_scheduled = True
             try:
-                await self.websocket.send_text(json.dumps(log_data))
+                self._loop.call_soon_threadsafe(self._schedule_flush)
+            except RuntimeError:
+                # Event loop already closed (e.g. the WebSocket handler has returned)
+                pass
+
+    def _schedule_flush(self):
+        """Runs on the event loop: make sure a flush task is draining the buffer"""
+        self._wakeup_scheduled = False
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = self._loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        """Drain pending messages into batched frames until the buffer is empty"""
+        await asyncio.sleep(self.FLUSH_INTERVAL_SECONDS)
+        while self._pending:
+            batch = []
+            batch_bytes = 0
+            while self._pending and len(batch) < self.MAX_BATCH_EVENTS and batch_bytes < self.MAX_BATCH_BYTES:
+                message = self._pending.popleft()
+                batch.append(message)
+                batch_bytes += len(message)
+            try:
+                await self.websocket.send_text(_dumps(batch))
             except Exception as e:
-                logging.error(f"Failed to send WebSocket log: {e}")
+                logging.error(f"Failed to send WebSocket log batch: {e}")
+                self._pending.clear()
+                return
+        if self.dropped_messages:
+            logging.warning(f"AgentLogStreamHandler dropped {self.dropped_messages} log messages (buffer full)")
+            self.dropped_messages = 0
+
+    def send_log(self, log_data: Any):
+        """Queue structured log data for the WebSocket if available"""
+        if self.websocket:
+            self._enqueue(_dumps(log_data))
 
-    async def send_detailed_log(self, agent_name, action, details):
-        """Send detailed human-readable log message"""
+    def send_detailed_log(self, agent_name, action, details):
+        """Queue a detailed human-readable log message"""
         if self.websocket:
-            try:
-                message = f"{agent_name}: {action}"
-                if details:
-                    message += f" - {details}"
-                await self.websocket.send_text(message)
-            except Exception as e:
-                logging.error(f"Failed to send detailed WebSocket log: {e}")
+            message = f"{agent_name}: {action}"
+            if details:
+                message += f" - {details}"
+            self._enqueue(message)
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> Any:
+        """Called for each token of a streaming LLM; forwards the delta to the client"""
+        if self.websocket and token:
+            self.send_log(TokenLog(agent=self._current_agent_role, delta=token))
 
     def on_agent_action(self, action, **kwargs: Any) -> Any:
         """Called when an agent takes an action"""
-        agent_name = getattr(self.current_agent, 'role', 'Unknown Agent')
-
-        log_data = {
-            "type": "agent_action",
-            "timestamp": datetime.utcnow().isoformat(),
-            "agent_name": agent_name,
-            "tool": action.tool,
-            "tool_input": str(action.tool_input),
-            "log": action.log if hasattr(action, 'log') else "",
-            "action_description": f"{agent_name} is using {action.tool}"
-        }
+        if self.websocket is None and not logger.isEnabledFor(logging.INFO):
+            return
+        agent_name = self._current_agent_role
+        tool = action.tool
+        tool_input = str(action.tool_input)
+
+        log_data = AgentActionLog(
+            timestamp=datetime.now(timezone.utc),
+            agent_name=agent_name,
+            tool=tool,
+            tool_input=tool_input,
+            log=getattr(action, 'log', ""),
+            action_description=f"{agent_name} is using {tool}"
+        )
 
         # Send detailed WebSocket message
         if self.websocket:
-            asyncio.create_task(self.send_detailed_log(f"🤖 {agent_name}", f"Using tool: {action.tool}", str(action.tool_input)[:200]))
-            asyncio.create_task(self.send_log(log_data))
+            tool_label = f"Using tool: {tool}"
+            input_preview = tool_input[:_PREVIEW_LIMIT]
+            self.send_detailed_log(self._action_label, tool_label, input_preview)
+            self.send_log(log_data)
 
-        logging.info(f"Agent Action: {log_data}")
+        logger.info("Agent Action: %s", log_data)
 
     def on_tool_end(self, output: str, **kwargs: Any) -> Any:
         """Called when a tool finishes execution"""
-        agent_name = getattr(self.current_agent, 'role', 'Unknown Agent')
-        output_preview = str(output)[:200] + "..." if len(str(output)) > 200 else str(output)
-
-        log_data = {
-            "type": "tool_result",
-            "timestamp": datetime.utcnow().isoformat(),
-            "agent_name": agent_name,
-            "output": str(output)[:500] + "..." if len(str(output)) > 500 else str(output),
-            "status": "success"
-        }
+        if self.websocket is None and not logger.isEnabledFor(logging.INFO):
+            return
+        agent_name = self._current_agent_role
+        # str and bytes are sliced in place; anything else is converted once
+        if not isinstance(output, (str, bytes)):
+            output = str(output)
+
+        log_data = ToolResultLog(
+            timestamp=datetime.now(timezone.utc),
+            agent_name=agent_name,
+            output=_truncate(output, _OUTPUT_LIMIT)
+        )
 
         if self.websocket:
-            asyncio.create_task(self.send_detailed_log(f"✅ {agent_name}", "Tool completed", output_preview))
-            asyncio.create_task(self.send_log(log_data))
+            self.send_detailed_log(self._result_label, "Tool completed", _truncate(output, _PREVIEW_LIMIT))
+            self.send_log(log_data)
 
-        logging.info(f"Tool Result: {log_data}")
+        logger.info("Tool Result: %s", log_data)
 
     def on_tool_error(self, error: Exception, **kwargs: Any) -> Any:
         """Called when a tool encounters an error"""
-        log_data = {
-            "type": "tool_error",
-            "timestamp": datetime.utcnow().isoformat(),
-            "agent_name": getattr(self.current_agent, 'role', 'Unknown Agent'),
-            "error": str(error),
-            "status": "error"
-        }
+        if self.websocket is None and not logger.isEnabledFor(logging.ERROR):
+            return
+        log_data = ToolErrorLog(
+            timestamp=datetime.now(timezone.utc),
+            agent_name=self._current_agent_role,
+            error=_truncate(error, _OUTPUT_LIMIT)
+        )
 
         if self.websocket:
-            asyncio.create_task(self.send_log(log_data))
+            self.send_log(log_data)
 
-        logging.error(f"Tool Error: {log_data}")
+        logger.error("Tool Error: %s", log_data)
 
     def on_agent_finish(self, finish, **kwargs: Any) -> Any:
         """Called when an agent finishes its task"""
-        agent_name = getattr(self.current_agent, 'role', 'Unknown Agent')
-
-        log_data = {
-            "type": "agent_finish",
-            "timestamp": datetime.utcnow().isoformat(),
-            "agent_name": agent_name,
-            "output": str(finish.return_values) if hasattr(finish, 'return_values') else str(finish),
-            "status": "completed"
-        }
+        if self.websocket is None and not logger.isEnabledFor(logging.INFO):
+            return
+        agent_name = self._current_agent_role
+
+        log_data = AgentFinishLog(
+            timestamp=datetime.now(timezone.utc),
+            agent_name=agent_name,
+            output=_truncate(getattr(finish, 'return_values', finish), _OUTPUT_LIMIT)
+        )
 
         if self.websocket:
-            asyncio.create_task(self.send_detailed_log(f"🎉 {agent_name}", "Task completed", "Moving to next agent"))
-            asyncio.create_task(self.send_log(log_data))
+            self.send_detailed_log(self._finish_label, "Task completed", "Moving to next agent")
+            self.send_log(log_data)
 
-        logging.info(f"Agent Finished: {log_data}")
+        logger.info("Agent Finished: %s", log_data)
 
     def on_agent_start(self, agent, **kwargs: Any) -> Any:
         """Called when an agent starts working"""
-        agent_name = getattr(agent, 'role', 'Unknown Agent')
-        self.current_agent = agent
-
-        log_data = {
-            "type": "agent_start",
-            "timestamp": datetime.utcnow().isoformat(),
-            "agent_name": agent_name,
-            "goal": getattr(agent, 'goal', 'No goal specified'),
-            "status": "started"
-        }
+        self.set_current_agent(agent)
+        if self.websocket is None and not logger.isEnabledFor(logging.INFO):
+            return
+        agent_name = self._current_agent_role
+
+        log_data = AgentStartLog(
+            timestamp=datetime.now(timezone.utc),
+            agent_name=agent_name,
+            goal=self._current_agent_goal or 'No goal specified'
+        )
 
         if self.websocket:
-            asyncio.create_task(self.send_detailed_log(f"🚀 {agent_name}", "Starting task", getattr(agent, 'goal', '')[:100]))
-            asyncio.create_task(self.send_log(log_data))
+            self.send_detailed_log(self._start_label, "Starting task", self._current_agent_goal[:_GOAL_PREVIEW_LIMIT])
+            self.send_log(log_data)
 
-        logging.info(f"Agent Started: {log_data}")
+        logger.info("Agent Started: %s", log_data)
 
     def set_current_agent(self, agent):
         """Set the current agent for context"""
         self.current_agent = agent
+        # Strings every callback needs, computed once per agent rather than per event
+        role = getattr(agent, 'role', 'Unknown Agent')
+        self._current_agent_role = role
+        self._current_agent_goal = getattr(agent, 'goal', '') or ''
+        self._action_label = f"🤖 {role}"
+        self._result_label = f"✅ {role}"
+        self._finish_label = f"🎉 {role}"
+        self._start_label = f"🚀 {role}"
 
     def set_current_task(self, task):
         """Set the current task for context"""
         self.current_task = task
 
-# Import other services and tools
-from .rag_service import RAGService
-from .graph_service import GraphService
-# Import crew_factory locally to avoid circular imports
+
+class LogHandlerPool:
+    """
+    Free list of AgentLogStreamHandlers, so that successive crews reuse a handler and
+    its preallocated message buffer instead of allocating new ones.
+
+    Crews get their handler from acquire(); once a crew has finished, release_crew()
+    returns its handlers, each one as soon as its last batch has been flushed.
+    """
+
+    MAX_IDLE_HANDLERS = 8
+    _idle: deque = deque()
+    _lock = threading.Lock()
+
+    @classmethod
+    def acquire(cls, websocket=None) -> AgentLogStreamHandler:
+        """Get an idle handler reset for the websocket, or a new one"""
+        with cls._lock:
+            handler = cls._idle.pop() if cls._idle else None
+        if handler is None:
+            return AgentLogStreamHandler(websocket=websocket)
+        handler.reset(websocket)
+        return handler
+
+    @classmethod
+    def release(cls, handler: AgentLogStreamHandler) -> None:
+        """Return a handler to the pool once it has nothing left to send"""
+        flush_task = handler._flush_task
+        if flush_task is not None and not flush_task.done():
+            flush_task.add_done_callback(lambda _: cls.release(handler))
+            return
+        if handler._pending:
+            return
+        handler.reset(None)
+        with cls._lock:
+            if len(cls._idle) < cls.MAX_IDLE_HANDLERS:
+                cls._idle.append(handler)
+
+    @classmethod
+    def release_crew(cls, crew) -> None:
+        """Return the log handlers among a finished crew's callbacks"""
+        for callback in getattr(crew, 'callbacks', None) or []:
+            if isinstance(callback, AgentLogStreamHandler):
+                cls.release(callback)
+
+
+class TokenStreamHandler(BaseCallbackHandler):
+    """
+    Forwards the tokens of one agent's streaming LLM to an AgentLogStreamHandler.
+
+    The agent and stream are fixed per handler, so tokens stay attributed correctly
+    while agents run concurrently.
+    """
+
+    def __init__(self, log_handler: AgentLogStreamHandler, agent: str, stream: str):
+        super().__init__()
+        self.log_handler = log_handler
+        self.agent = agent
+        self.stream = stream
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> Any:
+        """Called for each token of the streaming LLM"""
+        if token:
+            self.log_handler.send_log(TokenLog(agent=self.agent, delta=token, stream=self.stream))
+
+# Services and tools are imported by crew_factory, which is loaded lazily by the crew
+# builders below to avoid circular imports and keep this module cheap to import
 # from .diagramming_agent import create_diagramming_agent
-from ..tools.cloud_catalog_tool import CloudServiceCatalogTool
-from ..tools.compliance_tool import ComplianceFrameworkTool
-from ..tools.infrastructure_analysis_tool import InfrastructureAnalysisTool
-from ..tools.rag_query_tool import RAGQueryTool
-from ..tools.graph_query_tool import GraphQueryTool
 
 logger = logging.getLogger(__name__)
 
+# CrewAI's verbose output formats every agent step; off unless CREW_VERBOSE=true, and
+# even then only for crews with a websocket attached (factory and YAML-defined crews alike)
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "false").lower() == "true"
+
 # LLM selection
 class LLMInitializationError(Exception):
     """Custom exception for LLM initialization failures"""
@@ -290,17 +604,109 @@ def test_llm_connection(llm):
     except Exception:
         return False
 
+@dataclass(frozen=True, slots=True)
+class LLMEnv:
+    """Snapshot of the environment variables that configure the default LLM"""
+    provider: str
+    openai_model: str
+    openai_key: Optional[str]
+    anthropic_model: str
+    anthropic_key: Optional[str]
+    gemini_model: str
+    gemini_key: Optional[str]
+    gemini_project_id: Optional[str]
+    ollama_model: str
+    ollama_host: str
+    custom_model: str
+    custom_endpoint: Optional[str]
+    custom_key: Optional[str]
+    # Cheaper models of each provider for the 'fast' assessment tier (empty: no fast tier)
+    openai_fast_model: str
+    anthropic_fast_model: str
+    gemini_fast_model: str
+    ollama_fast_model: str
+
+    @classmethod
+    def from_environ(cls) -> "LLMEnv":
+        env = os.environ
+        return cls(
+            provider=env.get("LLM_PROVIDER", "openai").lower(),
+            openai_model=env.get("OPENAI_MODEL_NAME", "gpt-4o"),
+            openai_key=env.get("OPENAI_API_KEY"),
+            anthropic_model=env.get("ANTHROPIC_MODEL_NAME", "claude-3-opus-20240229"),
+            anthropic_key=env.get("ANTHROPIC_API_KEY"),
+            gemini_model=env.get("GEMINI_MODEL_NAME", "gemini-1.5-pro"),
+            gemini_key=env.get("GEMINI_API_KEY"),
+            gemini_project_id=env.get("GEMINI_PROJECT_ID"),
+            ollama_model=env.get("OLLAMA_MODEL_NAME", "llama2"),
+            ollama_host=env.get("OLLAMA_HOST", "http://localhost:11434"),
+            custom_model=env.get("CUSTOM_MODEL_NAME", "custom-model"),
+            custom_endpoint=env.get("CUSTOM_ENDPOINT"),
+            custom_key=env.get("CUSTOM_API_KEY"),
+            openai_fast_model=env.get("OPENAI_FAST_MODEL_NAME", "gpt-4o-mini"),
+            anthropic_fast_model=env.get("ANTHROPIC_FAST_MODEL_NAME", "claude-3-haiku-20240307"),
+            gemini_fast_model=env.get("GEMINI_FAST_MODEL_NAME", "gemini-1.5-flash"),
+            ollama_fast_model=env.get("OLLAMA_FAST_MODEL_NAME", ""),
+        )
+
+# Read once at import; call refresh_llm_env() after changing the environment at runtime
+LLM_ENV = LLMEnv.from_environ()
+
+def refresh_llm_env() -> LLMEnv:
+    """Re-read the LLM environment variables into a new LLM_ENV snapshot"""
+    global LLM_ENV
+    LLM_ENV = LLMEnv.from_environ()
+    return LLM_ENV
+
+# Constructed LLM instances are reused for this long before being rebuilt (and, for the
+# environment-configured LLM, re-checked with test_llm_connection)
+_LLM_INSTANCE_TTL_SECONDS = 300
+_llm_instance_cache: Dict[tuple, tuple] = {}
+
+# LLMEnv fields that determine the LLM built by _initialize_provider
+_PROVIDER_ENV_FIELDS = {
+    'openai': ('openai_model', 'openai_key'),
+    'anthropic': ('anthropic_model', 'anthropic_key'),
+    'google': ('gemini_model', 'gemini_key', 'gemini_project_id'),
+    'gemini': ('gemini_model', 'gemini_key', 'gemini_project_id'),
+    'ollama': ('ollama_model', 'ollama_host'),
+    'custom': ('custom_model', 'custom_endpoint', 'custom_key'),
+}
+
+def _cached_llm(key: tuple, build):
+    """Return the LLM cached under key while fresh, otherwise build and cache a new one"""
+    now = time.monotonic()
+    entry = _llm_instance_cache.get(key)
+    if entry is not None and now - entry[0] < _LLM_INSTANCE_TTL_SECONDS:
+        return entry[1]
+    llm = build()
+    _llm_instance_cache[key] = (now, llm)
+    return llm
+
+def _project_llm_key(kind: str, project) -> tuple:
+    """Cache key for a project LLM: everything that goes into building it"""
+    return (kind,) + tuple(
+        getattr(project, attr, None)
+        for attr in ('llm_provider', 'llm_model', 'llm_temperature', 'llm_max_tokens', 'llm_api_key_id')
+    )
+
 def get_llm_and_model():
     """Get configured LLM instance with proper error handling - NO FALLBACKS"""
-    provider = os.environ.get("LLM_PROVIDER", "openai").lower()
+    env = LLM_ENV
+    provider = env.provider
+    # Hash the settings so raw API keys are not kept in cache keys
+    settings = tuple(getattr(env, name) for name in _PROVIDER_ENV_FIELDS.get(provider, ()))
+    key = ('env', provider, hashlib.sha256(repr(settings).encode()).hexdigest()[:16])
 
-    try:
+    def build():
         llm = _initialize_provider(provider)
         if llm and test_llm_connection(llm):
             logger.info(f"Successfully initialized LLM with provider: {provider}")
             return llm
-        else:
-            raise Exception(f"LLM connection test failed for provider: {provider}")
+        raise Exception(f"LLM connection test failed for provider: {provider}")
+
+    try:
+        return _cached_llm(key, build)
     except Exception as e:
         logger.error(f"Failed to initialize {provider}: {e}")
         raise LLMInitializationError(
@@ -310,10 +716,11 @@ def get_llm_and_model():
 
 def _initialize_provider(provider: str):
     """Initialize a specific LLM provider"""
+    env = LLM_ENV
     # Detailed configuration validation
     if provider == "openai":
-        model_name = os.environ.get("OPENAI_MODEL_NAME", "gpt-4o")
-        api_key = os.environ.get("OPENAI_API_KEY")
+        model_name = env.openai_model
+        api_key = env.openai_key
         if not api_key:
             raise ValueError(
                 "OPENAI_API_KEY environment variable is required. "
@@ -326,8 +733,8 @@ def _initialize_provider(provider: str):
             raise ValueError(f"Failed to initialize OpenAI LLM: {str(e)}. Please check your API key and model configuration.")
 
     elif provider == "anthropic":
-        model_name = os.environ.get("ANTHROPIC_MODEL_NAME", "claude-3-opus-20240229")
-        api_key = os.environ.get("ANTHROPIC_API_KEY")
+        model_name = env.anthropic_model
+        api_key = env.anthropic_key
         if not api_key:
             raise ValueError(
                 "ANTHROPIC_API_KEY environment variable is required. "
@@ -340,9 +747,9 @@ def _initialize_provider(provider: str):
             raise ValueError(f"Failed to initialize Anthropic LLM: {str(e)}. Please check your API key and model configuration.")
 
     elif provider == "google" or provider == "gemini":
-        model_name = os.environ.get("GEMINI_MODEL_NAME", "gemini-1.5-pro")
-        api_key = os.environ.get("GEMINI_API_KEY")
-        project_id = os.environ.get("GEMINI_PROJECT_ID")
+        model_name = env.gemini_model
+        api_key = env.gemini_key
+        project_id = env.gemini_project_id
         if not api_key:
             raise ValueError(
                 "GEMINI_API_KEY environment variable is required. "
@@ -360,8 +767,8 @@ def _initialize_provider(provider: str):
             raise ValueError(f"Failed to initialize Gemini LLM: {str(e)}. Please check your API key, project ID, and model configuration.")
 
     elif provider == "ollama":
-        model_name = os.environ.get("OLLAMA_MODEL_NAME", "llama2")
-        ollama_host = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+        model_name = env.ollama_model
+        ollama_host = env.ollama_host
         try:
             Ollama = get_llm_class('ollama')
             return Ollama(model=model_name, base_url=ollama_host, temperature=0.1)
@@ -369,9 +776,9 @@ def _initialize_provider(provider: str):
             raise ValueError(f"Failed to initialize Ollama LLM: {str(e)}. Please ensure Ollama is running at {ollama_host} and the model {model_name} is available.")
 
     elif provider == "custom":
-        model_name = os.environ.get("CUSTOM_MODEL_NAME", "custom-model")
-        custom_endpoint = os.environ.get("CUSTOM_ENDPOINT")
-        api_key = os.environ.get("CUSTOM_API_KEY")
+        model_name = env.custom_model
+        custom_endpoint = env.custom_endpoint
+        api_key = env.custom_key
         if not custom_endpoint:
             raise ValueError(
                 "CUSTOM_ENDPOINT environment variable is required. "
@@ -379,7 +786,7 @@ def _initialize_provider(provider: str):
             )
         try:
             # For custom endpoints, we'd typically use OpenAI-compatible interface
-            from langchain_openai import ChatOpenAI
+            ChatOpenAI = get_llm_class('openai')
             return ChatOpenAI(
                 model=model_name,
                 api_key=api_key or "dummy",
@@ -395,73 +802,216 @@ def _initialize_provider(provider: str):
             f"Please configure a valid provider in the Settings > LLM Configuration section."
         )
 
+# LLM configurations (API keys) fetched from the project service are cached briefly and
+# fetched over one keep-alive session
+_LLM_CONFIG_TTL_SECONDS = 300
+_llm_config_cache: Dict[str, tuple] = {}
+_project_service_session = None
+_project_service_async_client = None
+
+def _fetch_llm_config(api_key_id: str) -> Dict[str, Any]:
+    """Fetch an LLM configuration from the project service, cached for a short TTL"""
+    global _project_service_session
+    now = time.monotonic()
+    entry = _llm_config_cache.get(api_key_id)
+    if entry is not None and now - entry[0] < _LLM_CONFIG_TTL_SECONDS:
+        return entry[1]
+
+    # Import here to avoid circular imports
+    import requests
+    from app.core.project_service import ProjectServiceClient
+
+    if _project_service_session is None:
+        _project_service_session = requests.Session()
+    project_service = ProjectServiceClient()
+    try:
+        response = _project_service_session.get(
+            f"{project_service.base_url}/llm-configurations/{api_key_id}",
+            headers=project_service._get_auth_headers(),
+            timeout=5
+        )
+    except requests.exceptions.Timeout:
+        raise ValueError(f"Timeout getting LLM configuration '{api_key_id}'. Please check the project service connection.")
+
+    if response.status_code != 200:
+        raise ValueError(f"LLM configuration '{api_key_id}' not found in database")
+
+    llm_config = response.json()
+    _llm_config_cache[api_key_id] = (now, llm_config)
+    return llm_config
+
+async def _fetch_llm_config_async(api_key_id: str) -> Dict[str, Any]:
+    """Non-blocking variant of _fetch_llm_config sharing the same cache"""
+    global _project_service_async_client
+    now = time.monotonic()
+    entry = _llm_config_cache.get(api_key_id)
+    if entry is not None and now - entry[0] < _LLM_CONFIG_TTL_SECONDS:
+        return entry[1]
+
+    if httpx is None:
+        return await asyncio.to_thread(_fetch_llm_config, api_key_id)
+
+    # Import here to avoid circular imports
+    from app.core.project_service import ProjectServiceClient
+
+    if _project_service_async_client is None:
+        _project_service_async_client = httpx.AsyncClient(timeout=5.0)
+    project_service = ProjectServiceClient()
+    try:
+        response = await _project_service_async_client.get(
+            f"{project_service.base_url}/llm-configurations/{api_key_id}",
+            headers=project_service._get_auth_headers()
+        )
+    except httpx.TimeoutException:
+        raise ValueError(f"Timeout getting LLM configuration '{api_key_id}'. Please check the project service connection.")
+
+    if response.status_code != 200:
+        raise ValueError(f"LLM configuration '{api_key_id}' not found in database")
+
+    llm_config = response.json()
+    _llm_config_cache[api_key_id] = (now, llm_config)
+    return llm_config
+
+def invalidate_llm_config_cache():
+    """Drop cached LLM configurations and the LLM instances built from them"""
+    _llm_config_cache.clear()
+    _llm_instance_cache.clear()
+
 def get_project_llm(project):
-    """Get LLM instance from project-specific configuration"""
+    """Get LLM instance from project-specific configuration (cached per configuration)"""
+    return _cached_llm(_project_llm_key('langchain', project), lambda: _build_project_llm(project))
+
+async def aget_project_llm(project):
+    """Async get_project_llm: the API key is fetched without blocking the event loop"""
+    if getattr(project, 'llm_api_key_id', None):
+        try:
+            await _fetch_llm_config_async(project.llm_api_key_id)
+        except Exception as e:
+            raise ValueError(f"Failed to get LLM configuration '{project.llm_api_key_id}': {str(e)}")
+    return get_project_llm(project)
+
+# LLMEnv field holding the fast-tier model for each project provider
+_FAST_MODEL_FIELDS = {
+    'openai': 'openai_fast_model',
+    'anthropic': 'anthropic_fast_model',
+    'gemini': 'gemini_fast_model',
+    'ollama': 'ollama_fast_model',
+}
+
+def get_project_llm_tiers(project, llm) -> Dict[str, Any]:
+    """
+    Model tiers for an assessment crew: 'strong' is the project's LLM, 'fast' the same
+    provider and API key with the provider's fast model (*_FAST_MODEL_NAME). Without a
+    fast model, or when the project already uses it, both tiers are the project's LLM.
+    """
+    field = _FAST_MODEL_FIELDS.get(getattr(project, 'llm_provider', None))
+    fast_model = getattr(LLM_ENV, field) if field else ''
+    if not fast_model or fast_model == getattr(project, 'llm_model', None):
+        return {'fast': llm, 'strong': llm}
     try:
-        # Check if project has LLM configuration
-        if not hasattr(project, 'llm_provider') or not hasattr(project, 'llm_model') or not project.llm_provider or not project.llm_model:
-            raise ValueError("Project does not have LLM configuration. Please configure LLM settings for this project.")
+        fast_llm = _cached_llm(_project_llm_key('langchain', project) + (fast_model,),
+                               lambda: _build_project_llm(project, model=fast_model))
+    except Exception as e:
+        logger.warning(f"Fast model '{fast_model}' unavailable, using the project model for every agent: {e}")
+        fast_llm = llm
+    return {'fast': fast_llm, 'strong': llm}
 
-        # Note: We'll get the API key from the project's LLM configuration in the database
+async def aget_project_llm_tiers(project, llm) -> Dict[str, Any]:
+    """Async get_project_llm_tiers: the API key is fetched without blocking the event loop"""
+    if getattr(project, 'llm_api_key_id', None):
+        try:
+            await _fetch_llm_config_async(project.llm_api_key_id)
+        except Exception as e:
+            logger.warning(f"Failed to get LLM configuration '{project.llm_api_key_id}': {e}")
+            return {'fast': llm, 'strong': llm}
+    return get_project_llm_tiers(project, llm)
 
-        # Get project-specific configuration
-        provider = project.llm_provider
-        model = project.llm_model
-        temperature = float(project.llm_temperature or '0.1')
-        max_tokens = int(project.llm_max_tokens or '4000')
+def _extract_project_llm_config(project) -> Dict[str, Any]:
+    """Validate a project's LLM settings and resolve its API key (shared by both LLM builders)"""
+    # Check if project has LLM configuration
+    if not hasattr(project, 'llm_provider') or not hasattr(project, 'llm_model') or not project.llm_provider or not project.llm_model:
+        raise ValueError("Project does not have LLM configuration. Please configure LLM settings for this project.")
 
-        # Get API key from LLM configuration database using project's api_key_id
-        api_key = None
-        if project.llm_api_key_id:
-            try:
-                # Import here to avoid circular imports
-                import requests
-                from app.core.project_service import ProjectServiceClient
-
-                project_service = ProjectServiceClient()
-                response = requests.get(
-                    f"{project_service.base_url}/llm-configurations/{project.llm_api_key_id}",
-                    headers=project_service._get_auth_headers(),
-                    timeout=5  # Reduce timeout to 5 seconds
-                )
+    provider = project.llm_provider
 
-                if response.status_code == 200:
-                    llm_config = response.json()
-                    api_key = llm_config.get('api_key')
-                else:
-                    raise ValueError(f"LLM configuration '{project.llm_api_key_id}' not found in database")
-            except requests.exceptions.Timeout:
-                raise ValueError(f"Timeout getting LLM configuration '{project.llm_api_key_id}'. Please check the project service connection.")
-            except Exception as e:
-                raise ValueError(f"Failed to get LLM configuration '{project.llm_api_key_id}': {str(e)}")
+    # Get API key from LLM configuration database using project's api_key_id
+    api_key = None
+    if project.llm_api_key_id:
+        try:
+            api_key = _fetch_llm_config(project.llm_api_key_id).get('api_key')
+        except Exception as e:
+            raise ValueError(f"Failed to get LLM configuration '{project.llm_api_key_id}': {str(e)}")
 
-        # No environment variable fallback: require explicit project LLM configuration
-        if not api_key and provider != 'ollama':
-            raise ValueError(
-                f"API key not found for {provider} in project LLM configuration '{project.llm_api_key_id}'. "
-                f"Please configure an API key in Project Settings > LLM Configuration."
-            )
+    # No environment variable fallback: require explicit project LLM configuration
+    if not api_key and provider != 'ollama':
+        raise ValueError(
+            f"API key not found for {provider} in project LLM configuration '{project.llm_api_key_id}'. "
+            f"Please configure an API key in Project Settings > LLM Configuration."
+        )
+
+    # Gemini model names may arrive as 'models/...' or 'gemini/...'
+    model = project.llm_model
+    if provider == 'gemini':
+        model = model.replace('models/', '', 1) if model.startswith('models/') else model
+        model = model.replace('gemini/', '', 1) if model.startswith('gemini/') else model
+
+    return {
+        "provider": provider,
+        "model": model,
+        "temperature": float(project.llm_temperature or '0.1'),
+        "max_tokens": int(project.llm_max_tokens or '4000'),
+        "api_key": api_key,
+    }
+
+def _build_langchain_llm(config: Dict[str, Any]):
+    """Build a LangChain chat model for an OpenAI, Anthropic or Ollama project configuration"""
+    # Provider libraries are imported only when that provider is used (see get_llm_class)
+    provider = config["provider"]
+    if provider == 'openai':
+        ChatOpenAI = get_llm_class('openai')
+        return ChatOpenAI(
+            model=config["model"],
+            api_key=config["api_key"],
+            temperature=config["temperature"],
+            max_tokens=config["max_tokens"]
+        )
+    elif provider == 'anthropic':
+        ChatAnthropic = get_llm_class('anthropic')
+        return ChatAnthropic(
+            model=config["model"],
+            api_key=config["api_key"],
+            temperature=config["temperature"],
+            max_tokens=config["max_tokens"]
+        )
+    elif provider == 'ollama':
+        Ollama = get_llm_class('ollama')
+        return Ollama(
+            model=config["model"],
+            temperature=config["temperature"]
+        )
+    else:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+
+def _build_project_llm(project, model: Optional[str] = None):
+    """Build a LangChain LLM instance from project-specific configuration (model overrides the project's)"""
+    try:
+        config = _extract_project_llm_config(project)
+        if model:
+            config["model"] = model
 
-        if provider == 'gemini':
+        if config["provider"] == 'gemini':
             # Use LangChain ChatGoogleGenerativeAI for compatibility with EntityExtractionAgent
             try:
                 from langchain_google_genai import ChatGoogleGenerativeAI
 
-                # Ensure model name is in the correct format
-                clean_model = model
-                if model.startswith('models/'):
-                    clean_model = model.replace('models/', '')
-                if clean_model.startswith('gemini/'):
-                    clean_model = clean_model.replace('gemini/', '')
-
-                logger.info(f"Creating LangChain Gemini instance with model: {clean_model}")
+                logger.info(f"Creating LangChain Gemini instance with model: {config['model']}")
 
                 # Create LangChain-compatible Gemini instance
                 return ChatGoogleGenerativeAI(
-                    model=clean_model,
-                    google_api_key=api_key,
-                    temperature=temperature,
-                    max_tokens=max_tokens
+                    model=config["model"],
+                    google_api_key=config["api_key"],
+                    temperature=config["temperature"],
+                    max_tokens=config["max_tokens"]
                 )
 
             except ImportError as import_error:
@@ -471,100 +1021,47 @@ def get_project_llm(project):
             except Exception as e:
                 logger.error(f"Failed to initialize Gemini LLM: {str(e)}")
                 raise ValueError(f"Failed to initialize Gemini LLM: {str(e)}")
-        elif provider == 'openai':
-            return ChatOpenAI(
-                model=model,
-                api_key=api_key,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-        elif provider == 'anthropic':
-            return ChatAnthropic(
-                model=model,
-                api_key=api_key,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-        elif provider == 'ollama':
-            return Ollama(
-                model=model,
-                temperature=temperature
-            )
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
+
+        return _build_langchain_llm(config)
 
     except Exception as e:
         logging.error(f"Error getting project LLM configuration: {str(e)}")
         raise
 
 def get_project_crewai_llm(project):
-    """Get CrewAI-compatible LLM instance from project-specific configuration"""
-    try:
-        # Check if project has LLM configuration
-        if not hasattr(project, 'llm_provider') or not hasattr(project, 'llm_model') or not project.llm_provider or not project.llm_model:
-            raise ValueError("Project does not have LLM configuration. Please configure LLM settings for this project.")
-
-        # Get project-specific configuration
-        provider = project.llm_provider
-        model = project.llm_model
-        temperature = float(project.llm_temperature or '0.1')
-        max_tokens = int(project.llm_max_tokens or '4000')
-
-        # Get API key from LLM configuration database using project's api_key_id
-        api_key = None
-        if project.llm_api_key_id:
-            try:
-                # Import here to avoid circular imports
-                import requests
-                from app.core.project_service import ProjectServiceClient
-
-                project_service = ProjectServiceClient()
-                response = requests.get(
-                    f"{project_service.base_url}/llm-configurations/{project.llm_api_key_id}",
-                    headers=project_service._get_auth_headers(),
-                    timeout=5  # Reduce timeout to 5 seconds
-                )
+    """Get CrewAI-compatible LLM instance from project-specific configuration (cached per configuration)"""
+    return _cached_llm(_project_llm_key('crewai', project), lambda: _build_project_crewai_llm(project))
 
-                if response.status_code == 200:
-                    llm_config = response.json()
-                    api_key = llm_config.get('api_key')
-                else:
-                    raise ValueError(f"LLM configuration '{project.llm_api_key_id}' not found in database")
-            except requests.exceptions.Timeout:
-                raise ValueError(f"Timeout getting LLM configuration '{project.llm_api_key_id}'. Please check the project service connection.")
-            except Exception as e:
-                raise ValueError(f"Failed to get LLM configuration '{project.llm_api_key_id}': {str(e)}")
+async def aget_project_crewai_llm(project):
+    """Async get_project_crewai_llm: the API key is fetched without blocking the event loop"""
+    if getattr(project, 'llm_api_key_id', None):
+        try:
+            await _fetch_llm_config_async(project.llm_api_key_id)
+        except Exception as e:
+            raise ValueError(f"Failed to get LLM configuration '{project.llm_api_key_id}': {str(e)}")
+    return get_project_crewai_llm(project)
 
-        # No environment variable fallback: require explicit project LLM configuration
-        if not api_key and provider != 'ollama':
-            raise ValueError(
-                f"API key not found for {provider} in project LLM configuration '{project.llm_api_key_id}'. "
-                f"Please configure an API key in Project Settings > LLM Configuration."
-            )
+def _build_project_crewai_llm(project):
+    """Build a CrewAI-compatible LLM instance from project-specific configuration"""
+    try:
+        config = _extract_project_llm_config(project)
 
-        if provider == 'gemini':
+        if config["provider"] == 'gemini':
             # Use CrewAI LLM for document generation
             try:
                 from crewai import LLM
 
-                # Ensure model name is in the correct format for LiteLLM
-                clean_model = model
-                if model.startswith('models/'):
-                    clean_model = model.replace('models/', '')
-                if clean_model.startswith('gemini/'):
-                    clean_model = clean_model.replace('gemini/', '')
-
                 # Create LiteLLM-compatible model name
-                litellm_model = f"gemini/{clean_model}"
+                litellm_model = f"gemini/{config['model']}"
 
                 logger.info(f"Creating CrewAI LLM instance with model: {litellm_model}")
 
                 # Create CrewAI LLM instance that uses LiteLLM internally
                 return LLM(
                     model=litellm_model,
-                    api_key=api_key,
-                    temperature=temperature,
-                    max_tokens=max_tokens
+                    api_key=config["api_key"],
+                    temperature=config["temperature"],
+                    max_tokens=config["max_tokens"]
                 )
 
             except ImportError as import_error:
@@ -574,50 +1071,39 @@ def get_project_crewai_llm(project):
             except Exception as e:
                 logger.error(f"Failed to initialize CrewAI Gemini LLM: {str(e)}")
                 raise ValueError(f"Failed to initialize CrewAI Gemini LLM: {str(e)}")
-        elif provider == 'openai':
-            # For CrewAI, we can use the same ChatOpenAI
-            return ChatOpenAI(
-                model=model,
-                api_key=api_key,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-        elif provider == 'anthropic':
-            # For CrewAI, we can use the same ChatAnthropic
-            return ChatAnthropic(
-                model=model,
-                api_key=api_key,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-        elif provider == 'ollama':
-            # For CrewAI, we can use the same Ollama
-            return Ollama(
-                model=model,
-                temperature=temperature
-            )
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
+
+        # For CrewAI, the same LangChain chat models are used for the other providers
+        return _build_langchain_llm(config)
 
     except Exception as e:
         logging.error(f"Error getting project CrewAI LLM configuration: {str(e)}")
         raise
 
+# Agent and token logs are written by a background QueueListener thread, so logging from
+# callbacks never blocks on disk I/O; a MemoryHandler batches records into fewer writes
+def _queued_file_handler(path: str) -> logging.Handler:
+    """QueueHandler whose records are written to path by a listener thread"""
+    file_handler = logging.FileHandler(path)
+    file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    buffered_handler = logging.handlers.MemoryHandler(capacity=256, flushLevel=logging.ERROR, target=file_handler)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, buffered_handler)
+    listener.start()
+    # Drain the queue on exit; logging.shutdown then flushes the buffered records
+    atexit.register(listener.stop)
+    return logging.handlers.QueueHandler(log_queue)
+
 # Agent logging setup
 os.makedirs("logs", exist_ok=True)
 agent_logger = logging.getLogger("agents")
-agent_handler = logging.FileHandler("logs/agents.log")
-agent_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
 if not agent_logger.hasHandlers():
-    agent_logger.addHandler(agent_handler)
+    agent_logger.addHandler(_queued_file_handler("logs/agents.log"))
 agent_logger.setLevel(logging.INFO)
 
 # Token usage logging
 token_logger = logging.getLogger("tokens")
-token_handler = logging.FileHandler("logs/tokens.log")
-token_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
 if not token_logger.hasHandlers():
-    token_logger.addHandler(token_handler)
+    token_logger.addHandler(_queued_file_handler("logs/tokens.log"))
 token_logger.setLevel(logging.INFO)
 
 def log_token_usage(model_name: str, prompt_tokens: int, completion_tokens: int, total_tokens: int, operation: str = "unknown"):
@@ -638,7 +1124,8 @@ def log_token_usage(model_name: str, prompt_tokens: int, completion_tokens: int,
 # =====================================================================================
 #  Function to Create the Expert Nagarro Crew
 # =====================================================================================
-def create_assessment_crew(project_id: str, llm, websocket=None):
+def create_assessment_crew(project_id: str, llm, websocket=None, llm_tiers: Optional[Dict[str, Any]] = None,
+                           persist_memory: bool = False):
     """
     Creates an enhanced assessment crew with comprehensive enterprise capabilities.
     Uses the centralized crew factory for consistent crew creation.
@@ -650,17 +1137,19 @@ def create_assessment_crew(project_id: str, llm, websocket=None):
     - Lead Migration Program Manager (30+ cloud migrations)
     """
     from .crew_factory import crew_factory
-    return crew_factory.create_assessment_crew(project_id, llm, websocket)
+    _disable_agentops()
+    return crew_factory.create_assessment_crew(project_id, llm, websocket, llm_tiers, persist_memory)
 
 
 
-def create_document_generation_crew(project_id: str, llm, document_type: str, document_description: str, output_format: str = 'markdown', websocket=None, crew_logger=None) -> Crew:
+def create_document_generation_crew(project_id: str, llm, document_type: str, document_description: str, output_format: str = 'markdown', websocket=None, crew_logger=None, persist_memory: bool = False) -> Crew:
     """
     Create a specialized crew for document generation using RAG and knowledge graph.
     Uses the centralized crew factory for consistent crew creation.
     """
     from .crew_factory import crew_factory
-    return crew_factory.create_document_generation_crew(project_id, llm, document_type, document_description, output_format, websocket, crew_logger)
+    _disable_agentops()
+    return crew_factory.create_document_generation_crew(project_id, llm, document_type, document_description, output_format, websocket, crew_logger, persist_memory)
 
 
 
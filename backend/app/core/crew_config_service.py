@@ -5,32 +5,136 @@ Handles reading, parsing, and updating crew_definitions.yaml file
 
 import yaml
 import os
+import hashlib
+import time
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from pathlib import Path
+from types import MappingProxyType
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict
 import json
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Minimum time between stat() calls when checking the file for changes
+_MTIME_CHECK_INTERVAL_NS = 500_000_000
+
+# crew_definitions.yaml in the backend directory
+_DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "crew_definitions.yaml"
+
+# PyYAML's libyaml bindings parse and emit many times faster than the pure-Python
+# implementation; PyYAML wheels ship with libyaml, source builds may not
+try:
+    from yaml import CSafeLoader as _LOADER, CSafeDumper as _DUMPER
+except ImportError:
+    from yaml import SafeLoader as _LOADER, SafeDumper as _DUMPER
+
+def _json_default(obj):
+    """Encode read-only configuration views (and anything else) for JSON"""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    return str(obj)
+
+try:
+    import orjson
+
+    def _json_loads(raw):
+        return orjson.loads(raw)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _json_loads(raw):
+        return json.loads(raw)
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, default=_json_default).encode('utf-8')
+
+# Schema for saved configurations. Definitions may carry any other keys; only the
+# fields that other definitions or the crew loader depend on are checked.
+class AgentDef(BaseModel):
+    model_config = ConfigDict(extra='allow', frozen=True)
+    id: str
+    tools: List[str] = []
+
+
+class TaskDef(BaseModel):
+    model_config = ConfigDict(extra='allow', frozen=True)
+    id: str
+
+
+class CrewDef(BaseModel):
+    model_config = ConfigDict(extra='allow', frozen=True)
+    id: str
+    agents: List[str] = []
+    tasks: List[str] = []
+    parallel_groups: List[List[str]] = []
+
+
+class ToolDef(BaseModel):
+    model_config = ConfigDict(extra='allow', frozen=True)
+    id: str
+
+
+class ConfigRoot(BaseModel):
+    model_config = ConfigDict(extra='allow', frozen=True)
+    agents: List[AgentDef]
+    tasks: List[TaskDef]
+    crews: List[CrewDef]
+    available_tools: List[ToolDef]
+
+
+# Compact, immutable views of the references between definitions, built once per load
+@dataclass(slots=True, frozen=True)
+class AgentRef:
+    id: str
+    tools: Tuple[str, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class CrewRef:
+    id: str
+    agents: Tuple[str, ...]
+    tasks: Tuple[str, ...]
+    parallel_tasks: Tuple[str, ...] = ()
+
+
 class CrewConfigurationService:
     """Service for managing crew configuration from YAML file"""
     
     def __init__(self, config_path: str = None):
-        if config_path is None:
-            # Default to crew_definitions.yaml in backend directory
-            self.config_path = Path(__file__).parent.parent.parent / "crew_definitions.yaml"
-        else:
-            self.config_path = Path(config_path)
+        self.config_path = Path(config_path) if config_path else _DEFAULT_CONFIG_PATH
+        # Plain string for open()/os.stat(), so the path is not re-converted on every call
+        self._path_str = str(self.config_path)
         
         self._config_cache = None
+        # st_mtime_ns of the file when it was last read
         self._last_modified = None
+        self._last_mtime_check_ns = None
+        # Digest of the file bytes the cached configuration was parsed from
+        self._content_hash = None
+        # Lookup indices derived from the cached configuration (see _set_config)
+        self._agents_by_id: Dict[str, Dict[str, Any]] = {}
+        self._tasks_by_id: Dict[str, Dict[str, Any]] = {}
+        self._crews_by_id: Dict[str, Dict[str, Any]] = {}
+        self._agent_id_set: frozenset = frozenset()
+        self._task_id_set: frozenset = frozenset()
+        self._tool_id_set: frozenset = frozenset()
+        self._agent_refs: Tuple[AgentRef, ...] = ()
+        self._crew_refs: Tuple[CrewRef, ...] = ()
         
     def _check_file_modified(self) -> bool:
-        """Check if the YAML file has been modified since last read"""
+        """Check if the YAML file has been modified since last read (at most one stat per interval)"""
+        now = time.monotonic_ns()
+        if self._last_mtime_check_ns is not None and now - self._last_mtime_check_ns < _MTIME_CHECK_INTERVAL_NS:
+            return False
+        self._last_mtime_check_ns = now
         try:
-            current_modified = self.config_path.stat().st_mtime
-            if self._last_modified is None or current_modified > self._last_modified:
+            # Integer nanoseconds, compared for any change (also catches clock-skewed writes)
+            current_modified = os.stat(self._path_str).st_mtime_ns
+            if self._last_modified is None or current_modified != self._last_modified:
                 self._last_modified = current_modified
                 return True
             return False
@@ -41,13 +145,20 @@ class CrewConfigurationService:
             logger.error(f"Error checking file modification time: {e}")
             return False
     
-    def _load_yaml_config(self) -> Dict[str, Any]:
-        """Load and parse the YAML configuration file"""
+    def _load_yaml_config(self, force: bool = False) -> Dict[str, Any]:
+        """Load and parse the YAML configuration file (unchanged content reuses the cache)"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as file:
-                config = yaml.safe_load(file)
-                logger.info(f"Successfully loaded crew configuration from {self.config_path}")
-                return config
+            with open(self._path_str, 'rb') as file:
+                raw = file.read()
+            content_hash = hashlib.blake2b(raw, digest_size=16).digest()
+            if not force and content_hash == self._content_hash and self._config_cache is not None:
+                # Touched or re-saved without changes: skip parsing and reindexing
+                logger.debug(f"Crew configuration unchanged: {self.config_path}")
+                return self._config_cache
+            config = yaml.load(raw.decode('utf-8'), Loader=_LOADER)
+            self._content_hash = content_hash
+            logger.info(f"Successfully loaded crew configuration from {self.config_path}")
+            return config
         except FileNotFoundError:
             logger.error(f"Crew definitions file not found: {self.config_path}")
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
@@ -58,7 +169,28 @@ class CrewConfigurationService:
             logger.error(f"Unexpected error loading configuration: {e}")
             raise RuntimeError(f"Failed to load configuration: {e}")
     
-    def get_configuration(self, force_reload: bool = False) -> Dict[str, Any]:
+    def _set_config(self, config: Optional[Dict[str, Any]]) -> None:
+        """Cache a configuration and rebuild the lookup indices derived from it"""
+        self._config_cache = config
+        config = config or {}
+        # Built in reverse so the first definition of a duplicated id wins, as with a scan
+        self._agents_by_id = {agent.get('id'): agent for agent in reversed(config.get('agents', []))}
+        self._tasks_by_id = {task.get('id'): task for task in reversed(config.get('tasks', []))}
+        self._crews_by_id = {crew.get('id'): crew for crew in reversed(config.get('crews', []))}
+        self._agent_id_set = frozenset(self._agents_by_id)
+        self._task_id_set = frozenset(self._tasks_by_id)
+        self._tool_id_set = frozenset(tool.get('id') for tool in config.get('available_tools', []))
+        self._agent_refs = tuple(
+            AgentRef(agent.get('id', 'unknown'), tuple(agent.get('tools', [])))
+            for agent in config.get('agents', [])
+        )
+        self._crew_refs = tuple(
+            CrewRef(crew.get('id', 'unknown'), tuple(crew.get('agents', [])), tuple(crew.get('tasks', [])),
+                    tuple(task_id for group in crew.get('parallel_groups') or [] for task_id in group))
+            for crew in config.get('crews', [])
+        )
+
+    def get_configuration(self, force_reload: bool = False) -> Mapping[str, Any]:
         """
         Get the complete crew configuration
         
@@ -66,12 +198,14 @@ class CrewConfigurationService:
             force_reload: Force reload from file even if cached
             
         Returns:
-            Complete configuration dictionary
+            Read-only view of the complete configuration
         """
         if force_reload or self._config_cache is None or self._check_file_modified():
-            self._config_cache = self._load_yaml_config()
+            config = self._load_yaml_config(force=force_reload)
+            if config is not self._config_cache:
+                self._set_config(config)
         
-        return self._config_cache.copy() if self._config_cache else {}
+        return MappingProxyType(self._config_cache or {})
     
     def get_agents(self) -> List[Dict[str, Any]]:
         """Get all agent definitions"""
@@ -95,18 +229,18 @@ class CrewConfigurationService:
     
     def get_agent_by_id(self, agent_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific agent by ID"""
-        agents = self.get_agents()
-        return next((agent for agent in agents if agent.get('id') == agent_id), None)
+        self.get_configuration()
+        return self._agents_by_id.get(agent_id)
     
     def get_task_by_id(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific task by ID"""
-        tasks = self.get_tasks()
-        return next((task for task in tasks if task.get('id') == task_id), None)
+        self.get_configuration()
+        return self._tasks_by_id.get(task_id)
     
     def get_crew_by_id(self, crew_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific crew by ID"""
-        crews = self.get_crews()
-        return next((crew for crew in crews if crew.get('id') == crew_id), None)
+        self.get_configuration()
+        return self._crews_by_id.get(crew_id)
     
     def update_configuration(self, new_config: Dict[str, Any]) -> bool:
         """
@@ -118,71 +252,73 @@ class CrewConfigurationService:
         Returns:
             True if successful, False otherwise
         """
+        tmp_path = self.config_path.with_suffix('.yaml.tmp')
         try:
             # Validate the configuration structure
             self._validate_configuration(new_config)
             
-            # Create backup of current file
-            self._create_backup()
+            # Write new configuration next to the live file
+            # Large write buffer and line width: the dump is emitted in one pass with
+            # little line-wrapping work
+            with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 20) as file:
+                yaml.dump(new_config, file, Dumper=_DUMPER, default_flow_style=False, sort_keys=False,
+                          indent=2, allow_unicode=True, width=4096)
             
-            # Write new configuration
-            with open(self.config_path, 'w', encoding='utf-8') as file:
-                yaml.dump(new_config, file, default_flow_style=False, sort_keys=False, indent=2)
+            # Hard-link the current file as the backup, then rename the new one over it;
+            # no file contents are copied and the live path always exists
+            self._create_backup()
+            os.replace(tmp_path, self.config_path)
             
             # Update cache
-            self._config_cache = new_config.copy()
-            self._last_modified = self.config_path.stat().st_mtime
+            self._set_config(new_config.copy())
+            self._content_hash = None
+            self._last_modified = os.stat(self._path_str).st_mtime_ns
             
             logger.info("Successfully updated crew configuration")
             return True
             
         except Exception as e:
             logger.error(f"Error updating configuration: {e}")
-            # Restore from backup if possible
+            # Restore from backup if the live file was already rotated away
             self._restore_backup()
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
             return False
     
+    def parse_configuration_json(self, raw: bytes) -> Dict[str, Any]:
+        """Parse a configuration from a JSON request body"""
+        try:
+            config = _json_loads(raw)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        if not isinstance(config, dict):
+            raise ValueError("Configuration must be a valid JSON object")
+        return config
+
+    def to_json(self, data: Any) -> bytes:
+        """Serialize configuration data (including read-only views) to JSON bytes"""
+        return _json_dumps(data)
+
     def _validate_configuration(self, config: Dict[str, Any]) -> None:
-        """Validate configuration structure"""
-        required_keys = ['agents', 'tasks', 'crews', 'available_tools']
-        
-        for key in required_keys:
-            if key not in config:
-                raise ValueError(f"Missing required configuration key: {key}")
-        
-        # Validate agents
-        for agent in config.get('agents', []):
-            if not isinstance(agent, dict) or 'id' not in agent:
-                raise ValueError("Invalid agent definition: missing 'id' field")
-        
-        # Validate tasks
-        for task in config.get('tasks', []):
-            if not isinstance(task, dict) or 'id' not in task:
-                raise ValueError("Invalid task definition: missing 'id' field")
-        
-        # Validate crews
-        for crew in config.get('crews', []):
-            if not isinstance(crew, dict) or 'id' not in crew:
-                raise ValueError("Invalid crew definition: missing 'id' field")
+        """Validate configuration structure (raises pydantic.ValidationError, a ValueError)"""
+        ConfigRoot.model_validate(config)
     
     def _create_backup(self) -> None:
-        """Create a backup of the current configuration file"""
-        try:
-            if self.config_path.exists():
-                backup_path = self.config_path.with_suffix('.yaml.backup')
-                import shutil
-                shutil.copy2(self.config_path, backup_path)
-                logger.info(f"Created backup: {backup_path}")
-        except Exception as e:
-            logger.warning(f"Failed to create backup: {e}")
+        """Hard-link the current configuration file as the (single, rolling) backup"""
+        if self.config_path.exists():
+            backup_path = self.config_path.with_suffix('.yaml.backup')
+            backup_path.unlink(missing_ok=True)
+            os.link(self.config_path, backup_path)
+            logger.info(f"Created backup: {backup_path}")
     
     def _restore_backup(self) -> None:
-        """Restore configuration from backup"""
+        """Restore configuration from backup if the live file is missing"""
         try:
             backup_path = self.config_path.with_suffix('.yaml.backup')
-            if backup_path.exists():
-                import shutil
-                shutil.copy2(backup_path, self.config_path)
+            if not self.config_path.exists() and backup_path.exists():
+                os.replace(backup_path, self.config_path)
                 logger.info("Restored configuration from backup")
         except Exception as e:
             logger.error(f"Failed to restore from backup: {e}")
@@ -199,35 +335,34 @@ class CrewConfigurationService:
     
     def validate_references(self) -> Dict[str, List[str]]:
         """Validate that all references between agents, tasks, and crews are valid"""
-        config = self.get_configuration()
-        errors = []
-        warnings = []
-        
-        # Get all IDs
-        agent_ids = {agent.get('id') for agent in config.get('agents', [])}
-        task_ids = {task.get('id') for task in config.get('tasks', [])}
-        tool_ids = {tool.get('id') for tool in config.get('available_tools', [])}
+        self.get_configuration()
+        agent_ids = self._agent_id_set
+        task_ids = self._task_id_set
+        tool_ids = self._tool_id_set
         
-        # Validate crew references
-        for crew in config.get('crews', []):
-            crew_id = crew.get('id', 'unknown')
-            
-            # Check agent references
-            for agent_id in crew.get('agents', []):
-                if agent_id not in agent_ids:
-                    errors.append(f"Crew '{crew_id}' references unknown agent '{agent_id}'")
-            
-            # Check task references
-            for task_id in crew.get('tasks', []):
-                if task_id not in task_ids:
-                    errors.append(f"Crew '{crew_id}' references unknown task '{task_id}'")
+        # Crew references to agents and tasks
+        errors = [
+            f"Crew '{crew.id}' references unknown {kind} '{ref_id}'"
+            for crew in self._crew_refs
+            for kind, refs, known_ids in (('agent', crew.agents, agent_ids), ('task', crew.tasks, task_ids))
+            for ref_id in refs
+            if ref_id not in known_ids
+        ]
+        # Parallel groups may only name the crew's own tasks
+        errors.extend(
+            f"Crew '{crew.id}' parallel group references task '{task_id}' not in the crew"
+            for crew in self._crew_refs
+            for task_id in crew.parallel_tasks
+            if task_id not in crew.tasks
+        )
         
-        # Validate agent tool references
-        for agent in config.get('agents', []):
-            agent_id = agent.get('id', 'unknown')
-            for tool_id in agent.get('tools', []):
-                if tool_id not in tool_ids:
-                    warnings.append(f"Agent '{agent_id}' references unknown tool '{tool_id}'")
+        # Agent references to tools
+        warnings = [
+            f"Agent '{agent.id}' references unknown tool '{tool_id}'"
+            for agent in self._agent_refs
+            for tool_id in agent.tools
+            if tool_id not in tool_ids
+        ]
         
         return {
             'errors': errors,
@@ -4,37 +4,376 @@ Extracted from backend/app/core/crew.py for better organization
 """
 
 from crewai import Task, Crew, Process
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from threading import Lock
+import functools
+import importlib
 import logging
-import os
+import sys
+import time
 
 # Import services
 from .rag_service import RAGService
-from .graph_service import GraphService
+from .vector_ops import warm_up as _warm_up_vector_ops
+from .service_pool import (
+    SERVICE_TTL_SECONDS as _SERVICE_TTL_SECONDS,
+    get_rag_service as _get_rag,
+    get_graph_service as _get_graph,
+    invalidate_rag_services,
+)
 
 # Import tools from tools directory
 from ..tools.rag_query_tool import RAGQueryTool
+from ..tools.batch_knowledge_base_tool import BatchKnowledgeBaseTool
+from ..tools.repository_context_tool import RepositoryContextSearchTool
 from ..tools.graph_query_tool import GraphQueryTool
-from ..tools.hybrid_search_tool import HybridSearchTool
-from ..tools.lessons_learned_tool import LessonsLearnedTool
-from ..tools.project_knowledge_base_tool import ProjectKnowledgeBaseQueryTool
-from ..tools.cloud_catalog_tool import CloudServiceCatalogTool
-from ..tools.compliance_tool import ComplianceFrameworkTool
-from ..tools.infrastructure_analysis_tool import InfrastructureAnalysisTool
 
 # Import logging handler and agent definitions
-from .crew import AgentLogStreamHandler
-from ..agents.agent_definitions import AgentDefinitions
+from .crew import CREW_VERBOSE, AgentLogStreamHandler, CrewLoggerCallback, LogHandlerPool, TokenStreamHandler
+from ..agents.agent_definitions import AgentDefinitions, AGENT_SPECS
 
 logger = logging.getLogger(__name__)
 
+# Enhanced tools pull in search, catalog and analysis dependencies, so their modules are
+# imported on the first crew build rather than with this module (class name -> module)
+_ENHANCED_TOOL_MODULES = {
+    'HybridSearchTool': 'hybrid_search_tool',
+    'LessonsLearnedTool': 'lessons_learned_tool',
+    'ProjectKnowledgeBaseQueryTool': 'project_knowledge_base_tool',
+    'CloudServiceCatalogTool': 'cloud_catalog_tool',
+    'ComplianceFrameworkTool': 'compliance_tool',
+    'InfrastructureAnalysisTool': 'infrastructure_analysis_tool',
+}
+_enhanced_tool_classes: Optional[Dict[str, type]] = None
+
+
+def _lazy_tools() -> Dict[str, type]:
+    """Enhanced tool classes by name, imported on first use; empty if any import fails"""
+    global _enhanced_tool_classes
+    if _enhanced_tool_classes is None:
+        try:
+            _enhanced_tool_classes = {
+                class_name: getattr(importlib.import_module(f"..tools.{module}", __package__), class_name)
+                for class_name, module in _ENHANCED_TOOL_MODULES.items()
+            }
+        except ImportError as e:
+            logger.warning(f"Enhanced tools unavailable: {e}")
+            _enhanced_tool_classes = {}
+    return _enhanced_tool_classes
+
+
+def _create_enhanced_tool(class_name: str, **kwargs):
+    """Instantiate an enhanced tool, or None if it is unavailable or fails to initialize"""
+    tool_class = _lazy_tools().get(class_name)
+    if tool_class is None:
+        return None
+    try:
+        return tool_class(**kwargs)
+    except Exception as e:
+        logger.warning(f"Failed to initialize {class_name}: {e}")
+        return None
+
+
+def _available(*tools) -> list:
+    """Agent tool list without the enhanced tools that could not be created"""
+    return [tool for tool in tools if tool is not None]
+
+
+# Services come from the process-wide service pool so that every crew does not reopen
+# the ChromaDB collection and rebuild the embedding / entity extraction stack.
+_service_lock = Lock()
+# Assessment tool instances, keyed by (project_id, id(llm)) and evicted the same way as
+# the pooled RAG services
+_tool_sets: Dict[Tuple[str, int], Tuple[float, Any, Dict[str, Any]]] = {}
+# Document generation tool instances, keyed by (project_id, id(llm), id(rag_service))
+_document_tool_sets: Dict[Tuple[str, int, int], Tuple[float, Tuple[Any, RAGService], Dict[str, Any]]] = {}
+
+
+def _get_assessment_tools(project_id: str, llm) -> Dict[str, Any]:
+    """Get the shared assessment tool instances for the project and LLM, creating them on first use"""
+    key = (project_id, id(llm))
+    now = time.monotonic()
+    with _service_lock:
+        for stale_key in [k for k, (last_used, _, _) in _tool_sets.items() if now - last_used > _SERVICE_TTL_SECONDS]:
+            del _tool_sets[stale_key]
+        entry = _tool_sets.get(key)
+        if entry is not None and entry[1] is llm:
+            _tool_sets[key] = (now, llm, entry[2])
+            return entry[2]
+
+    rag_service = _get_rag(project_id, llm)
+    tools = {
+        'rag_tool': RAGQueryTool(rag_service=rag_service),
+        'repository_context_tool': RepositoryContextSearchTool(rag_service=rag_service),
+        'graph_tool': GraphQueryTool(graph_service=_get_graph()),
+        'batch_kb_tool': BatchKnowledgeBaseTool(rag_service=rag_service),
+    }
+    # Enhanced tools are None when unavailable; one failing does not drop the others
+    tools.update(
+        hybrid_search_tool=_create_enhanced_tool('HybridSearchTool', project_id=project_id),
+        lessons_learned_tool=_create_enhanced_tool('LessonsLearnedTool'),
+        project_kb_tool=_create_enhanced_tool('ProjectKnowledgeBaseQueryTool', project_id=project_id),
+        cloud_catalog_tool=_create_enhanced_tool('CloudServiceCatalogTool'),
+        compliance_tool=_create_enhanced_tool('ComplianceFrameworkTool'),
+        infrastructure_tool=_create_enhanced_tool('InfrastructureAnalysisTool'),
+    )
+
+    with _service_lock:
+        _tool_sets[key] = (now, llm, tools)
+    return tools
+
+
+def _get_document_tools(project_id: str, llm, rag_service: RAGService) -> Dict[str, Any]:
+    """Get the shared document generation tool instances, creating them on first use"""
+    key = (project_id, id(llm), id(rag_service))
+    now = time.monotonic()
+    with _service_lock:
+        for stale_key in [k for k, (last_used, _, _) in _document_tool_sets.items() if now - last_used > _SERVICE_TTL_SECONDS]:
+            del _document_tool_sets[stale_key]
+        entry = _document_tool_sets.get(key)
+        if entry is not None and entry[1][0] is llm and entry[1][1] is rag_service:
+            _document_tool_sets[key] = (now, entry[1], entry[2])
+            return entry[2]
+
+    tools = {
+        'rag_tool': RAGQueryTool(rag_service=rag_service),
+        'graph_tool': GraphQueryTool(graph_service=_get_graph()),
+        'hybrid_search_tool': _create_enhanced_tool('HybridSearchTool', project_id=project_id, llm=llm),
+        'lessons_learned_tool': _create_enhanced_tool('LessonsLearnedTool'),
+        # Pass LLM to project knowledge base tool to avoid separate LLM initialization
+        'project_kb_tool': _create_enhanced_tool('ProjectKnowledgeBaseQueryTool', project_id=project_id, llm=llm),
+    }
+    with _service_lock:
+        _document_tool_sets[key] = (now, (llm, rag_service), tools)
+    return tools
+
+
+def invalidate_project_services(project_id: Optional[str] = None) -> None:
+    """Drop cached RAG services and the tools built on them for a project (all projects when None)"""
+    invalidate_rag_services(project_id)
+    with _service_lock:
+        for cache in (_tool_sets, _document_tool_sets):
+            for key in [k for k in cache if project_id is None or k[0] == project_id]:
+                del cache[key]
+
+
+# Each discovery question costs a full retrieval + LLM round-trip, so analysts ask them together
+_BATCH_QUERY_INSTRUCTION = (
+    "Issue ONE call to the Batch Knowledge Base Query Tool listing every question you need "
+    "answered (one per line), then use the Hybrid Search Tool only for follow-up questions."
+)
+
+# Independent discovery areas, each researched by its own analyst concurrently before
+# the current state synthesis joins them: bucket -> (description, expected_output)
+DISCOVERY_BUCKETS = {
+    'scope': (
+        "Establish the engagement scope: the systems, business units, locations and "
+        "timelines that are in and out of scope for the migration. " + _BATCH_QUERY_INSTRUCTION,
+        "A scope summary listing in-scope and out-of-scope systems, business units, "
+        "locations, key dates and stated constraints"
+    ),
+    'technical': (
+        "Build the technical inventory: applications, servers, databases, middleware, "
+        "infrastructure components, data flows and integration patterns, including "
+        "dependencies between them. " + _BATCH_QUERY_INSTRUCTION,
+        "An inventory of applications and infrastructure components with their "
+        "dependencies, data flows, integration patterns and visible technical debt"
+    ),
+    'business': (
+        "Identify the business drivers: business goals, pain points, application "
+        "criticality, service levels and cost expectations behind the migration. "
+        + _BATCH_QUERY_INSTRUCTION,
+        "A summary of business drivers, pain points, criticality ratings, SLAs and "
+        "cost or budget expectations"
+    ),
+    'compliance': (
+        "Identify compliance and security drivers: regulatory obligations, data "
+        "classifications, security controls and audit findings mentioned in the "
+        "project documents. " + _BATCH_QUERY_INSTRUCTION,
+        "A summary of regulatory obligations, sensitive data, security controls and "
+        "known audit findings"
+    ),
+}
+
+
+# Fixed texts of the other assessment tasks: task -> (description, expected_output)
+ASSESSMENT_TASKS = {
+    'platform_survey': (
+        "Survey the inputs for the target architecture that do not depend on the "
+        "current state analysis. Use the Project Graph Database Query Tool and the infrastructure "
+        "analysis tool to list the hosting platforms, runtimes and databases in use, and "
+        "the Cloud Service Catalog Tool to shortlist candidate cloud services for them.",
+        "A platform survey containing: "
+        "1. Hosting platforms, runtimes and databases found in the environment "
+        "2. Candidate cloud services for each, with one-line rationale"
+    ),
+    'current_state_synthesis': (
+        "Perform comprehensive current state analysis using cross-modal synthesis. "
+        "Start from the scope, technical, business and compliance discovery findings "
+        "and use the Hybrid Search Tool only to fill gaps between them. "
+        "Extract key technical and business requirements, identify critical dependencies, "
+        "and assess the current IT landscape. Focus on application portfolio, "
+        "infrastructure components, data flows, and integration patterns.",
+        "A comprehensive current state analysis document containing: "
+        "1. Executive summary of current IT landscape "
+        "2. Application portfolio inventory with criticality ratings "
+        "3. Infrastructure component mapping "
+        "4. Data flow and integration analysis "
+        "5. Identified technical debt and modernization opportunities "
+        "6. Business impact assessment of current state limitations"
+    ),
+    'target_architecture_design': (
+        "Design the target cloud architecture using the 6Rs migration framework. "
+        "Start from the platform survey's candidate services and use the Cloud Service "
+        "Catalog Tool only for services it does not cover. "
+        "Create detailed landing zone specifications, network architecture, "
+        "and security controls. Consider cost optimization, performance, and scalability.",
+        "A detailed target architecture design containing: "
+        "1. Cloud service recommendations with justifications "
+        "2. Landing zone architecture diagrams "
+        "3. Network and security design specifications "
+        "4. 6Rs migration strategy for each application "
+        "5. Cost optimization recommendations "
+        "6. Performance and scalability considerations"
+    ),
+    'risk_prescan': (
+        "Pre-scan the current state analysis for compliance and security risks. "
+        "Use the Compliance Framework Tool to map the discovered systems and data flows "
+        "against regulatory requirements (GDPR, SOX, HIPAA, PCI-DSS) before the target "
+        "architecture is finalized.",
+        "A current state risk pre-scan containing: "
+        "1. Applicable regulatory frameworks "
+        "2. Compliance gaps in the current environment "
+        "3. Sensitive data locations and classifications "
+        "4. Constraints the target architecture must satisfy"
+    ),
+    'compliance_validation': (
+        "Conduct comprehensive compliance validation using the Compliance Framework Tool. "
+        "Assess current state against regulatory requirements (GDPR, SOX, HIPAA, PCI-DSS). "
+        "Identify security gaps and provide detailed remediation strategies. "
+        "Ensure target architecture meets all compliance requirements.",
+        "A comprehensive compliance assessment containing: "
+        "1. Current state compliance gap analysis "
+        "2. Regulatory requirements mapping "
+        "3. Security control recommendations "
+        "4. Risk assessment and mitigation strategies "
+        "5. Compliance validation for target architecture "
+        "6. Audit trail and documentation requirements"
+    ),
+    'report_generation': (
+        "Synthesize all findings into a comprehensive migration assessment report. "
+        "Use the Lessons Learned Tool to incorporate best practices. "
+        "Create detailed wave planning, timeline, and risk mitigation strategies. "
+        "Ensure executive-ready deliverables with clear recommendations.",
+        "A comprehensive migration assessment report containing: "
+        "1. Executive summary with key recommendations "
+        "2. Detailed migration roadmap with wave planning "
+        "3. Cost-benefit analysis and ROI projections "
+        "4. Risk assessment and mitigation strategies "
+        "5. Implementation timeline and resource requirements "
+        "6. Success metrics and KPIs for migration tracking"
+    ),
+}
+
+
+# Document generation task texts: task -> (description, expected_output) templates with
+# {document_type} and {output_format} fields; the template header is prepended to descriptions
+DOCUMENT_TASK_TEMPLATES = {
+    'research': (
+        "Research and gather information for {document_type} generation, "
+        "focusing on the template requirements above. "
+        "Use all available tools to extract relevant information from project documents, "
+        "knowledge base, and graph relationships.",
+        "Comprehensive research findings for {document_type} including: "
+        "1. Relevant information extracted from project documents "
+        "2. Key insights from knowledge base queries "
+        "3. Relationship analysis from graph database "
+        "4. Supporting data and evidence for document creation"
+    ),
+    'content_structure': (
+        "Structure and organize content for {document_type} in {output_format} format. "
+        "Create a well-organized document structure with clear sections, "
+        "proper formatting, and logical flow of information.",
+        "Well-structured {document_type} in {output_format} format containing: "
+        "1. Clear document structure with appropriate sections "
+        "2. Properly formatted content with consistent styling "
+        "3. Logical information flow and organization "
+        "4. Professional presentation suitable for stakeholders"
+    ),
+    'quality_review': (
+        "Review and validate the quality of the generated {document_type}. "
+        "Ensure accuracy, completeness, and professional standards. "
+        "Verify all information is correctly represented and properly formatted.",
+        "Quality-assured {document_type} in {output_format} format with: "
+        "1. Verified accuracy of all information "
+        "2. Complete coverage of required topics "
+        "3. Professional formatting and presentation "
+        "4. Quality assurance report with any recommendations"
+    ),
+}
+# Research feeds only the content structure step, so one agent does both in a single LLM call
+DOCUMENT_TASK_TEMPLATES['research_and_structure'] = (
+    DOCUMENT_TASK_TEMPLATES['research'][0] + " Then, using your findings, "
+    + DOCUMENT_TASK_TEMPLATES['content_structure'][0][0].lower() + DOCUMENT_TASK_TEMPLATES['content_structure'][0][1:],
+    DOCUMENT_TASK_TEMPLATES['content_structure'][1]
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _document_task_texts(task: str, template_header: str, document_type: str, output_format: str) -> Tuple[str, str]:
+    """(description, expected_output) of a document generation task, shared by repeated documents"""
+    description, expected_output = DOCUMENT_TASK_TEMPLATES[task]
+    fields = {'document_type': document_type, 'output_format': output_format}
+    return template_header + description.format_map(fields), expected_output.format_map(fields)
+
+
+def _crew_verbose(websocket, agents) -> bool:
+    """Whether a crew runs verbose; its agents (fresh copies per crew) follow the crew"""
+    verbose = CREW_VERBOSE and websocket is not None
+    for agent in agents:
+        agent.verbose = verbose
+    return verbose
+
+
+def _streaming_llm(llm, log_handler: Optional[AgentLogStreamHandler], agent_id: str, stream: str):
+    """Copy of a LangChain chat model that streams the agent's tokens to the log handler, or None if unsupported"""
+    if log_handler is None or llm is None or 'streaming' not in getattr(type(llm), 'model_fields', {}):
+        return None
+    token_handler = TokenStreamHandler(log_handler, AGENT_SPECS[agent_id].role, stream)
+    return llm.model_copy(update={'streaming': True, 'callbacks': [token_handler]})
+
+
+def _assessment_llms(llm, llm_tiers: Optional[Dict[str, Any]], log_handler: Optional[AgentLogStreamHandler]) -> Dict[str, Any]:
+    """
+    LLM of each assessment role: 'fast' for discovery, the platform survey and compliance,
+    'architect' and 'planner' for the two agents writing the long outputs.
+
+    Those two use the 'strong' model; when a client is listening it is wrapped to stream
+    tokens through the log handler, so the architecture draft and the report appear while
+    they are being written. All are None without llm_tiers (CrewAI's default model).
+    """
+    fast_llm = llm_tiers.get('fast', llm) if llm_tiers else None
+    strong_llm = llm_tiers.get('strong', llm) if llm_tiers else None
+    return {
+        'fast': fast_llm,
+        'architect': _streaming_llm(strong_llm, log_handler, 'principal_cloud_architect', 'architecture') or strong_llm,
+        'planner': _streaming_llm(strong_llm, log_handler, 'lead_planning_manager', 'report') or strong_llm,
+    }
+
+
 class CrewFactory:
     """Factory class for creating different types of crews"""
-    
+
+    __slots__ = ('logger',)
+
     def __init__(self):
         self.logger = logger
+        # Compile the top-k scoring kernel before the first crew queries the caches
+        _warm_up_vector_ops()
     
-    def create_assessment_crew(self, project_id: str, llm, websocket=None) -> Crew:
+    def create_assessment_crew(self, project_id: str, llm, websocket=None,
+                               llm_tiers: Optional[Dict[str, Any]] = None,
+                               persist_memory: bool = False) -> Crew:
         """
         Creates an enhanced assessment crew with comprehensive enterprise capabilities.
         
@@ -46,76 +385,117 @@ class CrewFactory:
         - 3-year TCO cost modeling
         - Wave planning with dependency analysis
         - Executive-ready deliverables
+
+        llm_tiers optionally maps 'fast' and 'strong' to chat models. Discovery and
+        compliance review are mostly tool orchestration and checklist work, so they run on
+        the 'fast' model (several times lower latency per step, with little quality loss
+        on these structured tasks); architecture design and the final plan keep the
+        'strong' model. Missing tiers fall back to llm; main.py resolves them with
+        get_project_llm_tiers. Without llm_tiers the agents use CrewAI's default model, and
+        the architect and planner, having no chat model of their own, do not stream tokens.
+
+        Crew memory (embedding and storing every agent message) is off by default since a
+        single-shot assessment never reads it back; pass persist_memory=True to enable it.
         """
         # Initialize logging callback handler
-        log_handler = AgentLogStreamHandler(websocket=websocket) if websocket else None
+        log_handler = LogHandlerPool.acquire(websocket) if websocket else None
+
+        # Services and tools are shared across builds for the same project and LLM
+        tools = _get_assessment_tools(project_id, llm)
+        rag_tool = tools['rag_tool']
+        repository_context_tool = tools['repository_context_tool']
+        graph_tool = tools['graph_tool']
+        batch_kb_tool = tools['batch_kb_tool']
+        hybrid_search_tool = tools['hybrid_search_tool']
+        lessons_learned_tool = tools['lessons_learned_tool']
+        project_kb_tool = tools['project_kb_tool']
+        cloud_catalog_tool = tools['cloud_catalog_tool']
+        compliance_tool = tools['compliance_tool']
+        infrastructure_tool = tools['infrastructure_tool']
+
+        # Create agents using centralized definitions. Raw RAG retrieval is not attached
+        # to the analyst and architect (the graph tool is their structural source);
+        # the planner gets the gated on-demand search instead.
+        llms = _assessment_llms(llm, llm_tiers, log_handler)
+        fast_llm = llms['fast']
+        analyst_tools = _available(graph_tool, hybrid_search_tool, project_kb_tool)
+        engagement_analyst = AgentDefinitions.create_engagement_analyst(analyst_tools, llm=fast_llm)
+        # One analyst per discovery bucket; concurrent tasks must not share an agent
+        discovery_analysts = {
+            bucket: AgentDefinitions.create_engagement_analyst([batch_kb_tool, *analyst_tools], llm=fast_llm)
+            for bucket in DISCOVERY_BUCKETS
+        }
+        architect_tools = _available(graph_tool, cloud_catalog_tool, infrastructure_tool)
+        principal_cloud_architect = AgentDefinitions.create_principal_cloud_architect(architect_tools, llm=llms['architect'])
+        # Separate architect for the platform survey, which runs alongside discovery
+        survey_architect = AgentDefinitions.create_principal_cloud_architect(architect_tools, llm=fast_llm)
+        # The compliance officer audits document text and frameworks; it gets no graph tool
+        risk_compliance_officer = AgentDefinitions.create_risk_compliance_officer(_available(rag_tool, compliance_tool), llm=fast_llm)
+        lead_planning_manager = AgentDefinitions.create_lead_planning_manager(
+            _available(repository_context_tool, graph_tool, lessons_learned_tool, project_kb_tool),
+            llm=llms['planner']
+        )
 
-        # Initialize services and tools
-        rag_service = RAGService(project_id, llm)
-        rag_tool = RAGQueryTool(rag_service=rag_service)
-        graph_service = GraphService()
-        graph_tool = GraphQueryTool(graph_service=graph_service)
-        
-        # Initialize enhanced tools (if available)
-        tools_list = [rag_tool, graph_tool]
-
-        if TOOLS_AVAILABLE:
-            try:
-                hybrid_search_tool = HybridSearchTool(project_id=project_id)
-                lessons_learned_tool = LessonsLearnedTool()
-                project_kb_tool = ProjectKnowledgeBaseQueryTool(project_id=project_id)
-                cloud_catalog_tool = CloudServiceCatalogTool()
-                compliance_tool = ComplianceFrameworkTool()
-                infrastructure_tool = InfrastructureAnalysisTool()
-
-                enhanced_tools = [hybrid_search_tool, project_kb_tool]
-                specialized_tools = [cloud_catalog_tool, infrastructure_tool, compliance_tool]
-            except Exception as e:
-                logger.warning(f"Failed to initialize some tools: {e}")
-                enhanced_tools = []
-                specialized_tools = []
-                lessons_learned_tool = None
-        else:
-            enhanced_tools = []
-            specialized_tools = []
-            lessons_learned_tool = None
-
-        # Create agents using centralized definitions
-        engagement_analyst = AgentDefinitions.create_engagement_analyst([rag_tool, graph_tool, hybrid_search_tool, project_kb_tool])
-        principal_cloud_architect = AgentDefinitions.create_principal_cloud_architect([rag_tool, graph_tool, cloud_catalog_tool, infrastructure_tool])
-        risk_compliance_officer = AgentDefinitions.create_risk_compliance_officer([rag_tool, graph_tool, compliance_tool])
-        lead_planning_manager = AgentDefinitions.create_lead_planning_manager([rag_tool, graph_tool, lessons_learned_tool, project_kb_tool])
-
-        # Create tasks
-        current_state_synthesis_task = self._create_current_state_synthesis_task(engagement_analyst)
-        target_architecture_design_task = self._create_target_architecture_design_task(principal_cloud_architect)
-        compliance_validation_task = self._create_compliance_validation_task(risk_compliance_officer)
-        report_generation_task = self._create_report_generation_task(lead_planning_manager)
+        # Create tasks as a DAG: the discovery buckets and the architect's platform survey
+        # run concurrently (async_execution) and the current state synthesis joins the
+        # discovery; then the architecture design (starting from the survey) and the risk
+        # pre-scan fan out concurrently off the synthesis, compliance validation joins
+        # both, and the report joins everything.
+        discovery_tasks = [
+            self._create_discovery_task(agent, bucket)
+            for bucket, agent in discovery_analysts.items()
+        ]
+        platform_survey_task = self._create_platform_survey_task(survey_architect)
+        current_state_synthesis_task = self._create_current_state_synthesis_task(
+            engagement_analyst,
+            context=discovery_tasks
+        )
+        target_architecture_design_task = self._create_target_architecture_design_task(
+            principal_cloud_architect,
+            context=[current_state_synthesis_task, platform_survey_task]
+        )
+        risk_prescan_task = self._create_risk_prescan_task(
+            risk_compliance_officer,
+            context=[current_state_synthesis_task]
+        )
+        compliance_validation_task = self._create_compliance_validation_task(
+            risk_compliance_officer,
+            context=[target_architecture_design_task, risk_prescan_task]
+        )
+        report_generation_task = self._create_report_generation_task(
+            lead_planning_manager,
+            context=[current_state_synthesis_task, target_architecture_design_task, compliance_validation_task]
+        )
 
         # Set current agent context for logging
         if log_handler:
             log_handler.set_current_agent(engagement_analyst)
 
+        agents = [*discovery_analysts.values(), survey_architect, engagement_analyst,
+                  principal_cloud_architect, risk_compliance_officer, lead_planning_manager]
         return Crew(
-            agents=[engagement_analyst, principal_cloud_architect, risk_compliance_officer, lead_planning_manager],
-            tasks=[current_state_synthesis_task, target_architecture_design_task, compliance_validation_task, report_generation_task],
+            agents=agents,
+            tasks=[*discovery_tasks, platform_survey_task, current_state_synthesis_task, target_architecture_design_task,
+                   risk_prescan_task, compliance_validation_task, report_generation_task],
             process=Process.sequential,
-            verbose=True,
-            memory=True,  # Enable memory for better collaboration between agents
+            verbose=_crew_verbose(websocket, agents),
+            memory=persist_memory,
             callbacks=[log_handler] if log_handler else []
         )
     
     def create_document_generation_crew(self, project_id: str, llm, document_type: str,
                                       document_description: str, output_format: str = 'markdown',
-                                      websocket=None, crew_logger=None) -> Crew:
+                                      websocket=None, crew_logger=None, persist_memory: bool = False) -> Crew:
         """
         Create a specialized crew for document generation using RAG and knowledge graph.
 
         This crew focuses on creating professional documents based on project data,
-        uploaded documents, and knowledge graph relationships.
+        uploaded documents, and knowledge graph relationships. The tasks form a linear
+        pipeline where each one receives the previous output as context, so crew memory
+        is off by default; pass persist_memory=True to enable it.
         """
         # Initialize logging callback handler
-        log_handler = AgentLogStreamHandler(websocket=websocket) if websocket else None
+        log_handler = LogHandlerPool.acquire(websocket) if websocket else None
 
         # Initialize services and tools
         # RAGService needs LangChain-compatible LLM for EntityExtractionAgent
@@ -143,42 +523,46 @@ class CrewFactory:
 
                 project = ProjectObj(project_data)
                 langchain_llm = get_project_llm(project)
-                rag_service = RAGService(project_id, langchain_llm)
+                rag_service = _get_rag(project_id, langchain_llm)
             else:
                 # Fallback: use the passed LLM (might cause issues with EntityExtractionAgent)
-                rag_service = RAGService(project_id, llm)
+                rag_service = _get_rag(project_id, llm)
 
         except Exception as e:
             # Fallback: use the passed LLM
-            rag_service = RAGService(project_id, llm)
+            rag_service = _get_rag(project_id, llm)
 
-        rag_tool = RAGQueryTool(rag_service=rag_service)
-        graph_service = GraphService()
-        graph_tool = GraphQueryTool(graph_service=graph_service)
-        
-        # Initialize enhanced tools for document generation with project LLM
-        hybrid_search_tool = HybridSearchTool(project_id=project_id, llm=llm)
-        lessons_learned_tool = LessonsLearnedTool()
-        # Pass LLM to project knowledge base tool to avoid separate LLM initialization
-        project_kb_tool = ProjectKnowledgeBaseQueryTool(project_id=project_id, llm=llm)
+        # Tools are shared across builds for the same project, LLM and RAG service
+        tools = _get_document_tools(project_id, llm, rag_service)
+        rag_tool = tools['rag_tool']
+        graph_tool = tools['graph_tool']
+        hybrid_search_tool = tools['hybrid_search_tool']
+        project_kb_tool = tools['project_kb_tool']
 
         # Create document generation agents using centralized definitions with explicit LLM
-        document_researcher = AgentDefinitions.create_document_researcher([rag_tool, graph_tool, hybrid_search_tool, project_kb_tool], llm=llm)
-        content_architect = AgentDefinitions.create_content_architect([rag_tool, graph_tool, project_kb_tool], llm=llm)
-        quality_reviewer = AgentDefinitions.create_quality_reviewer([rag_tool, graph_tool], llm=llm)
-
-        # Create document generation tasks
-        research_task = self._create_research_task(document_researcher, document_type, document_description)
-        content_structure_task = self._create_content_structure_task(content_architect, document_type, output_format)
-        quality_review_task = self._create_quality_review_task(quality_reviewer, document_type, output_format)
-
+        document_researcher = AgentDefinitions.create_document_researcher(_available(rag_tool, graph_tool, hybrid_search_tool, project_kb_tool), llm=llm)
+        # Quality review only verifies content against the source documents, so it needs no graph tool
+        quality_reviewer = AgentDefinitions.create_quality_reviewer([rag_tool], llm=llm)
+
+        # Create document generation tasks; both share one template header string so every
+        # agent's prompt starts from the same requirements prefix
+        template_header = sys.intern(f"TEMPLATE REQUIREMENTS for {document_type}: {document_description}\n\n")
+        research_and_structure_task = self._create_research_and_structure_task(document_researcher, document_type, output_format, template_header)
+        quality_review_task = self._create_quality_review_task(quality_reviewer, document_type, output_format, template_header)
+
+        # Agent and tool events are recorded in the interaction log when a crew logger is given
+        callbacks = [log_handler] if log_handler else []
+        if crew_logger is not None:
+            callbacks.append(CrewLoggerCallback(crew_logger))
+
+        agents = [document_researcher, quality_reviewer]
         return Crew(
-            agents=[document_researcher, content_architect, quality_reviewer],
-            tasks=[research_task, content_structure_task, quality_review_task],
+            agents=agents,
+            tasks=[research_and_structure_task, quality_review_task],
             process=Process.sequential,
-            verbose=True,
-            memory=True,
-            callbacks=[log_handler] if log_handler else []
+            verbose=_crew_verbose(websocket, agents),
+            memory=persist_memory,
+            callbacks=callbacks
         )
     
     # Agent creation methods moved to backend/app/agents/agent_definitions.py
@@ -187,143 +571,93 @@ class CrewFactory:
     
 
     
-    def _create_current_state_synthesis_task(self, agent) -> Task:
-        """Create the current state synthesis task"""
+    def _create_discovery_task(self, agent, bucket: str) -> Task:
+        """Create one discovery task (the buckets run concurrently)"""
+        description, expected_output = DISCOVERY_BUCKETS[bucket]
         return Task(
-            description=(
-                "Perform comprehensive current state analysis using cross-modal synthesis. "
-                "Use the Hybrid Search Tool to query both semantic and graph databases. "
-                "Extract key technical and business requirements, identify critical dependencies, "
-                "and assess the current IT landscape. Focus on application portfolio, "
-                "infrastructure components, data flows, and integration patterns."
-            ),
-            expected_output=(
-                "A comprehensive current state analysis document containing: "
-                "1. Executive summary of current IT landscape "
-                "2. Application portfolio inventory with criticality ratings "
-                "3. Infrastructure component mapping "
-                "4. Data flow and integration analysis "
-                "5. Identified technical debt and modernization opportunities "
-                "6. Business impact assessment of current state limitations"
-            ),
-            agent=agent
+            description=description,
+            expected_output=expected_output,
+            agent=agent,
+            async_execution=True
         )
 
-    def _create_target_architecture_design_task(self, agent) -> Task:
-        """Create the target architecture design task"""
+    def _create_platform_survey_task(self, agent) -> Task:
+        """Create the platform survey task (runs concurrently with the discovery tasks)"""
+        description, expected_output = ASSESSMENT_TASKS['platform_survey']
         return Task(
-            description=(
-                "Design the target cloud architecture using the 6Rs migration framework. "
-                "Use the Cloud Service Catalog Tool to recommend optimal cloud services. "
-                "Create detailed landing zone specifications, network architecture, "
-                "and security controls. Consider cost optimization, performance, and scalability."
-            ),
-            expected_output=(
-                "A detailed target architecture design containing: "
-                "1. Cloud service recommendations with justifications "
-                "2. Landing zone architecture diagrams "
-                "3. Network and security design specifications "
-                "4. 6Rs migration strategy for each application "
-                "5. Cost optimization recommendations "
-                "6. Performance and scalability considerations"
-            ),
-            agent=agent
+            description=description,
+            expected_output=expected_output,
+            agent=agent,
+            async_execution=True
         )
 
-    def _create_compliance_validation_task(self, agent) -> Task:
-        """Create the compliance validation task"""
+    def _create_current_state_synthesis_task(self, agent, context) -> Task:
+        """Create the current state synthesis task (joins the discovery tasks)"""
+        description, expected_output = ASSESSMENT_TASKS['current_state_synthesis']
         return Task(
-            description=(
-                "Conduct comprehensive compliance validation using the Compliance Framework Tool. "
-                "Assess current state against regulatory requirements (GDPR, SOX, HIPAA, PCI-DSS). "
-                "Identify security gaps and provide detailed remediation strategies. "
-                "Ensure target architecture meets all compliance requirements."
-            ),
-            expected_output=(
-                "A comprehensive compliance assessment containing: "
-                "1. Current state compliance gap analysis "
-                "2. Regulatory requirements mapping "
-                "3. Security control recommendations "
-                "4. Risk assessment and mitigation strategies "
-                "5. Compliance validation for target architecture "
-                "6. Audit trail and documentation requirements"
-            ),
-            agent=agent
+            description=description,
+            expected_output=expected_output,
+            agent=agent,
+            context=context
         )
 
-    def _create_report_generation_task(self, agent) -> Task:
-        """Create the report generation task"""
+    def _create_target_architecture_design_task(self, agent, context) -> Task:
+        """Create the target architecture design task (runs concurrently with the risk pre-scan)"""
+        description, expected_output = ASSESSMENT_TASKS['target_architecture_design']
         return Task(
-            description=(
-                "Synthesize all findings into a comprehensive migration assessment report. "
-                "Use the Lessons Learned Tool to incorporate best practices. "
-                "Create detailed wave planning, timeline, and risk mitigation strategies. "
-                "Ensure executive-ready deliverables with clear recommendations."
-            ),
-            expected_output=(
-                "A comprehensive migration assessment report containing: "
-                "1. Executive summary with key recommendations "
-                "2. Detailed migration roadmap with wave planning "
-                "3. Cost-benefit analysis and ROI projections "
-                "4. Risk assessment and mitigation strategies "
-                "5. Implementation timeline and resource requirements "
-                "6. Success metrics and KPIs for migration tracking"
-            ),
-            agent=agent
+            description=description,
+            expected_output=expected_output,
+            agent=agent,
+            context=context,
+            async_execution=True
         )
 
-    def _create_research_task(self, agent, document_type: str, document_description: str) -> Task:
-        """Create the research task for document generation"""
+    def _create_risk_prescan_task(self, agent, context) -> Task:
+        """Create the risk pre-scan task (runs concurrently with the architecture design)"""
+        description, expected_output = ASSESSMENT_TASKS['risk_prescan']
         return Task(
-            description=(
-                f"Research and gather information for {document_type} generation. "
-                f"Focus on: {document_description}. "
-                "Use all available tools to extract relevant information from project documents, "
-                "knowledge base, and graph relationships."
-            ),
-            expected_output=(
-                f"Comprehensive research findings for {document_type} including: "
-                "1. Relevant information extracted from project documents "
-                "2. Key insights from knowledge base queries "
-                "3. Relationship analysis from graph database "
-                "4. Supporting data and evidence for document creation"
-            ),
-            agent=agent
+            description=description,
+            expected_output=expected_output,
+            agent=agent,
+            context=context,
+            async_execution=True
+        )
+
+    def _create_compliance_validation_task(self, agent, context) -> Task:
+        """Create the compliance validation task"""
+        description, expected_output = ASSESSMENT_TASKS['compliance_validation']
+        return Task(
+            description=description,
+            expected_output=expected_output,
+            agent=agent,
+            context=context
+        )
+
+    def _create_report_generation_task(self, agent, context) -> Task:
+        """Create the report generation task"""
+        description, expected_output = ASSESSMENT_TASKS['report_generation']
+        return Task(
+            description=description,
+            expected_output=expected_output,
+            agent=agent,
+            context=context
         )
 
-    def _create_content_structure_task(self, agent, document_type: str, output_format: str) -> Task:
-        """Create the content structure task for document generation"""
+    def _create_research_and_structure_task(self, agent, document_type: str, output_format: str, template_header: str) -> Task:
+        """Create the combined research and content structure task for document generation"""
+        description, expected_output = _document_task_texts('research_and_structure', template_header, document_type, output_format)
         return Task(
-            description=(
-                f"Structure and organize content for {document_type} in {output_format} format. "
-                "Create a well-organized document structure with clear sections, "
-                "proper formatting, and logical flow of information."
-            ),
-            expected_output=(
-                f"Well-structured {document_type} in {output_format} format containing: "
-                "1. Clear document structure with appropriate sections "
-                "2. Properly formatted content with consistent styling "
-                "3. Logical information flow and organization "
-                "4. Professional presentation suitable for stakeholders"
-            ),
+            description=description,
+            expected_output=expected_output,
             agent=agent
         )
 
-    def _create_quality_review_task(self, agent, document_type: str, output_format: str) -> Task:
+    def _create_quality_review_task(self, agent, document_type: str, output_format: str, template_header: str) -> Task:
         """Create the quality review task for document generation"""
+        description, expected_output = _document_task_texts('quality_review', template_header, document_type, output_format)
         return Task(
-            description=(
-                f"Review and validate the quality of the generated {document_type}. "
-                "Ensure accuracy, completeness, and professional standards. "
-                "Verify all information is correctly represented and properly formatted."
-            ),
-            expected_output=(
-                f"Quality-assured {document_type} in {output_format} format with: "
-                "1. Verified accuracy of all information "
-                "2. Complete coverage of required topics "
-                "3. Professional formatting and presentation "
-                "4. Quality assurance report with any recommendations"
-            ),
+            description=description,
+            expected_output=expected_output,
             agent=agent
         )
 
@@ -5,45 +5,160 @@ Dynamic Crew Loader - Loads crew definitions from YAML configuration
 import yaml
 import os
 import json
-from typing import Dict, List, Any
+import asyncio
+import functools
+import importlib
+import re
+import string
+import tempfile
+from threading import Lock
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from crewai import Agent, Task, Crew, Process
 from .rag_service import RAGService
-from .graph_service import GraphService
 # from ..tools.hybrid_search_tool import HybridSearchTool
 # from ..tools.live_data_fetch_tool import LiveDataFetchTool
 # from ..tools.lessons_learned_tool import LessonsLearnedTool
 # from ..tools.context_tool import ContextTool
-from ..tools.rag_query_tool import RAGQueryTool
-from ..tools.graph_query_tool import GraphQueryTool
-from .crew import AgentLogStreamHandler
+from .crew import CREW_VERBOSE, LogHandlerPool, _disable_agentops
+from .service_pool import get_rag_service, get_graph_service
 import logging
 
 logger = logging.getLogger(__name__)
 
+# LibYAML's C parser and emitter when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so error handling is the same
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+_DEFAULT_CONFIG_PATH = os.path.join(_BACKEND_DIR, "crew_definitions.yaml")
+# Generated from the default YAML by scripts/compile_crew_definitions.py; used instead of
+# parsing the YAML while it is at least as new as the YAML file
+_COMPILED_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "crew_definitions_compiled.py")
+# (st_mtime_ns of the compiled module, its CONFIG) once imported
+_compiled_config: Optional[Tuple[int, Dict[str, Any]]] = None
+
+# Defaults for crews with parallel_groups when the crew does not set them; the timeout
+# abandons the wait for a stage but cannot stop its crews (see ParallelCrew)
+DEFAULT_MAX_PARALLEL_AGENTS = 3
+DEFAULT_STAGE_TIMEOUT_SECONDS = 900
+
+
+@functools.lru_cache(maxsize=512)
+def _template_fields(template: str) -> Tuple[str, ...]:
+    """Client profile keys referenced by a format template (parsed once per template)"""
+    return tuple(dict.fromkeys(
+        re.split(r'[.\[]', name, 1)[0]
+        for _, name, _, _ in string.Formatter().parse(template) if name
+    ))
+
+
+def _render(template: str, profile: Dict[str, Any]) -> str:
+    """template.format(**profile), passing only the profile keys the template uses"""
+    return template.format_map({key: profile[key] for key in _template_fields(template)})
+
+
+class ParallelCrew:
+    """
+    Runs a crew as a sequence of stages, each stage being one or more single-task crews.
+
+    The crews of a stage are started together with Crew.kickoff_async and the next stage
+    begins when all of them have finished; every task receives the outputs of all tasks
+    in earlier stages as its context. At most max_parallel crews run at once.
+
+    timeout_seconds only bounds how long a stage is waited for: CrewAI runs each kickoff
+    in a worker thread that cannot be cancelled, so a crew that times out (and the other
+    crews of its stage) keep running in the background while kickoff_async raises
+    asyncio.TimeoutError.
+    """
+
+    def __init__(self, stages: List[List[Crew]], max_parallel: int, timeout_seconds: Optional[float]):
+        self.stages = stages
+        self.max_parallel = max_parallel
+        self.timeout_seconds = timeout_seconds
+
+    async def kickoff_async(self, inputs: Optional[Dict[str, Any]] = None):
+        """Run all stages; returns the output of the last crew"""
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        async def run(crew: Crew):
+            async with semaphore:
+                return await asyncio.wait_for(crew.kickoff_async(inputs=inputs), self.timeout_seconds)
+
+        result = None
+        for stage in self.stages:
+            results = await asyncio.gather(*(run(crew) for crew in stage))
+            result = results[-1]
+        return result
+
+    def kickoff(self, inputs: Optional[Dict[str, Any]] = None):
+        """Blocking variant of kickoff_async (call it from a worker thread, not the event loop)"""
+        return asyncio.run(self.kickoff_async(inputs))
+
+    @property
+    def callbacks(self) -> List[Any]:
+        """Callbacks shared by the stage crews"""
+        return self.stages[0][0].callbacks if self.stages and self.stages[0] else []
+
+
 class CrewDefinitionLoader:
     """Loads and manages crew definitions from YAML configuration"""
 
+    __slots__ = (
+        'config_path', 'client_profile_path', 'config', 'client_profile',
+        '_crews_by_id', '_agents_by_id', '_tasks_by_id', '_tools_by_id',
+        '_crew_factories', '_tool_instances', '_tool_instances_lock', '_tool_factories',
+    )
+
+    # config path -> (st_mtime_ns, parsed config), shared by all loaders
+    _cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
     def __init__(self, config_path: str = None, client_profile_path: str = None):
         if config_path is None:
-            backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-            config_path = os.path.join(backend_dir, "crew_definitions.yaml")
+            config_path = _DEFAULT_CONFIG_PATH
         
         if client_profile_path is None:
-            backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-            client_profile_path = os.path.join(backend_dir, "..", "config", "client_profile.json")
+            client_profile_path = os.path.join(_BACKEND_DIR, "..", "config", "client_profile.json")
 
         self.config_path = config_path
         self.client_profile_path = client_profile_path
         self.config = None
         self.client_profile = None
+        # Indices derived from self.config by _set_config
+        self._crews_by_id: Dict[str, Dict[str, Any]] = {}
+        self._agents_by_id: Dict[str, Dict[str, Any]] = {}
+        self._tasks_by_id: Dict[str, Dict[str, Any]] = {}
+        self._tools_by_id: Dict[str, Dict[str, Any]] = {}
+        # crew_id -> (config the factory was built from, factory)
+        self._crew_factories: Dict[str, tuple] = {}
+        # (project_id, id(llm), tool_ids) -> (RAG service the tools were built on, tools)
+        self._tool_instances: Dict[Tuple[str, int, Tuple[str, ...]], Tuple[RAGService, List[Any]]] = {}
+        self._tool_instances_lock = Lock()
+        # tool id -> factory(rag_service, graph_service), built on first use
+        self._tool_factories: Optional[Dict[str, Callable[[RAGService, Any], Any]]] = None
         self.load_config()
         self.load_client_profile()
 
     def load_config(self) -> Dict[str, Any]:
-        """Load crew definitions from YAML file"""
+        """Load crew definitions from YAML file (reparsed only when the file's mtime changed)"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as file:
-                self.config = yaml.safe_load(file)
+            mtime = os.stat(self.config_path).st_mtime_ns
+            cached = self._cache.get(self.config_path)
+            if cached is not None and cached[0] == mtime:
+                if self.config is not cached[1]:
+                    self._set_config(cached[1])
+                return self.config
+            config = self._load_compiled_config(mtime)
+            if config is None:
+                with open(self.config_path, 'rb') as file:
+                    config = yaml.load(file, Loader=_YAML_LOADER)
+            self._cache[self.config_path] = (mtime, config)
+            self._set_config(config)
             logger.info(f"Loaded crew definitions from {self.config_path}")
             return self.config
         except FileNotFoundError:
@@ -53,11 +168,36 @@ class CrewDefinitionLoader:
             logger.error(f"Error parsing YAML file: {e}")
             raise
 
+    def _load_compiled_config(self, yaml_mtime: int) -> Optional[Dict[str, Any]]:
+        """CONFIG of the compiled crew definitions module, or None if absent, stale or not for this file"""
+        if os.path.abspath(self.config_path) != os.path.abspath(_DEFAULT_CONFIG_PATH):
+            return None
+        global _compiled_config
+        try:
+            compiled_mtime = os.stat(_COMPILED_CONFIG_PATH).st_mtime_ns
+            if compiled_mtime < yaml_mtime:
+                logger.debug("Compiled crew definitions are older than the YAML file; parsing YAML")
+                return None
+            if _compiled_config is None or _compiled_config[0] != compiled_mtime:
+                module = importlib.import_module('.crew_definitions_compiled', __package__)
+                if _compiled_config is not None:
+                    # Recompiled since it was first imported
+                    module = importlib.reload(module)
+                _compiled_config = (compiled_mtime, module.CONFIG)
+            return _compiled_config[1]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring compiled crew definitions: {e}")
+            return None
+
     def load_client_profile(self) -> Dict[str, Any]:
         """Load client profile from JSON file"""
         try:
-            with open(self.client_profile_path, 'r', encoding='utf-8') as file:
-                self.client_profile = json.load(file)
+            with open(self.client_profile_path, 'rb') as file:
+                self.client_profile = _json_loads(file.read())
+            self._crew_factories.clear()
+            self._compile_crew_factories()
             logger.info(f"Loaded client profile from {self.client_profile_path}")
             return self.client_profile
         except FileNotFoundError:
@@ -68,67 +208,145 @@ class CrewDefinitionLoader:
             raise
 
     def save_config(self, config: Dict[str, Any]) -> None:
-        """Save crew definitions to YAML file"""
+        """Save crew definitions to YAML file (written to a temp file, then atomically replaced)"""
+        tmp_path = None
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as file:
-                yaml.dump(config, file, default_flow_style=False, allow_unicode=True, indent=2)
-            self.config = config
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(self.config_path) or '.',
+                                             prefix='.crew_definitions.', suffix='.tmp', delete=False) as file:
+                tmp_path = file.name
+                yaml.dump(config, file, Dumper=_YAML_DUMPER, default_flow_style=False, allow_unicode=True, indent=2)
+            os.replace(tmp_path, self.config_path)
+            tmp_path = None
+            # The saved dict is what the file now holds; readers need not parse it again
+            self._cache[self.config_path] = (os.stat(self.config_path).st_mtime_ns, config)
+            self._set_config(config)
             logger.info(f"Saved crew definitions to {self.config_path}")
         except Exception as e:
             logger.error(f"Error saving YAML file: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
             raise
 
+    def _set_config(self, config: Dict[str, Any]) -> None:
+        """Make config current and rebuild the id indices derived from it"""
+        self.config = config
+        # First definition wins for duplicate crew ids, as with the former linear scan
+        self._crews_by_id = {crew['id']: crew for crew in reversed(config.get('crews', []))}
+        self._agents_by_id = {agent['id']: agent for agent in config.get('agents', [])}
+        self._tasks_by_id = {task['id']: task for task in config.get('tasks', [])}
+        self._tools_by_id = {tool['id']: tool for tool in config.get('available_tools', [])}
+        self._crew_factories.clear()
+        self._compile_crew_factories()
+
+    def _compile_crew_factories(self) -> None:
+        """
+        Build the factory of every configured crew now, once per config and client profile.
+
+        Until the client profile is loaded the factories are left to be built on first use.
+        A crew whose definition is invalid is skipped here; create_crew raises for it.
+        """
+        if self.client_profile is None:
+            return
+        for crew_id in self._crews_by_id:
+            try:
+                self.build_crew_factory(crew_id)
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Crew '{crew_id}' could not be prepared: {e}")
+
     def get_config(self) -> Dict[str, Any]:
-        """Get current configuration"""
+        """Get current configuration (reloaded if the YAML file changed on disk)"""
         if self.config is None:
             self.load_config()
+        else:
+            self._maybe_reload()
         return self.config
 
+    def _maybe_reload(self) -> None:
+        """Reparse the YAML file only if its mtime differs from the loaded config's"""
+        try:
+            mtime = os.stat(self.config_path).st_mtime_ns
+        except OSError as e:
+            # Keep serving the loaded config while the file is briefly missing
+            logger.warning(f"Cannot stat crew definitions {self.config_path}: {e}")
+            return
+        cached = self._cache.get(self.config_path)
+        if cached is None or cached[0] != mtime or cached[1] is not self.config:
+            self.load_config()
+
     def get_available_tools(self) -> Dict[str, Any]:
         """Get available tools mapping"""
-        config = self.get_config()
-        return {tool['id']: tool for tool in config.get('available_tools', [])}
-
-    def create_tool_instances(self, tool_ids: List[str], project_id: str, llm) -> List[Any]:
-        """Create tool instances based on tool IDs"""
-        tools = []
-
-        # Initialize services
-        rag_service = RAGService(project_id, llm)
-        graph_service = GraphService()
-
+        self.get_config()
+        return self._tools_by_id
+
+    def create_tool_instances(self, tool_ids: List[str], project_id: str, llm,
+                              rag_service: Optional[RAGService] = None) -> List[Any]:
+        """
+        Get tool instances for the tool IDs.
+
+        Services come from the process-wide service pool (callers building several agents
+        pass the project's RAG service in), and the tools built on them are memoized per
+        project, LLM and tool list until that pool hands out a new RAG service (e.g. after
+        invalidate_project_services) or invalidate() is called.
+        """
+        if rag_service is None:
+            rag_service = get_rag_service(project_id, llm)
+        key = (project_id, id(llm), tuple(tool_ids))
+        with self._tool_instances_lock:
+            cached = self._tool_instances.get(key)
+        if cached is not None and cached[0] is rag_service:
+            return list(cached[1])
+
+        tool_factories = self._get_tool_factories()
+        graph_service = get_graph_service()
+        tools = [
+            tool_factories[tool_id](rag_service, graph_service)
+            for tool_id in tool_ids
+            if tool_id in tool_factories
+        ]
         for tool_id in tool_ids:
-            # if tool_id == 'hybrid_search_tool':
-            #     tools.append(HybridSearchTool())
-            # if tool_id == 'live_data_fetch_tool':
-            #     tools.append(LiveDataFetchTool())
-            # if tool_id == 'lessons_learned_tool':
-            #     tools.append(LessonsLearnedTool())
-            # if tool_id == 'context_tool':
-            #     tools.append(ContextTool())
-            if tool_id == 'rag_tool':
-                tools.append(RAGQueryTool(rag_service=rag_service))
-            elif tool_id == 'graph_tool':
-                tools.append(GraphQueryTool(graph_service=graph_service))
-            # TODO: Add other tools as they are implemented
-            # elif tool_id == 'cloud_catalog_tool':
-            #     tools.append(CloudCatalogTool())
-            # elif tool_id == 'compliance_framework_tool':
-            #     tools.append(ComplianceFrameworkTool())
-            # elif tool_id == 'project_planning_tool':
-            #     tools.append(ProjectPlanningTool())
-            else:
+            if tool_id not in tool_factories:
                 logger.warning(f"Unknown tool ID: {tool_id}")
 
-        return tools
+        with self._tool_instances_lock:
+            self._tool_instances[key] = (rag_service, tools)
+        return list(tools)
+
+    def _get_tool_factories(self) -> Dict[str, Callable[[RAGService, Any], Any]]:
+        """tool id -> factory(rag_service, graph_service); tool modules are imported on first use"""
+        if self._tool_factories is None:
+            from ..tools.rag_query_tool import RAGQueryTool
+            from ..tools.graph_query_tool import GraphQueryTool
+
+            self._tool_factories = {
+                'rag_tool': lambda rag_service, graph_service: RAGQueryTool(rag_service=rag_service),
+                'graph_tool': lambda rag_service, graph_service: GraphQueryTool(graph_service=graph_service),
+                # TODO: Add other tools as they are implemented
+                # 'hybrid_search_tool': ... HybridSearchTool(),
+                # 'live_data_fetch_tool': ... LiveDataFetchTool(),
+                # 'lessons_learned_tool': ... LessonsLearnedTool(),
+                # 'context_tool': ... ContextTool(),
+                # 'cloud_catalog_tool': ... CloudCatalogTool(),
+                # 'compliance_framework_tool': ... ComplianceFrameworkTool(),
+                # 'project_planning_tool': ... ProjectPlanningTool(),
+            }
+        return self._tool_factories
+
+    def invalidate(self, project_id: Optional[str] = None) -> None:
+        """Drop memoized tool instances for a project (all projects when None)"""
+        with self._tool_instances_lock:
+            for key in [k for k in self._tool_instances if project_id is None or k[0] == project_id]:
+                del self._tool_instances[key]
 
     def create_agent(self, agent_config: Dict[str, Any], project_id: str, llm) -> Agent:
         """Create an Agent instance from configuration"""
         tools = self.create_tool_instances(agent_config.get('tools', []), project_id, llm)
 
         # Format goal and backstory with client profile
-        goal = agent_config['goal'].format(**self.client_profile)
-        backstory = agent_config['backstory'].format(**self.client_profile)
+        goal = _render(agent_config['goal'], self.client_profile)
+        backstory = _render(agent_config['backstory'], self.client_profile)
 
         return Agent(
             role=agent_config['role'],
@@ -137,7 +355,7 @@ class CrewDefinitionLoader:
             tools=tools,
             llm=llm,
             allow_delegation=agent_config.get('allow_delegation', False),
-            verbose=agent_config.get('verbose', True)
+            verbose=agent_config.get('verbose', False)
         )
 
     def create_task(self, task_config: Dict[str, Any], agents_dict: Dict[str, Agent]) -> Task:
@@ -147,8 +365,8 @@ class CrewDefinitionLoader:
             raise ValueError(f"Agent '{agent_id}' not found for task '{task_config['id']}'")
 
         # Format description and expected_output with client profile
-        description = task_config['description'].format(**self.client_profile)
-        expected_output = task_config['expected_output'].format(**self.client_profile)
+        description = _render(task_config['description'], self.client_profile)
+        expected_output = _render(task_config['expected_output'], self.client_profile)
 
         return Task(
             description=description,
@@ -156,75 +374,187 @@ class CrewDefinitionLoader:
             agent=agents_dict[agent_id]
         )
 
-    def create_crew(self, crew_id: str, project_id: str, llm, websocket=None) -> Crew:
-        """Create a Crew instance from configuration"""
-        config = self.get_config()
+    def build_crew_factory(self, crew_id: str) -> Callable[..., Crew]:
+        """
+        Get a factory that builds the given crew for a project.
+
+        All configuration lookups, reference checks and client-profile formatting are
+        done once here; the factory only instantiates tools, agents, tasks and the crew.
+        Factories are built for every crew when the configuration or client profile is
+        loaded, and cached until the configuration object is replaced (reload/save).
 
-        # Find crew configuration
-        crew_config = None
-        for crew in config.get('crews', []):
-            if crew['id'] == crew_id:
-                crew_config = crew
-                break
+        A crew may list parallel_groups (lists of its task ids that do not depend on each
+        other); the factory then returns a ParallelCrew that runs each group concurrently,
+        limited by the crew's max_parallel_agents and timeout_seconds.
+        """
+        config = self.get_config()
+        cached = self._crew_factories.get(crew_id)
+        if cached is not None and cached[0] is config:
+            return cached[1]
 
+        crew_config = self._crews_by_id.get(crew_id)
         if crew_config is None:
             raise ValueError(f"Crew '{crew_id}' not found in configuration")
 
-        # Create agents
-        agents_dict = {}
-        agents_list = []
-
-        agent_configs = {agent['id']: agent for agent in config.get('agents', [])}
+        agent_configs = self._agents_by_id
+        task_configs = self._tasks_by_id
+        profile = self.client_profile or {}
 
+        # Resolve agents: (agent_id, tool_ids, verbose, Agent kwargs without tools/llm/verbose)
+        agent_specs = []
         for agent_id in crew_config['agents']:
             if agent_id not in agent_configs:
                 raise ValueError(f"Agent '{agent_id}' not found in configuration")
-
-            agent = self.create_agent(agent_configs[agent_id], project_id, llm)
-            agents_dict[agent_id] = agent
-            agents_list.append(agent)
-
-        # Create tasks
-        tasks_list = []
-        task_configs = {task['id']: task for task in config.get('tasks', [])}
-
+            agent_config = agent_configs[agent_id]
+            agent_specs.append((agent_id, tuple(agent_config.get('tools', [])), bool(agent_config.get('verbose', False)), {
+                'role': agent_config['role'],
+                'goal': _render(agent_config['goal'], profile),
+                'backstory': _render(agent_config['backstory'], profile),
+                'allow_delegation': agent_config.get('allow_delegation', False)
+            }))
+        agent_ids = {agent_id for agent_id, _, _, _ in agent_specs}
+
+        # Resolve tasks: (agent_id, Task kwargs without agent)
+        task_specs = []
         for task_id in crew_config['tasks']:
             if task_id not in task_configs:
                 raise ValueError(f"Task '{task_id}' not found in configuration")
-
-            task = self.create_task(task_configs[task_id], agents_dict)
-            tasks_list.append(task)
-
-        # Create callback handler for logging
-        callbacks = []
-        if websocket:
-            log_handler = AgentLogStreamHandler(websocket=websocket)
-            callbacks.append(log_handler)
+            task_config = task_configs[task_id]
+            if task_config['agent'] not in agent_ids:
+                raise ValueError(f"Agent '{task_config['agent']}' not found for task '{task_config['id']}'")
+            task_specs.append((task_config['agent'], {
+                'description': _render(task_config['description'], profile),
+                'expected_output': _render(task_config['expected_output'], profile)
+            }))
 
         # Determine process type
-        process_type = Process.sequential
-        if crew_config.get('process') == 'hierarchical':
-            process_type = Process.hierarchical
-
-        return Crew(
-            agents=agents_list,
-            tasks=tasks_list,
-            process=process_type,
-            verbose=bool(crew_config.get('verbose', True)),
-            memory=crew_config.get('memory', True),
-            callbacks=callbacks
-        )
+        process_type = Process.hierarchical if crew_config.get('process') == 'hierarchical' else Process.sequential
+        # Verbose output needs both the crew's verbose: true and CREW_VERBOSE, and is only
+        # produced for crews with a websocket attached; agents are verbose only inside a
+        # verbose crew
+        crew_verbose = CREW_VERBOSE and bool(crew_config.get('verbose', False))
+        # Memory embeds and stores every agent step; crews opt in with memory: true
+        crew_memory = crew_config.get('memory', False)
+
+        # Stages as lists of task positions: each parallel group runs as one stage at the
+        # position of its first task, every other task is a stage of its own
+        stages = self._resolve_stages(crew_config, task_specs)
+        if stages is not None and process_type != Process.sequential:
+            raise ValueError(f"Crew '{crew_id}' uses parallel_groups, which require the sequential process")
+        max_parallel = int(crew_config.get('max_parallel_agents', DEFAULT_MAX_PARALLEL_AGENTS))
+        timeout_seconds = crew_config.get('timeout_seconds', DEFAULT_STAGE_TIMEOUT_SECONDS)
+        hierarchical = process_type == Process.hierarchical
+
+        def build_tasks(project_id: str, llm, verbose: bool):
+            # One service pool lookup per crew build, shared by every agent's tools
+            rag_service = get_rag_service(project_id, llm)
+            agents_dict = {
+                agent_id: Agent(tools=self.create_tool_instances(tool_ids, project_id, llm, rag_service), llm=llm,
+                                verbose=verbose and agent_verbose, **agent_kwargs)
+                for agent_id, tool_ids, agent_verbose, agent_kwargs in agent_specs
+            }
+            return agents_dict, [Task(agent=agents_dict[agent_id], **task_kwargs) for agent_id, task_kwargs in task_specs]
+
+        def flat_factory(project_id: str, llm, websocket=None, memory: Optional[bool] = None) -> Crew:
+            verbose = crew_verbose and websocket is not None
+            agents_dict, tasks_list = build_tasks(project_id, llm, verbose)
+            # The hierarchical process needs a manager; it plans with the crew's LLM
+            return Crew(
+                agents=list(agents_dict.values()),
+                tasks=tasks_list,
+                process=process_type,
+                verbose=verbose,
+                memory=crew_memory if memory is None else memory,
+                callbacks=[LogHandlerPool.acquire(websocket)] if websocket else [],
+                **({'manager_llm': llm} if hierarchical else {})
+            )
+
+        def staged_factory(project_id: str, llm, websocket=None, memory: Optional[bool] = None) -> ParallelCrew:
+            verbose = crew_verbose and websocket is not None
+            _, tasks_list = build_tasks(project_id, llm, verbose)
+            use_memory = crew_memory if memory is None else memory
+            callbacks = [LogHandlerPool.acquire(websocket)] if websocket else []
+            stage_crews = []
+            earlier_tasks = []
+            for stage in stages:
+                stage_tasks = [tasks_list[i] for i in stage]
+                for task in stage_tasks:
+                    task.context = list(earlier_tasks)
+                stage_crews.append([
+                    Crew(
+                        agents=[task.agent],
+                        tasks=[task],
+                        process=Process.sequential,
+                        verbose=verbose,
+                        memory=use_memory,
+                        callbacks=callbacks
+                    )
+                    for task in stage_tasks
+                ])
+                earlier_tasks.extend(stage_tasks)
+            return ParallelCrew(stage_crews, max_parallel, timeout_seconds)
+
+        factory = flat_factory if stages is None else staged_factory
+        self._crew_factories[crew_id] = (config, factory)
+        return factory
+
+    @staticmethod
+    def _resolve_stages(crew_config: Dict[str, Any], task_specs: List[tuple]) -> Optional[List[List[int]]]:
+        """Group the crew's task positions into stages, or None without parallel_groups"""
+        parallel_groups = crew_config.get('parallel_groups')
+        if not parallel_groups:
+            return None
+
+        task_ids = crew_config['tasks']
+        # First position of each task id, as list.index would find it
+        position_of = {}
+        for position, task_id in enumerate(task_ids):
+            position_of.setdefault(task_id, position)
+        group_of = {}
+        for group_index, group in enumerate(parallel_groups):
+            group_agents = set()
+            for task_id in group:
+                if task_id not in position_of:
+                    raise ValueError(f"Parallel group task '{task_id}' is not a task of crew '{crew_config['id']}'")
+                if task_id in group_of:
+                    raise ValueError(f"Task '{task_id}' is in more than one parallel group")
+                agent_id = task_specs[position_of[task_id]][0]
+                if agent_id in group_agents:
+                    raise ValueError(f"Agent '{agent_id}' has more than one task in a parallel group")
+                group_agents.add(agent_id)
+                group_of[task_id] = group_index
+
+        stages = []
+        emitted_groups = set()
+        for position, task_id in enumerate(task_ids):
+            group_index = group_of.get(task_id)
+            if group_index is None:
+                stages.append([position])
+            elif group_index not in emitted_groups:
+                emitted_groups.add(group_index)
+                stages.append([position_of[group_task] for group_task in parallel_groups[group_index]])
+        return stages
+
+    def create_crew(self, crew_id: str, project_id: str, llm, websocket=None, memory: Optional[bool] = None) -> Crew:
+        """
+        Create a Crew instance from configuration (memory overrides the crew's memory setting).
+
+        Every call builds a new crew from the crew's prepared factory; CrewAI keeps per-run
+        state (task outputs, usage metrics) on a crew, so crews are not reused across runs.
+        """
+        _disable_agentops()
+        return self.build_crew_factory(crew_id)(project_id, llm, websocket, memory)
 
 # Global instance
 crew_loader = CrewDefinitionLoader()
 
-def create_assessment_crew_from_config(project_id: str, llm, websocket=None) -> Crew:
-    """Create assessment crew from YAML configuration"""
-    return crew_loader.create_crew('assessment_crew', project_id, llm, websocket)
+def create_assessment_crew_from_config(project_id: str, llm, websocket=None, enable_memory: Optional[bool] = None) -> Crew:
+    """Create assessment crew from YAML configuration (enable_memory overrides the YAML memory setting)"""
+    return crew_loader.create_crew('assessment_crew', project_id, llm, websocket, enable_memory)
 
-def create_document_generation_crew_from_config(project_id: str, llm, websocket=None) -> Crew:
-    """Create document generation crew from YAML configuration"""
-    return crew_loader.create_crew('document_generation_crew', project_id, llm, websocket)
+def create_document_generation_crew_from_config(project_id: str, llm, websocket=None, enable_memory: Optional[bool] = None) -> Crew:
+    """Create document generation crew from YAML configuration (enable_memory overrides the YAML memory setting)"""
+    return crew_loader.create_crew('document_generation_crew', project_id, llm, websocket, enable_memory)
 
 def get_crew_definitions() -> Dict[str, Any]:
     """Get current crew definitions"""
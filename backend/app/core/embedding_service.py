@@ -8,11 +8,32 @@ import hashlib
 import json
 from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
+from threading import Lock
 import numpy as np
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+class EmbeddingModelRegistry:
+    """Process-wide SentenceTransformer models, each loaded once and shared by name"""
+
+    _models: Dict[str, Any] = {}
+    _lock = Lock()
+
+    @classmethod
+    def get(cls, model_name: str):
+        """Get the shared model, loading it on first use (raises if it cannot be loaded)"""
+        model = cls._models.get(model_name)
+        if model is None:
+            with cls._lock:
+                model = cls._models.get(model_name)
+                if model is None:
+                    from sentence_transformers import SentenceTransformer
+                    model = cls._models[model_name] = SentenceTransformer(model_name)
+                    logger.info(f"Loaded embedding model: {model_name}")
+        return model
+
+
 @dataclass
 class EmbeddingResult:
     """Result of embedding operation"""
@@ -41,15 +62,13 @@ class EmbeddingService:
     def _initialize_models(self):
         """Initialize embedding models"""
         try:
-            from sentence_transformers import SentenceTransformer
-            
-            # Initialize text embedding model
-            self.text_model = SentenceTransformer(self.default_model)
+            # Models are shared by every RAG service through the registry
+            self.text_model = EmbeddingModelRegistry.get(self.default_model)
             logger.info(f"Initialized text embedding model: {self.default_model}")
             
             # Initialize code embedding model if available
             try:
-                self.code_model = SentenceTransformer('microsoft/codebert-base')
+                self.code_model = EmbeddingModelRegistry.get('microsoft/codebert-base')
                 logger.info("Initialized code embedding model: microsoft/codebert-base")
             except Exception as e:
                 logger.warning(f"Code embedding model not available: {str(e)}")
@@ -14,19 +14,22 @@ if not db_logger.hasHandlers():
     db_logger.addHandler(db_handler)
 db_logger.setLevel(logging.INFO)
 
+# Size of the shared Neo4j driver's connection pool (crews query the graph concurrently)
+NEO4J_MAX_CONNECTIONS = int(os.getenv("NEO4J_MAX_CONNECTIONS", "50"))
+
 class GraphServicePool:
     """Connection pool manager for Neo4j"""
     _instance = None
     _lock = Lock()
 
-    def __new__(cls, max_connections: int = 10):
+    def __new__(cls, max_connections: int = NEO4J_MAX_CONNECTIONS):
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
                     cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, max_connections: int = 10):
+    def __init__(self, max_connections: int = NEO4J_MAX_CONNECTIONS):
         if hasattr(self, 'initialized'):
             return
 
@@ -83,7 +86,8 @@ class GraphServicePool:
 
         with self.connection_lock:
             self.active_connections += 1
-            db_logger.debug(f"Active connections: {self.active_connections}/{self.max_connections}")
+            if db_logger.isEnabledFor(logging.DEBUG):
+                db_logger.debug(f"Active connections: {self.active_connections}/{self.max_connections}")
 
         return self.driver.session()
 
@@ -91,7 +95,8 @@ class GraphServicePool:
         """Release a session back to the pool"""
         with self.connection_lock:
             self.active_connections = max(0, self.active_connections - 1)
-            db_logger.debug(f"Active connections: {self.active_connections}/{self.max_connections}")
+            if db_logger.isEnabledFor(logging.DEBUG):
+                db_logger.debug(f"Active connections: {self.active_connections}/{self.max_connections}")
 
     def close(self):
         """Close the driver and all connections"""
@@ -100,7 +105,7 @@ class GraphServicePool:
             db_logger.info("Neo4j connection pool closed")
 
 class GraphService:
-    def __init__(self, use_connection_pool: bool = True, max_connections: int = 10):
+    def __init__(self, use_connection_pool: bool = True, max_connections: int = NEO4J_MAX_CONNECTIONS):
         self.use_connection_pool = use_connection_pool
 
         if use_connection_pool:
@@ -148,7 +153,8 @@ class GraphService:
                     records = [dict(record) for record in results]
                     execution_time = time.time() - start_time
 
-                    db_logger.debug(f"Query executed in {execution_time:.3f}s, returned {len(records)} records")
+                    if db_logger.isEnabledFor(logging.DEBUG):
+                        db_logger.debug(f"Query executed in {execution_time:.3f}s, returned {len(records)} records")
                     return records
                 finally:
                     session.close()
@@ -161,7 +167,8 @@ class GraphService:
                     records = [dict(record) for record in results]
                     execution_time = time.time() - start_time
 
-                    db_logger.debug(f"Query executed in {execution_time:.3f}s, returned {len(records)} records")
+                    if db_logger.isEnabledFor(logging.DEBUG):
+                        db_logger.debug(f"Query executed in {execution_time:.3f}s, returned {len(records)} records")
                     return records
 
         except Exception as e:
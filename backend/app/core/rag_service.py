@@ -3,22 +3,27 @@ import chromadb
 import logging
 import os
 import uuid
+import json
+import functools
 from typing import List, Dict, Any, Optional
 from .graph_service import GraphService
 from .entity_extraction_agent import EntityExtractionAgent
-from .embedding_service import EmbeddingService
+from .embedding_service import EmbeddingService, EmbeddingModelRegistry
+from .similarity_cache import get_similarity_cache, invalidate_similarity_cache, SIMILARITY_CACHE_CANDIDATES
+from .response_cache import get_response_cache, invalidate_response_cache, synthesis_mode
 from app.utils.semantic_chunker import SemanticChunker
 
-# Lazy import for heavy ML models
-_sentence_transformer = None
-
 def get_sentence_transformer():
-    """Lazy load SentenceTransformer to improve startup time"""
-    global _sentence_transformer
-    if _sentence_transformer is None:
-        from sentence_transformers import SentenceTransformer
-        _sentence_transformer = SentenceTransformer('all-MiniLM-L6-v2')
-    return _sentence_transformer
+    """Lazy load SentenceTransformer to improve startup time (shared with the embedding service)"""
+    return EmbeddingModelRegistry.get('all-MiniLM-L6-v2')
+
+# Shared HTTP session so MegaParse uploads reuse pooled connections
+_http_session = requests.Session()
+
+@functools.lru_cache(maxsize=None)
+def get_chroma_client(chroma_path: str):
+    """Return the process-wide ChromaDB client for a storage path"""
+    return chromadb.PersistentClient(path=chroma_path)
 
 # Database logging setup
 os.makedirs("logs", exist_ok=True)
@@ -60,7 +65,7 @@ class RAGService:
             db_logger.info(f"Attempting to connect to ChromaDB at {chroma_path}")
 
             # Initialize ChromaDB client
-            self.chroma_client = chromadb.PersistentClient(path=chroma_path)
+            self.chroma_client = get_chroma_client(chroma_path)
 
             # Create or get collection for this project
             self.collection_name = f"project_{project_id}"
@@ -131,7 +136,7 @@ class RAGService:
 
                 try:
                     # Try to parse with MegaParse
-                    response = requests.post(
+                    response = _http_session.post(
                         megaparse_url,
                         files={"file": f},
                         timeout=30  # Add timeout
@@ -145,8 +150,8 @@ class RAGService:
 
                 except (requests.exceptions.RequestException, ValueError) as parse_error:
                     # Fallback: try to read file content directly for text files
-                    print(f"Warning: MegaParse failed for {file_path}: {parse_error}")
-                    print("Attempting direct file reading...")
+                    db_logger.warning(f"MegaParse failed for {file_path}: {parse_error}")
+                    db_logger.debug("Attempting direct file reading...")
 
                     try:
                         # Reset file pointer
@@ -161,7 +166,7 @@ class RAGService:
                             content = f"Document: {filename}\nFile type: {file_path.split('.')[-1] if '.' in file_path else 'unknown'}\nNote: Content extraction failed, file processed as binary."
 
                     except Exception as read_error:
-                        print(f"Warning: Direct file reading also failed: {read_error}")
+                        db_logger.warning(f"Direct file reading also failed: {read_error}")
                         filename = os.path.basename(file_path)
                         content = f"Document: {filename}\nFile type: {file_path.split('.')[-1] if '.' in file_path else 'unknown'}\nNote: Content extraction failed."
 
@@ -282,6 +287,15 @@ class RAGService:
 
     def _batch_insert_chunks(self, chunks: List[str], doc_id: str):
         """Insert chunks in batches using ChromaDB"""
+        try:
+            self._insert_chunk_batches(chunks, doc_id)
+        finally:
+            # Cached retrieval results and answers no longer reflect the collection
+            invalidate_similarity_cache(self.project_id)
+            invalidate_response_cache(self.project_id)
+
+    def _insert_chunk_batches(self, chunks: List[str], doc_id: str):
+        """Insert chunks batch by batch, falling back to individual inserts on failure"""
         try:
             # Process chunks in batches
             for batch_start in range(0, len(chunks), self.batch_size):
@@ -546,8 +560,16 @@ class RAGService:
         if self.collection is None:
             raise Exception("RAG service is not available (ChromaDB not connected). Please ensure ChromaDB is initialized.")
 
+        # Agents often repeat or reword a question; answer those from the response cache
+        response_cache = get_response_cache(self.project_id, synthesis_mode(self.llm))
+        cached_response = response_cache.get(question, n_results)
+        if cached_response is not None:
+            db_logger.info("Serving query from response cache (exact match)")
+            return cached_response
+
         try:
             # Generate embedding for the question (only if using local vectorization)
+            question_embedding = None
             if self.use_weaviate_vectorizer:  # Reuse this flag for built-in embeddings
                 # Use ChromaDB's built-in embeddings - just pass the query text
                 query_texts = [question]
@@ -563,6 +585,11 @@ class RAGService:
                     db_logger.error(f"Error loading embedding model: {str(e)}")
                     return "RAG service configuration error: Could not load embedding model."
 
+                cached_response = response_cache.lookup(question_embedding, n_results)
+                if cached_response is not None:
+                    db_logger.info("Serving query from response cache (similar question)")
+                    return cached_response
+
             # Perform search using ChromaDB
             try:
                 if self.use_weaviate_vectorizer:  # Use ChromaDB's built-in embeddings
@@ -571,11 +598,31 @@ class RAGService:
                         n_results=n_results
                     )
                 else:
-                    # Use vector search with local embeddings
-                    results = self.collection.query(
-                        query_embeddings=query_embeddings,
-                        n_results=n_results
-                    )
+                    # Reuse the candidates of a near-duplicate earlier query when possible;
+                    # otherwise fetch a larger candidate list so later queries can reuse it
+                    similarity_cache = get_similarity_cache(self.project_id)
+                    cached = similarity_cache.lookup(question_embedding, n_results)
+                    if cached:
+                        db_logger.info("Serving vector search from similarity cache")
+                        results = {'documents': [cached[0]], 'metadatas': [cached[1]]}
+                    else:
+                        results = self.collection.query(
+                            query_embeddings=query_embeddings,
+                            n_results=max(n_results, SIMILARITY_CACHE_CANDIDATES),
+                            include=['documents', 'metadatas', 'embeddings']
+                        )
+                        candidate_embeddings = results.get('embeddings')
+                        if results['documents'][0] and candidate_embeddings is not None:
+                            similarity_cache.store(
+                                question_embedding,
+                                candidate_embeddings[0],
+                                results['documents'][0],
+                                results['metadatas'][0]
+                            )
+                        results = {
+                            'documents': [results['documents'][0][:n_results]],
+                            'metadatas': [results['metadatas'][0][:n_results]]
+                        }
 
                 db_logger.info(f"Found {len(results['documents'][0])} results for query")
 
@@ -593,9 +640,14 @@ class RAGService:
 
                     # If LLM is available, synthesize a coherent response
                     if self.llm and docs:
-                        return self._synthesize_response(question, docs)
+                        response = self._synthesize_response(question, docs)
+                        if response is None:
+                            # Raw context fallback; not cached so the next ask retries synthesis
+                            return "\n\n".join(docs)
                     else:
-                        return "\n\n".join(docs)
+                        response = "\n\n".join(docs)
+                    response_cache.store(question, question_embedding, n_results, response)
+                    return response
                 else:
                     db_logger.warning("No results found in vector search")
                     return "No relevant information found in the knowledge base."
@@ -615,8 +667,8 @@ class RAGService:
             db_logger.error(f"Error in vector search: {str(e)}")
             return "Error occurred while searching the knowledge base."
 
-    def _synthesize_response(self, question: str, context_docs: list) -> str:
-        """Use LLM to synthesize a coherent response from retrieved context."""
+    def _synthesize_response(self, question: str, context_docs: list) -> Optional[str]:
+        """Use LLM to synthesize a coherent response from retrieved context; None if synthesis failed."""
         try:
             # Combine all context documents
             context = "\n\n".join(context_docs)
@@ -633,39 +685,128 @@ Please provide a clear, detailed answer based on the information in the context.
 
 Answer:"""
 
-            # Get response from LLM with proper method detection
-            try:
-                if hasattr(self.llm, 'invoke'):
-                    response = self.llm.invoke(synthesis_prompt)
-                elif hasattr(self.llm, 'generate'):
-                    response = self.llm.generate([synthesis_prompt])
-                elif hasattr(self.llm, '__call__'):
-                    response = self.llm(synthesis_prompt)
-                else:
-                    db_logger.error(f"LLM object {type(self.llm)} has no recognized method (invoke, generate, __call__)")
-                    return "\n\n".join(context_docs)
-            except Exception as llm_error:
-                db_logger.error(f"LLM invocation failed: {str(llm_error)}")
-                return "\n\n".join(context_docs)
-
-            # Extract content from response (handle different LLM response formats)
-            if hasattr(response, 'content'):
-                synthesized_answer = response.content
-            elif isinstance(response, str):
-                synthesized_answer = response
-            elif hasattr(response, 'generations') and response.generations:
-                # Handle LangChain LLMResult format
-                synthesized_answer = response.generations[0][0].text
-            else:
-                synthesized_answer = str(response)
+            synthesized_answer = self._invoke_llm(synthesis_prompt)
+            if synthesized_answer is None:
+                return None
 
             db_logger.info("Successfully synthesized response using LLM")
             return synthesized_answer
 
         except Exception as e:
             db_logger.error(f"Error synthesizing response with LLM: {str(e)}")
-            # Fallback to raw context if LLM synthesis fails
-            return "\n\n".join(context_docs)
+            return None
+
+    def _invoke_llm(self, prompt: str) -> Optional[str]:
+        """Send a prompt to the LLM and return the response text, or None if the call failed."""
+        # Get response from LLM with proper method detection
+        try:
+            if hasattr(self.llm, 'invoke'):
+                response = self.llm.invoke(prompt)
+            elif hasattr(self.llm, 'generate'):
+                response = self.llm.generate([prompt])
+            elif hasattr(self.llm, '__call__'):
+                response = self.llm(prompt)
+            else:
+                db_logger.error(f"LLM object {type(self.llm)} has no recognized method (invoke, generate, __call__)")
+                return None
+        except Exception as llm_error:
+            db_logger.error(f"LLM invocation failed: {str(llm_error)}")
+            return None
+
+        # Extract content from response (handle different LLM response formats)
+        if hasattr(response, 'content'):
+            return response.content
+        elif isinstance(response, str):
+            return response
+        elif hasattr(response, 'generations') and response.generations:
+            # Handle LangChain LLMResult format
+            return response.generations[0][0].text
+        return str(response)
+
+    def batch_query(self, questions: List[str], n_results: int = 5) -> List[str]:
+        """Answer several questions with one embedding call, one vector search and one LLM call."""
+        if self.collection is None:
+            raise Exception("RAG service is not available (ChromaDB not connected). Please ensure ChromaDB is initialized.")
+
+        response_cache = get_response_cache(self.project_id, synthesis_mode(self.llm))
+        answers: List[Optional[str]] = [response_cache.get(question, n_results) for question in questions]
+        pending = [i for i, answer in enumerate(answers) if answer is None]
+        if not pending:
+            return answers
+
+        db_logger.info(f"Batch querying ChromaDB collection {self.collection_name} with {len(pending)} questions")
+        try:
+            embeddings = None
+            if self.use_weaviate_vectorizer:
+                results = self.collection.query(
+                    query_texts=[questions[i] for i in pending],
+                    n_results=n_results
+                )
+            else:
+                # One encoder call for every question instead of one per question
+                embeddings = get_sentence_transformer().encode([questions[i] for i in pending]).tolist()
+                still_pending = []
+                for i, embedding in zip(pending, embeddings):
+                    answers[i] = response_cache.lookup(embedding, n_results)
+                    if answers[i] is None:
+                        still_pending.append((i, embedding))
+                if not still_pending:
+                    return answers
+                pending = [i for i, _ in still_pending]
+                embeddings = [embedding for _, embedding in still_pending]
+                results = self.collection.query(query_embeddings=embeddings, n_results=n_results)
+        except Exception as e:
+            db_logger.error(f"Batch vector search failed: {e}")
+            return [answer if answer is not None else "Error occurred while searching the knowledge base."
+                    for answer in answers]
+
+        all_metadatas = results.get('metadatas') or [[None] * len(documents) for documents in results['documents']]
+        contexts = [
+            [f"[From {(metadata or {}).get('filename', 'unknown')}]: {document}"
+             for document, metadata in zip(documents, metadatas)]
+            for documents, metadatas in zip(results['documents'], all_metadatas)
+        ]
+        pending_questions = [questions[i] for i in pending]
+        synthesized = self._synthesize_batch_response(pending_questions, contexts) if self.llm else None
+
+        for j, i in enumerate(pending):
+            if not contexts[j]:
+                answers[i] = "No relevant information found in the knowledge base."
+                continue
+            answers[i] = synthesized[j] if synthesized else "\n\n".join(contexts[j])
+            # Raw context stands in for a failed synthesis; only cache real answers
+            if synthesized or not self.llm:
+                response_cache.store(questions[i], embeddings[j] if embeddings else None, n_results, answers[i])
+        return answers
+
+    def _synthesize_batch_response(self, questions: List[str], contexts: List[List[str]]) -> Optional[List[str]]:
+        """Answer all questions in one LLM call; None if the response cannot be used."""
+        sections = "\n\n".join(
+            f"<Q{n}>{question}</Q{n}>\n<C{n}>\n" + ("\n\n".join(context) or "No context found.") + f"\n</C{n}>"
+            for n, (question, context) in enumerate(zip(questions, contexts), start=1)
+        )
+        prompt = f"""You are an expert cloud migration consultant. Answer each numbered question below using only the context given with it (<Cn> belongs to <Qn>). If a context doesn't contain enough information, say what is available and what is missing.
+
+{sections}
+
+Respond with ONLY a JSON array of {len(questions)} strings, where element n is the answer to question n. No other text."""
+
+        text = self._invoke_llm(prompt)
+        if text is None:
+            return None
+        text = text.strip()
+        if text.startswith("```"):
+            text = text.strip("`").removeprefix("json").strip()
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            db_logger.warning("Batch synthesis response was not valid JSON; returning raw context")
+            return None
+        if not isinstance(parsed, list) or len(parsed) != len(questions):
+            db_logger.warning("Batch synthesis response did not contain one answer per question")
+            return None
+        db_logger.info(f"Synthesized {len(questions)} answers in one LLM call")
+        return [answer if isinstance(answer, str) else json.dumps(answer) for answer in parsed]
 
     def cleanup(self):
         """Clean up resources and connections"""
@@ -0,0 +1,295 @@
+"""
+Response Cache - Reuse of final RAG answers for repeated and reworded questions
+Exact matches are served from a normalised-text lookup, near-duplicates by embedding similarity
+"""
+
+import numpy as np
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from .vector_ops import topk_cosine
+
+logger = logging.getLogger(__name__)
+
+# Cached answers older than this are not served from memory
+RESPONSE_CACHE_TTL_SECONDS = 300
+
+# Answers are also persisted to SQLite so they survive restarts; set RESPONSE_CACHE_DB
+# to an empty string to disable. An answer that expired from memory is reloaded from the
+# store, so answers are served for up to PERSISTED_TTL_SECONDS (a day); freshness relies
+# on every chunk ingest invalidating the project. A project's in-memory cache is warmed
+# with its most-hit answers when first used.
+RESPONSE_CACHE_DB = os.getenv("RESPONSE_CACHE_DB", "./data/response_cache.db")
+PERSISTED_TTL_SECONDS = 24 * 3600
+# Bumped whenever the meaning of a persisted row changes; rows of other versions are ignored
+SCHEMA_VERSION = 2
+WARM_ENTRIES = 128
+# Most similar cached questions checked per semantic lookup
+LOOKUP_CANDIDATES = 8
+# Synthesis mode of services without an LLM, whose answers are the joined raw context
+RAW_CONTEXT = "raw"
+
+
+class PersistentResponseStore:
+    """SQLite table of answers, keyed by project, synthesis mode, n_results and normalised question"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+        if columns and 'schema_version' not in columns:
+            # Written before answers were keyed by synthesis mode; none of its rows are usable
+            self._conn.execute("DROP TABLE responses")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "project_id TEXT NOT NULL, synthesis TEXT NOT NULL, n_results INTEGER NOT NULL, "
+            "query_key TEXT NOT NULL, embedding BLOB, response TEXT NOT NULL, hits INTEGER NOT NULL DEFAULT 0, "
+            "created_at INTEGER NOT NULL, schema_version INTEGER NOT NULL, "
+            "PRIMARY KEY (project_id, synthesis, n_results, query_key))"
+        )
+
+    def get(self, project_id: str, synthesis: str, n_results: int,
+            query_key: str) -> Optional[Tuple[Optional[bytes], str]]:
+        """Return (embedding, response) for a fresh row and count the hit, or None"""
+        cutoff = int(time.time()) - PERSISTED_TTL_SECONDS
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT embedding, response FROM responses WHERE project_id = ? AND synthesis = ? "
+                "AND n_results = ? AND query_key = ? AND created_at >= ? AND schema_version = ?",
+                (project_id, synthesis, n_results, query_key, cutoff, SCHEMA_VERSION)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE responses SET hits = hits + 1 WHERE project_id = ? AND synthesis = ? "
+                    "AND n_results = ? AND query_key = ?",
+                    (project_id, synthesis, n_results, query_key)
+                )
+        return row
+
+    def put(self, project_id: str, synthesis: str, n_results: int, query_key: str,
+            embedding: Optional[bytes], response: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (project_id, synthesis, n_results, query_key, embedding, "
+                "response, hits, created_at, schema_version) VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)",
+                (project_id, synthesis, n_results, query_key, embedding, response, int(time.time()), SCHEMA_VERSION)
+            )
+
+    def hottest(self, project_id: str, synthesis: str, limit: int) -> List[Tuple[int, str, Optional[bytes], str]]:
+        """(n_results, query_key, embedding, response) of the most-hit fresh rows"""
+        cutoff = int(time.time()) - PERSISTED_TTL_SECONDS
+        with self._lock:
+            return self._conn.execute(
+                "SELECT n_results, query_key, embedding, response FROM responses "
+                "WHERE project_id = ? AND synthesis = ? AND created_at >= ? AND schema_version = ? "
+                "ORDER BY hits DESC LIMIT ?",
+                (project_id, synthesis, cutoff, SCHEMA_VERSION, limit)
+            ).fetchall()
+
+    def delete_project(self, project_id: str) -> None:
+        """Delete a project's answers of every synthesis mode"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE project_id = ?", (project_id,))
+
+
+_store: Optional[PersistentResponseStore] = None
+_store_opened = False
+
+
+def _get_store() -> Optional[PersistentResponseStore]:
+    """Open the persistent store on first use; None when disabled or unavailable"""
+    global _store, _store_opened
+    if not _store_opened:
+        _store_opened = True
+        if RESPONSE_CACHE_DB:
+            try:
+                _store = PersistentResponseStore(RESPONSE_CACHE_DB)
+            except Exception as e:
+                logger.warning(f"Persistent response cache disabled: {e}")
+    return _store
+
+
+class ResponseCache:
+    """
+    Per-project two-level cache of RAG answers produced in one synthesis mode.
+
+    L1 maps the normalised question text (plus n_results) to its answer. L2 holds the
+    question embeddings stacked in a normalised matrix; a question whose cosine
+    similarity with a cached one is >= threshold gets that question's answer. With a
+    persistent store, L1 misses fall back to it and every stored answer is written to it.
+
+    synthesis names how answers were produced (see synthesis_mode); services that join raw
+    context and services that synthesize with an LLM never share answers.
+    """
+
+    def __init__(self, threshold: float = 0.95, capacity: int = 512, ttl: float = RESPONSE_CACHE_TTL_SECONDS,
+                 project_id: Optional[str] = None, store: Optional[PersistentResponseStore] = None,
+                 synthesis: str = RAW_CONTEXT):
+        self.threshold = threshold
+        self.capacity = capacity
+        self.ttl = ttl
+        self.project_id = project_id
+        self.synthesis = synthesis
+        self._store = store
+        self._lock = Lock()
+        self._exact: "OrderedDict[Tuple[int, str], Tuple[float, str]]" = OrderedDict()
+        self._query_matrix: Optional[np.ndarray] = None
+        self._entries: List[Tuple[float, int, str]] = []
+
+    @staticmethod
+    def _key(question: str, n_results: int) -> Tuple[int, str]:
+        return n_results, " ".join(question.lower().split())
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, question: str, n_results: int) -> Optional[str]:
+        """L1 (then the persistent store): answer cached for the same question text, or None"""
+        key = self._key(question, n_results)
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is not None:
+                if time.monotonic() - entry[0] <= self.ttl:
+                    self._exact.move_to_end(key)
+                    return entry[1]
+                del self._exact[key]
+
+        if self._store is None:
+            return None
+        try:
+            row = self._store.get(self.project_id, self.synthesis, n_results, key[1])
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent response cache lookup failed: {e}")
+            return None
+        if row is None:
+            return None
+        embedding, response = row
+        self._remember(key, np.frombuffer(embedding, dtype=np.float32) if embedding else None, response)
+        return response
+
+    def warm(self) -> None:
+        """Load the project's most-hit persisted answers into memory"""
+        if self._store is None:
+            return
+        try:
+            rows = self._store.hottest(self.project_id, self.synthesis, min(WARM_ENTRIES, self.capacity))
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent response cache warm-up failed: {e}")
+            return
+        # Least-hit first, so the hottest answers are the last to be evicted
+        for n_results, query_key, embedding, response in reversed(rows):
+            self._remember((n_results, query_key), np.frombuffer(embedding, dtype=np.float32) if embedding else None, response)
+        if rows:
+            logger.debug(f"Warmed response cache for project {self.project_id} with {len(rows)} answers")
+
+    def lookup(self, query_embedding, n_results: int) -> Optional[str]:
+        """L2: answer cached for a semantically equivalent question, or None"""
+        query = self._normalize(query_embedding)
+        now = time.monotonic()
+        with self._lock:
+            if self._query_matrix is None or self._query_matrix.shape[1] != query.shape[0]:
+                return None
+            for i, similarity in zip(*topk_cosine(query, self._query_matrix, LOOKUP_CANDIDATES)):
+                if similarity < self.threshold:
+                    return None
+                stored_at, entry_n_results, response = self._entries[i]
+                if entry_n_results == n_results and now - stored_at <= self.ttl:
+                    return response
+        return None
+
+    def store(self, question: str, query_embedding, n_results: int, response: str) -> None:
+        """Cache the answer for a question (query_embedding may be None for L1 only)"""
+        key = self._key(question, n_results)
+        vector = self._normalize(query_embedding) if query_embedding is not None else None
+        self._remember(key, vector, response)
+        if self._store is not None:
+            try:
+                self._store.put(self.project_id, self.synthesis, n_results, key[1],
+                                vector.tobytes() if vector is not None else None, response)
+            except sqlite3.Error as e:
+                logger.warning(f"Persistent response cache write failed: {e}")
+
+    def _remember(self, key: Tuple[int, str], query_embedding, response: str) -> None:
+        """Put an answer into the in-memory levels"""
+        n_results = key[0]
+        now = time.monotonic()
+        with self._lock:
+            self._exact[key] = (now, response)
+            self._exact.move_to_end(key)
+            if len(self._exact) > self.capacity:
+                self._exact.popitem(last=False)
+
+            if query_embedding is None:
+                return
+            row = self._normalize(query_embedding)[np.newaxis, :]
+            if self._query_matrix is not None and self._query_matrix.shape[1] != row.shape[1]:
+                self._entries = []
+                self._query_matrix = None
+            if len(self._entries) >= self.capacity:
+                self._entries.pop(0)
+                self._query_matrix = self._query_matrix[1:]
+            self._entries.append((now, n_results, response))
+            if self._query_matrix is None or len(self._query_matrix) == 0:
+                self._query_matrix = row
+            else:
+                self._query_matrix = np.vstack([self._query_matrix, row])
+
+    def clear(self) -> None:
+        """Drop the cached answers held in memory (e.g. after the collection changed)"""
+        with self._lock:
+            self._exact.clear()
+            self._entries = []
+            self._query_matrix = None
+
+
+def synthesis_mode(llm) -> str:
+    """How a RAG service with this LLM produces answers: RAW_CONTEXT, or the LLM class and model"""
+    if llm is None:
+        return RAW_CONTEXT
+    model = getattr(llm, 'model_name', None) or getattr(llm, 'model', None) or ''
+    return f"{type(llm).__name__}:{model}"
+
+
+_project_caches: Dict[Tuple[str, str], ResponseCache] = {}
+_project_caches_lock = Lock()
+
+
+def get_response_cache(project_id: str, synthesis: str = RAW_CONTEXT) -> ResponseCache:
+    """Get the response cache for a project's answers of one synthesis mode"""
+    key = (project_id, synthesis)
+    with _project_caches_lock:
+        cache = _project_caches.get(key)
+        if cache is None:
+            cache = _project_caches[key] = ResponseCache(project_id=project_id, store=_get_store(),
+                                                         synthesis=synthesis)
+            cache.warm()
+        return cache
+
+
+def invalidate_response_cache(project_id: str) -> None:
+    """Invalidate cached answers of every synthesis mode for a project"""
+    with _project_caches_lock:
+        caches = [cache for key, cache in _project_caches.items() if key[0] == project_id]
+    for cache in caches:
+        cache.clear()
+    # Answers may also be persisted by this or an earlier process
+    store = _get_store()
+    if store is not None:
+        try:
+            store.delete_project(project_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent response cache clear failed: {e}")
+    logger.debug(f"Invalidated response cache for project {project_id}")
@@ -0,0 +1,70 @@
+"""
+Service Pool - Process-wide RAG and graph services shared by crews and tools
+Services are created on first use and reused until they idle out or are invalidated
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from threading import Lock
+import logging
+import time
+
+from .rag_service import RAGService, get_chroma_client
+from .graph_service import GraphService
+
+logger = logging.getLogger(__name__)
+
+# RAG services are keyed by (project_id, id(llm)); the LLM is kept in the entry so its id
+# cannot be reused while cached. Entries idle for longer than the TTL are evicted.
+SERVICE_TTL_SECONDS = 600
+_rag_services: Dict[Tuple[str, int], Tuple[float, Any, RAGService]] = {}
+_graph_service: Optional[GraphService] = None
+_pool_lock = Lock()
+
+
+def get_rag_service(project_id: str, llm) -> RAGService:
+    """Get a shared RAGService for the project and LLM, creating it on first use"""
+    key = (project_id, id(llm))
+    now = time.monotonic()
+    with _pool_lock:
+        for stale_key in [k for k, (last_used, _, _) in _rag_services.items() if now - last_used > SERVICE_TTL_SECONDS]:
+            del _rag_services[stale_key]
+        entry = _rag_services.get(key)
+        if entry is not None and entry[1] is llm:
+            _rag_services[key] = (now, llm, entry[2])
+            return entry[2]
+
+    rag_service = RAGService(project_id, llm)
+    with _pool_lock:
+        _rag_services[key] = (now, llm, rag_service)
+    return rag_service
+
+
+def get_graph_service() -> GraphService:
+    """Get the process-wide GraphService (backed by the pooled Neo4j driver)"""
+    global _graph_service
+    with _pool_lock:
+        if _graph_service is None:
+            _graph_service = GraphService()
+        return _graph_service
+
+
+def invalidate_rag_services(project_id: Optional[str] = None) -> None:
+    """Drop cached RAG services for a project (all projects when None)"""
+    with _pool_lock:
+        for key in [k for k in _rag_services if project_id is None or k[0] == project_id]:
+            del _rag_services[key]
+
+
+def close_all() -> None:
+    """Release all pooled services and close the Neo4j driver (for shutdown)"""
+    global _graph_service
+    with _pool_lock:
+        _rag_services.clear()
+        graph_service, _graph_service = _graph_service, None
+    get_chroma_client.cache_clear()
+    if graph_service is not None:
+        try:
+            graph_service.close()
+        except Exception as e:
+            logger.warning(f"Error closing graph service: {e}")
+    logger.info("Service pool closed")
@@ -0,0 +1,105 @@
+"""
+Similarity Cache - Locality-aware reuse of vector search results
+Serves near-duplicate RAG queries from the larger top-k candidate list of an earlier query
+"""
+
+import numpy as np
+import logging
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from .vector_ops import topk_cosine
+
+logger = logging.getLogger(__name__)
+
+# Candidates fetched per vector search so later, similar queries can be re-ranked from them
+SIMILARITY_CACHE_CANDIDATES = 20
+
+
+class SimilarityCache:
+    """
+    Per-project cache of (query embedding, candidate documents).
+
+    A new query whose embedding has cosine similarity >= threshold with a cached query
+    is answered by re-ranking that query's candidates against the new embedding, instead
+    of probing the vector database again. Cached query embeddings are kept stacked in a
+    single normalised matrix so the scan is one matrix-vector product.
+    """
+
+    def __init__(self, threshold: float = 0.92, capacity: int = 256):
+        self.threshold = threshold
+        self.capacity = capacity
+        self._lock = Lock()
+        self._query_matrix: Optional[np.ndarray] = None
+        self._entries: List[Tuple[np.ndarray, List[str], List[Dict[str, Any]]]] = []
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def lookup(self, query_embedding, n_results: int) -> Optional[Tuple[List[str], List[Dict[str, Any]]]]:
+        """Return (documents, metadatas) re-ranked for the query, or None on a miss"""
+        query = self._normalize(query_embedding)
+        with self._lock:
+            if self._query_matrix is None or self._query_matrix.shape[1] != query.shape[0]:
+                return None
+            similarities = self._query_matrix @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            doc_matrix, documents, metadatas = self._entries[best]
+
+        if len(documents) < n_results:
+            return None
+
+        order, _ = topk_cosine(query, doc_matrix, n_results)
+        return [documents[i] for i in order], [metadatas[i] for i in order]
+
+    def store(self, query_embedding, doc_embeddings, documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Cache the candidate documents retrieved for a query"""
+        query = self._normalize(query_embedding)
+        doc_matrix = self._normalize(doc_embeddings)
+        with self._lock:
+            if self._query_matrix is not None and self._query_matrix.shape[1] != query.shape[0]:
+                self._entries = []
+                self._query_matrix = None
+            if len(self._entries) >= self.capacity:
+                self._entries.pop(0)
+                self._query_matrix = self._query_matrix[1:]
+            self._entries.append((doc_matrix, list(documents), list(metadatas)))
+            row = query[np.newaxis, :]
+            if self._query_matrix is None or len(self._query_matrix) == 0:
+                self._query_matrix = row
+            else:
+                self._query_matrix = np.vstack([self._query_matrix, row])
+
+    def clear(self) -> None:
+        """Drop all cached results (e.g. after the collection changed)"""
+        with self._lock:
+            self._entries = []
+            self._query_matrix = None
+
+
+_project_caches: Dict[str, SimilarityCache] = {}
+_project_caches_lock = Lock()
+
+
+def get_similarity_cache(project_id: str) -> SimilarityCache:
+    """Get the similarity cache for a project"""
+    with _project_caches_lock:
+        cache = _project_caches.get(project_id)
+        if cache is None:
+            cache = _project_caches[project_id] = SimilarityCache()
+        return cache
+
+
+def invalidate_similarity_cache(project_id: str) -> None:
+    """Invalidate cached retrieval results for a project"""
+    with _project_caches_lock:
+        cache = _project_caches.get(project_id)
+    if cache is not None:
+        cache.clear()
+        logger.debug(f"Invalidated similarity cache for project {project_id}")
@@ -0,0 +1,67 @@
+"""
+Vector Ops - Top-k cosine scoring shared by the retrieval caches
+Uses a Numba-compiled kernel when numba is installed, NumPy otherwise
+"""
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _topk_numpy(query: np.ndarray, matrix: np.ndarray, k: int):
+    scores = matrix @ query
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.argsort(-scores[candidates], kind='stable')]
+    return order, scores[order]
+
+
+if NUMBA_AVAILABLE:
+    # cache=True keeps the compiled kernel on disk, so later processes skip the JIT
+    @njit(cache=True, fastmath=True)
+    def _topk_numba(query, matrix, k):
+        n, dim = matrix.shape
+        scores = np.empty(n, dtype=np.float32)
+        for i in range(n):
+            total = np.float32(0.0)
+            for j in range(dim):
+                total += matrix[i, j] * query[j]
+            scores[i] = total
+        order = np.argsort(-scores)[:k]
+        return order, scores[order]
+
+
+def topk_cosine(query: np.ndarray, matrix: np.ndarray, k: int):
+    """
+    (indices, scores) of the k rows of matrix most similar to query, best first.
+
+    Both query and the rows of matrix must already be L2-normalised float32 vectors, so
+    the cosine similarity is a plain dot product.
+    """
+    k = min(k, len(matrix))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        return _topk_numba(np.ascontiguousarray(query, dtype=np.float32),
+                           np.ascontiguousarray(matrix, dtype=np.float32), k)
+    return _topk_numpy(query, matrix, k)
+
+
+def warm_up() -> None:
+    """Compile the kernel now so the first real query does not pay for the JIT"""
+    global NUMBA_AVAILABLE
+    if NUMBA_AVAILABLE:
+        try:
+            topk_cosine(np.ones(4, dtype=np.float32), np.ones((2, 4), dtype=np.float32), 1)
+        except Exception as e:
+            logger.warning(f"Numba top-k kernel unavailable, using NumPy: {e}")
+            NUMBA_AVAILABLE = False
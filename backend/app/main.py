@@ -10,7 +10,7 @@ from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
-from fastapi import FastAPI, UploadFile, File, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, UploadFile, File, WebSocket, WebSocketDisconnect, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Any, Set, Optional
 from pydantic import BaseModel
@@ -19,8 +19,10 @@ import psutil
 import docker
 import time
 from app.core.rag_service import RAGService
+from app.core.similarity_cache import invalidate_similarity_cache
+from app.core.response_cache import invalidate_response_cache
 from app.core.graph_service import GraphService
-from app.core.crew import create_assessment_crew, get_llm_and_model, get_project_llm
+from app.core.crew import create_assessment_crew, LogHandlerPool, get_llm_and_model, aget_project_llm, aget_project_llm_tiers, invalidate_llm_config_cache, refresh_llm_env
 # from app.core.crew_loader import create_assessment_crew_from_config, get_crew_definitions, update_crew_definitions
 from app.core.project_service import ProjectServiceClient, ProjectCreate
 
@@ -521,6 +523,8 @@ def invalidate_llm_cache():
     global last_cache_update, llm_configurations_cache
     last_cache_update = None
     llm_configurations_cache = {}
+    invalidate_llm_config_cache()
+    refresh_llm_env()
 
 # Pydantic models for API requests/responses
 class QueryRequest(BaseModel):
@@ -686,6 +690,11 @@ async def clear_project_data(project_id: str):
                         name=collection_name,
                         metadata={"description": f"Document embeddings for project {project_id}"}
                     )
+                    invalidate_similarity_cache(project_id)
+                    invalidate_response_cache(project_id)
+                    # Cached RAG services still hold the deleted collection
+                    from app.core.crew_factory import invalidate_project_services
+                    invalidate_project_services(project_id)
                     logger.info(f"Cleared {cleared_items['chromadb_embeddings']} embeddings from ChromaDB")
                 else:
                     logger.info("No embeddings found to clear in ChromaDB")
@@ -782,7 +791,7 @@ async def query_project_knowledge(project_id: str, query_request: QueryRequest):
 
         # Get project-specific LLM - NO FALLBACKS
         try:
-            llm = get_project_llm(project)
+            llm = await aget_project_llm(project)
             logger.info(f"Using project LLM: {project.llm_provider}/{project.llm_model}")
         except Exception as llm_error:
             logger.error(f"Project LLM configuration error: {str(llm_error)}")
@@ -924,7 +933,7 @@ async def get_project_service_status(project_id: str):
 
         # Initialize RAG service to check status
         try:
-            llm = get_project_llm(project)
+            llm = await aget_project_llm(project)
             rag_service = RAGService(project_id, llm)
             status = rag_service.get_service_status()
             rag_service.cleanup()  # Clean up resources
@@ -1874,7 +1883,7 @@ async def process_project_documents(project_id: str, request: dict):
         try:
             # Initialize LLM for entity extraction
             logger.info(f"Project LLM config: provider={getattr(project, 'llm_provider', 'None')}, model={getattr(project, 'llm_model', 'None')}, api_key_id={getattr(project, 'llm_api_key_id', 'None')}")
-            llm = get_project_llm(project)
+            llm = await aget_project_llm(project)
             logger.info(f"Successfully initialized LLM: {type(llm).__name__}")
             rag_service = RAGService(project_id, llm)
 
@@ -2068,6 +2077,8 @@ async def delete_project(project_id: str):
     try:
         project_service = get_project_service()
         result = project_service.delete_project(project_id)
+        from app.core.crew_factory import invalidate_project_services
+        invalidate_project_services(project_id)
         return result
     except Exception as e:
         logger.error(f"Error deleting project {project_id}: {str(e)}")
@@ -2868,7 +2879,7 @@ This infrastructure requires assessment for cloud migration planning.
             # Try to get project-specific LLM configuration, but continue without it
             llm = None
             try:
-                llm = get_project_llm(project)
+                llm = await aget_project_llm(project)
                 await websocket.send_text(f"SUCCESS: LLM initialized with {project.llm_provider}/{project.llm_model}")
                 await websocket.send_text(f"INFO: Entity extraction will use AI-powered methods")
             except Exception as llm_error:
@@ -3019,7 +3030,10 @@ This infrastructure requires assessment for cloud migration planning.
             await websocket.send_text("Initializing AI agents...")
             # Use dynamic crew loader for configurable agents
             # crew = create_assessment_crew_from_config(project_id, llm, websocket=websocket)
-            crew = create_assessment_crew(project_id, llm, websocket) # Fallback to original crew
+            # Discovery and compliance agents run on the provider's fast model, the
+            # architect and planner on the project's model
+            llm_tiers = await aget_project_llm_tiers(project, llm)
+            crew = create_assessment_crew(project_id, llm, websocket, llm_tiers=llm_tiers) # Fallback to original crew
             await websocket.send_text("AI agents initialized. Starting assessment...")
 
             # Send agentic log for initialization
@@ -3048,7 +3062,10 @@ This infrastructure requires assessment for cloud migration planning.
             }))
 
             # Run the blocking crew.kickoff in a separate thread to keep the event loop free
-            result = await asyncio.to_thread(crew.kickoff)
+            try:
+                result = await asyncio.to_thread(crew.kickoff)
+            finally:
+                LogHandlerPool.release_crew(crew)
 
             await websocket.send_text("Assessment completed successfully!")
 
@@ -3199,7 +3216,7 @@ async def _generate_professional_reports(project_id: str, markdown_content: str,
 
 from app.models.crew_interaction import CrewInteractionModel, CrewInteraction, FilterOptions, UserDisplayPreferences
 from app.core.crew_logger import crew_logger_registry
-from sqlalchemy import desc, and_, or_
+from sqlalchemy import desc, and_, or_, cast, Text
 from sqlalchemy.orm import Session
 
 @app.websocket("/ws/crew-interactions/{project_id}")
@@ -3308,10 +3325,12 @@ async def get_crew_interactions(
             query = query.filter(CrewInteractionModel.type == interaction_type)
 
         if search:
-            # Search across multiple text fields
+            # Search across multiple text fields; tool payloads are stored only as JSONB
             search_filter = or_(
                 CrewInteractionModel.request_text.ilike(f"%{search}%"),
                 CrewInteractionModel.response_text.ilike(f"%{search}%"),
+                cast(CrewInteractionModel.request_data, Text).ilike(f"%{search}%"),
+                cast(CrewInteractionModel.response_data, Text).ilike(f"%{search}%"),
                 CrewInteractionModel.agent_name.ilike(f"%{search}%"),
                 CrewInteractionModel.tool_name.ilike(f"%{search}%"),
                 CrewInteractionModel.function_name.ilike(f"%{search}%")
@@ -3506,7 +3525,7 @@ async def process_documents_ws(websocket: WebSocket, project_id: str):
 
         # Initialize LLM and RAG service
         try:
-            llm = get_project_llm(project)
+            llm = await aget_project_llm(project)
             rag_service = RAGService(project_id, llm)
             await websocket.send_text("RAG service initialized successfully")
         except Exception as e:
@@ -3637,8 +3656,8 @@ async def generate_document_ws(websocket: WebSocket, project_id: str):
 
         # Create LLM instance using project's assigned configuration only
         try:
-            from app.core.crew import get_project_crewai_llm
-            llm = get_project_crewai_llm(project)
+            from app.core.crew import aget_project_crewai_llm
+            llm = await aget_project_crewai_llm(project)
             await websocket.send_text(f"[SUCCESS] Using project LLM: {project.llm_provider}/{project.llm_model}")
         except Exception as llm_error:
             await websocket.send_text(f"[ERROR] LLM configuration error: {str(llm_error)}")
@@ -3698,10 +3717,13 @@ async def generate_document_ws(websocket: WebSocket, project_id: str):
         # Execute crew to generate document with progress tracking
         try:
             await websocket.send_text(f"STEP: Step 2 of 6: Starting document research phase...")
-            await websocket.send_text(f"DEBUG: Research Specialist -> Content Architect -> Quality Reviewer")
+            await websocket.send_text(f"DEBUG: Research Specialist (research + structure) -> Quality Reviewer")
             await websocket.send_text(f"WAIT: This process typically takes 3-5 minutes...")
 
-            result = await asyncio.to_thread(crew.kickoff)
+            try:
+                result = await asyncio.to_thread(crew.kickoff)
+            finally:
+                LogHandlerPool.release_crew(crew)
             await websocket.send_text(f"SUCCESS: Step 2 Complete: Document generation completed successfully")
         except Exception as execution_error:
             await websocket.send_text(f"ERROR: Step 2 Failed: Document generation failed: {str(execution_error)}")
@@ -3844,7 +3866,8 @@ async def generate_document_ws(websocket: WebSocket, project_id: str):
         await websocket.send_text(f"COMPLETE: Document generation complete! Generated {len(download_urls)} file format(s)")
         await websocket.send_json(result_data)
 
-        # Clean up logger
+        # Clean up logger once its queued interactions are stored
+        await crew_logger.flush()
         crew_logger_registry.remove_logger(project_id, task_id)
 
     except Exception as e:
@@ -3879,8 +3902,8 @@ async def generate_document(project_id: str, request: dict):
         logger.info(f"[LLM] Starting LLM initialization for project {project_id}")
         try:
             logger.info(f"[LLM] Getting project's assigned LLM configuration...")
-            from app.core.crew import get_project_crewai_llm
-            llm = get_project_crewai_llm(project)
+            from app.core.crew import aget_project_crewai_llm
+            llm = await aget_project_crewai_llm(project)
             logger.info(f"[LLM] Successfully created LLM: {project.llm_provider}/{project.llm_model}")
         except Exception as llm_error:
             logger.error(f"[LLM] Failed to create LLM from project configuration: {str(llm_error)}")
@@ -4238,23 +4261,27 @@ async def get_crew_definitions_endpoint():
         stats = crew_config_service.get_statistics()
         validation = crew_config_service.validate_references()
 
-        return {
-            "success": True,
-            "data": {
-                "agents": config.get('agents', []),
-                "tasks": config.get('tasks', []),
-                "crews": config.get('crews', []),
-                "available_tools": config.get('available_tools', []),
-                "statistics": stats,
-                "validation": validation
-            }
-        }
+        # Serialized directly (orjson when available) instead of through FastAPI's encoder
+        return Response(
+            content=crew_config_service.to_json({
+                "success": True,
+                "data": {
+                    "agents": config.get('agents', []),
+                    "tasks": config.get('tasks', []),
+                    "crews": config.get('crews', []),
+                    "available_tools": config.get('available_tools', []),
+                    "statistics": stats,
+                    "validation": validation
+                }
+            }),
+            media_type="application/json"
+        )
     except Exception as e:
         logger.error(f"Error getting crew definitions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error loading crew definitions: {str(e)}")
 
 @app.put("/api/crew-definitions")
-async def update_crew_definitions_endpoint(config: Dict[str, Any]):
+async def update_crew_definitions_endpoint(request: Request):
     """
     Update crew definitions with new configuration.
     Validates and saves the new configuration to YAML file.
@@ -4263,8 +4290,10 @@ async def update_crew_definitions_endpoint(config: Dict[str, Any]):
         from app.core.crew_config_service import crew_config_service
 
         # Basic validation
-        if not isinstance(config, dict):
-            raise HTTPException(status_code=400, detail="Configuration must be a valid JSON object")
+        try:
+            config = crew_config_service.parse_configuration_json(await request.body())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         required_keys = ['agents', 'tasks', 'crews', 'available_tools']
         for key in required_keys:
@@ -4715,6 +4744,13 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Error during backend startup: {str(e)}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled RAG/graph services and the Neo4j driver"""
+    from app.core.service_pool import close_all
+    close_all()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Agent log frames are batched JSON with repeated keys, so per-message deflate pays off
+    uvicorn.run(app, host="0.0.0.0", port=8000, ws="websockets", ws_per_message_deflate=True)
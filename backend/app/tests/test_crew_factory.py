@@ -0,0 +1,77 @@
+"""
+Tests for the model selection of the assessment crew
+"""
+
+import pytest
+import os
+import sys
+from types import SimpleNamespace
+from typing import Any, List
+from unittest.mock import Mock
+
+pytest.importorskip("crewai")
+from pydantic import BaseModel
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.core import crew
+from app.core.crew import LogHandlerPool, TokenStreamHandler, get_project_llm_tiers
+from app.core.crew_factory import _assessment_llms
+
+
+class FakeChatModel(BaseModel):
+    """Stands in for a LangChain chat model (pydantic, with streaming and callbacks fields)"""
+    model_name: str = "gpt-4o"
+    streaming: bool = False
+    callbacks: List[Any] = []
+
+
+PROJECT = SimpleNamespace(llm_provider='openai', llm_model='gpt-4o', llm_temperature='0.1',
+                          llm_max_tokens='4000', llm_api_key_id=None)
+
+
+class TestAssessmentLLMs:
+    """The tiers resolved the way main.py resolves them reach the assessment agents"""
+
+    def setup_method(self):
+        self.log_handler = LogHandlerPool.acquire(Mock())
+
+    def test_planner_streams_the_project_model(self, monkeypatch):
+        llm = FakeChatModel()
+        monkeypatch.setattr(crew, '_build_project_llm', lambda project, model=None: FakeChatModel(model_name=model))
+        monkeypatch.setattr(crew, '_llm_instance_cache', {})
+
+        llms = _assessment_llms(llm, get_project_llm_tiers(PROJECT, llm), self.log_handler)
+
+        planner = llms['planner']
+        assert planner.streaming and planner.model_name == "gpt-4o"
+        assert isinstance(planner.callbacks[0], TokenStreamHandler)
+        assert planner.callbacks[0].stream == 'report'
+        assert llms['fast'].model_name == crew.LLM_ENV.openai_fast_model
+        assert not llm.streaming
+
+    def test_architect_streams_the_draft(self, monkeypatch):
+        llm = FakeChatModel()
+        monkeypatch.setattr(crew, '_build_project_llm', lambda project, model=None: FakeChatModel(model_name=model))
+        monkeypatch.setattr(crew, '_llm_instance_cache', {})
+
+        llms = _assessment_llms(llm, get_project_llm_tiers(PROJECT, llm), self.log_handler)
+
+        architect = llms['architect']
+        assert architect.streaming and architect.model_name == "gpt-4o"
+        assert architect.callbacks[0].stream == 'architecture'
+        assert architect is not llms['planner']
+
+    def test_no_streaming_without_a_client(self, monkeypatch):
+        llm = FakeChatModel()
+        monkeypatch.setattr(crew, '_build_project_llm', lambda project, model=None: FakeChatModel(model_name=model))
+        monkeypatch.setattr(crew, '_llm_instance_cache', {})
+
+        llms = _assessment_llms(llm, get_project_llm_tiers(PROJECT, llm), None)
+
+        assert llms['planner'] is llm
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
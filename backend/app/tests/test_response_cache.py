@@ -0,0 +1,196 @@
+"""
+Tests for the RAG response cache
+"""
+
+import pytest
+import os
+import sqlite3
+import sys
+
+np = pytest.importorskip("numpy")
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.core import response_cache
+from app.core.response_cache import PersistentResponseStore, ResponseCache, PERSISTED_TTL_SECONDS, synthesis_mode
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class FakeClock:
+    """Stands in for time.monotonic / time.time so expiry can be tested without sleeping"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache:
+    """Test the in-memory levels"""
+
+    def test_exact_hit_ignores_case_and_whitespace(self):
+        cache = ResponseCache()
+        cache.store("What  is the target cloud?", None, 5, "Azure")
+
+        assert cache.get("what is the target   cloud?", 5) == "Azure"
+        assert cache.get("what is the target cloud?", 3) is None
+        assert cache.get("Which regions?", 5) is None
+
+    def test_semantic_hit(self):
+        cache = ResponseCache(threshold=0.95)
+        cache.store("What is the target cloud?", unit(1, 0, 0), 5, "Azure")
+
+        assert cache.lookup(unit(1, 0.05, 0), 5) == "Azure"
+        assert cache.lookup(unit(1, 0.05, 0), 3) is None
+        assert cache.lookup(unit(0, 1, 0), 5) is None
+
+    def test_entries_expire(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(response_cache.time, 'monotonic', clock)
+        cache = ResponseCache(ttl=60)
+        cache.store("What is the target cloud?", unit(1, 0, 0), 5, "Azure")
+
+        clock.now += 59
+        assert cache.get("What is the target cloud?", 5) == "Azure"
+        assert cache.lookup(unit(1, 0, 0), 5) == "Azure"
+
+        clock.now += 61
+        assert cache.get("What is the target cloud?", 5) is None
+        assert cache.lookup(unit(1, 0, 0), 5) is None
+
+    def test_capacity_evicts_oldest(self):
+        cache = ResponseCache(capacity=2)
+        cache.store("first", unit(1, 0, 0), 5, "one")
+        cache.store("second", unit(0, 1, 0), 5, "two")
+        cache.store("third", unit(0, 0, 1), 5, "three")
+
+        assert cache.get("first", 5) is None
+        assert cache.lookup(unit(1, 0, 0), 5) is None
+        assert cache.get("second", 5) == "two"
+        assert cache.lookup(unit(0, 0, 1), 5) == "three"
+
+    def test_clear(self):
+        cache = ResponseCache()
+        cache.store("What is the target cloud?", unit(1, 0, 0), 5, "Azure")
+        cache.clear()
+
+        assert cache.get("What is the target cloud?", 5) is None
+        assert cache.lookup(unit(1, 0, 0), 5) is None
+
+
+class TestPersistentResponseStore:
+    """Test persistence, warm-up and invalidation through SQLite"""
+
+    def setup_method(self):
+        self.store = None
+
+    def teardown_method(self):
+        if self.store is not None:
+            self.store._conn.close()
+
+    def open_store(self, tmp_path) -> PersistentResponseStore:
+        self.store = PersistentResponseStore(str(tmp_path / "responses.db"))
+        return self.store
+
+    def test_answers_survive_a_new_cache(self, tmp_path):
+        store = self.open_store(tmp_path)
+        ResponseCache(project_id="p1", store=store).store("What is the target cloud?", unit(1, 0, 0), 5, "Azure")
+
+        cache = ResponseCache(project_id="p1", store=store)
+        assert cache.get("what is the target cloud?", 5) == "Azure"
+        # The persisted row also restores the semantic level
+        assert cache.lookup(unit(1, 0, 0), 5) == "Azure"
+        assert ResponseCache(project_id="p2", store=store).get("What is the target cloud?", 5) is None
+
+    def test_persisted_answers_expire(self, tmp_path, monkeypatch):
+        clock = FakeClock(1_700_000_000)
+        monkeypatch.setattr(response_cache.time, 'time', clock)
+        store = self.open_store(tmp_path)
+        ResponseCache(project_id="p1", store=store).store("What is the target cloud?", None, 5, "Azure")
+
+        clock.now += PERSISTED_TTL_SECONDS + 1
+        assert ResponseCache(project_id="p1", store=store).get("What is the target cloud?", 5) is None
+
+    def test_warm_loads_hottest_answers(self, tmp_path, monkeypatch):
+        store = self.open_store(tmp_path)
+        writer = ResponseCache(project_id="p1", store=store)
+        writer.store("cold", unit(1, 0, 0), 5, "cold answer")
+        writer.store("hot", unit(0, 1, 0), 5, "hot answer")
+        for _ in range(3):
+            ResponseCache(project_id="p1", store=store).get("hot", 5)
+
+        monkeypatch.setattr(response_cache, 'WARM_ENTRIES', 1)
+        cache = ResponseCache(project_id="p1", store=store)
+        cache.warm()
+
+        assert list(cache._exact) == [(5, "hot")]
+        assert cache.lookup(unit(0, 1, 0), 5) == "hot answer"
+        assert cache.lookup(unit(1, 0, 0), 5) is None
+
+    def test_invalidate_clears_persisted_answers(self, tmp_path, monkeypatch):
+        store = self.open_store(tmp_path)
+        monkeypatch.setattr(response_cache, '_store', store)
+        monkeypatch.setattr(response_cache, '_store_opened', True)
+        monkeypatch.setattr(response_cache, '_project_caches', {})
+        ResponseCache(project_id="p1", store=store).store("What is the target cloud?", None, 5, "Azure")
+        ResponseCache(project_id="p2", store=store).store("What is the target cloud?", None, 5, "GCP")
+
+        # p1 has no in-memory cache in this process; its persisted answers still go
+        response_cache.invalidate_response_cache("p1")
+
+        assert response_cache.get_response_cache("p1").get("What is the target cloud?", 5) is None
+        assert response_cache.get_response_cache("p2").get("What is the target cloud?", 5) == "GCP"
+
+    def test_synthesis_modes_do_not_share_answers(self, tmp_path, monkeypatch):
+        store = self.open_store(tmp_path)
+        monkeypatch.setattr(response_cache, '_store', store)
+        monkeypatch.setattr(response_cache, '_store_opened', True)
+        monkeypatch.setattr(response_cache, '_project_caches', {})
+
+        class FakeChatModel:
+            model_name = "gpt-4o"
+
+        synthesized = synthesis_mode(FakeChatModel())
+        assert synthesized != synthesis_mode(None)
+        response_cache.get_response_cache("p1", synthesis_mode(None)).store(
+            "What is the target cloud?", unit(1, 0, 0), 5, "[From plan.md]: Azure")
+        response_cache.get_response_cache("p1", synthesized).store(
+            "What is the target cloud?", unit(1, 0, 0), 5, "The target cloud is Azure.")
+
+        # Fresh caches read the persisted rows of their own mode only
+        assert ResponseCache(project_id="p1", store=store, synthesis=synthesized).get(
+            "What is the target cloud?", 5) == "The target cloud is Azure."
+        assert ResponseCache(project_id="p1", store=store).get(
+            "What is the target cloud?", 5) == "[From plan.md]: Azure"
+
+        response_cache.invalidate_response_cache("p1")
+        assert response_cache.get_response_cache("p1", synthesized).get("What is the target cloud?", 5) is None
+        assert response_cache.get_response_cache("p1").lookup(unit(1, 0, 0), 5) is None
+
+    def test_rows_of_the_old_schema_are_dropped(self, tmp_path):
+        path = str(tmp_path / "responses.db")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE responses (project_id TEXT NOT NULL, n_results INTEGER NOT NULL, query_key TEXT NOT NULL, "
+            "embedding BLOB, response TEXT NOT NULL, hits INTEGER NOT NULL DEFAULT 0, created_at INTEGER NOT NULL, "
+            "PRIMARY KEY (project_id, n_results, query_key))"
+        )
+        conn.execute("INSERT INTO responses VALUES ('p1', 5, 'what is the target cloud?', NULL, 'stale', 0, 4102444800)")
+        conn.commit()
+        conn.close()
+
+        self.store = PersistentResponseStore(path)
+        cache = ResponseCache(project_id="p1", store=self.store)
+        assert cache.get("What is the target cloud?", 5) is None
+        cache.store("What is the target cloud?", None, 5, "Azure")
+        assert ResponseCache(project_id="p1", store=self.store).get("What is the target cloud?", 5) == "Azure"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,82 @@
+"""
+Tests for the vector search similarity cache
+"""
+
+import pytest
+import os
+import sys
+
+np = pytest.importorskip("numpy")
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.core import similarity_cache
+from app.core.similarity_cache import SimilarityCache
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+DOCUMENTS = ["web tier", "database tier", "batch jobs"]
+METADATAS = [{"filename": "web.md"}, {"filename": "db.md"}, {"filename": "batch.md"}]
+DOC_EMBEDDINGS = [unit(1, 0, 0), unit(0, 1, 0), unit(0, 0, 1)]
+
+
+class TestSimilarityCache:
+    """Test reuse of retrieval candidates for near-duplicate queries"""
+
+    def test_similar_query_reranks_candidates(self):
+        cache = SimilarityCache(threshold=0.92)
+        cache.store(unit(1, 1, 0), DOC_EMBEDDINGS, DOCUMENTS, METADATAS)
+
+        documents, metadatas = cache.lookup(unit(1, 1.2, 0), 2)
+        assert documents == ["database tier", "web tier"]
+        assert metadatas == [{"filename": "db.md"}, {"filename": "web.md"}]
+
+    def test_dissimilar_query_misses(self):
+        cache = SimilarityCache(threshold=0.92)
+        cache.store(unit(1, 1, 0), DOC_EMBEDDINGS, DOCUMENTS, METADATAS)
+
+        assert cache.lookup(unit(0, 0, 1), 2) is None
+
+    def test_too_few_candidates_misses(self):
+        cache = SimilarityCache()
+        cache.store(unit(1, 0, 0), DOC_EMBEDDINGS, DOCUMENTS, METADATAS)
+
+        assert cache.lookup(unit(1, 0, 0), len(DOCUMENTS) + 1) is None
+
+    def test_dimension_change_resets(self):
+        cache = SimilarityCache()
+        cache.store(unit(1, 0, 0), DOC_EMBEDDINGS, DOCUMENTS, METADATAS)
+
+        assert cache.lookup(unit(1, 0, 0, 0), 1) is None
+        cache.store(unit(1, 0, 0, 0), [unit(1, 0, 0, 0)], ["other"], [{}])
+        assert cache.lookup(unit(1, 0, 0), 1) is None
+        assert cache.lookup(unit(1, 0, 0, 0), 1) == (["other"], [{}])
+
+    def test_capacity_evicts_oldest(self):
+        cache = SimilarityCache(capacity=2)
+        cache.store(unit(1, 0, 0), DOC_EMBEDDINGS, ["first"] * 3, METADATAS)
+        cache.store(unit(0, 1, 0), DOC_EMBEDDINGS, ["second"] * 3, METADATAS)
+        cache.store(unit(0, 0, 1), DOC_EMBEDDINGS, ["third"] * 3, METADATAS)
+
+        assert cache.lookup(unit(1, 0, 0), 1) is None
+        assert cache.lookup(unit(0, 1, 0), 1)[0] == ["second"]
+        assert cache.lookup(unit(0, 0, 1), 1)[0] == ["third"]
+
+    def test_invalidate_project(self, monkeypatch):
+        monkeypatch.setattr(similarity_cache, '_project_caches', {})
+        similarity_cache.get_similarity_cache("p1").store(unit(1, 0, 0), DOC_EMBEDDINGS, DOCUMENTS, METADATAS)
+        similarity_cache.get_similarity_cache("p2").store(unit(1, 0, 0), DOC_EMBEDDINGS, DOCUMENTS, METADATAS)
+
+        similarity_cache.invalidate_similarity_cache("p1")
+
+        assert similarity_cache.get_similarity_cache("p1").lookup(unit(1, 0, 0), 1) is None
+        assert similarity_cache.get_similarity_cache("p2").lookup(unit(1, 0, 0), 1) is not None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,70 @@
+"""
+Tests for the top-k cosine scoring kernel
+"""
+
+import pytest
+import os
+import sys
+
+np = pytest.importorskip("numpy")
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.core import vector_ops
+from app.core.vector_ops import topk_cosine
+
+
+def random_unit_rows(rows: int, dim: int, seed: int = 0):
+    matrix = np.random.default_rng(seed).standard_normal((rows, dim)).astype(np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+class TestTopkCosine:
+    """Test top-k selection over normalised rows"""
+
+    def test_best_first(self):
+        matrix = random_unit_rows(50, 16)
+        query = matrix[7]
+
+        indices, scores = topk_cosine(query, matrix, 5)
+
+        expected = np.argsort(-(matrix @ query))[:5]
+        assert list(indices) == list(expected)
+        assert indices[0] == 7
+        assert scores[0] == pytest.approx(1.0, abs=1e-5)
+        assert np.all(np.diff(scores) <= 0)
+
+    def test_k_larger_than_matrix(self):
+        matrix = random_unit_rows(3, 8)
+
+        indices, scores = topk_cosine(matrix[0], matrix, 10)
+
+        assert sorted(indices) == [0, 1, 2]
+        assert len(scores) == 3
+
+    def test_empty_matrix(self):
+        indices, scores = topk_cosine(np.ones(4, dtype=np.float32), np.empty((0, 4), dtype=np.float32), 3)
+
+        assert len(indices) == 0
+        assert len(scores) == 0
+
+
+@pytest.mark.skipif(not vector_ops.NUMBA_AVAILABLE, reason="numba not installed")
+class TestNumbaKernel:
+    """The Numba kernel must agree with the NumPy fallback"""
+
+    @pytest.mark.parametrize("rows,k", [(200, 1), (200, 10), (200, 200), (5, 8)])
+    def test_matches_numpy(self, rows, k):
+        matrix = random_unit_rows(rows, 32, seed=rows + k)
+        query = random_unit_rows(1, 32, seed=1)[0]
+
+        numba_indices, numba_scores = vector_ops._topk_numba(query, matrix, k)
+        numpy_indices, numpy_scores = vector_ops._topk_numpy(query, matrix, k)
+
+        assert list(numba_indices) == list(numpy_indices)
+        np.testing.assert_allclose(numba_scores, numpy_scores, rtol=1e-5, atol=1e-6)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,66 @@
+"""
+Batch Knowledge Base Tool - Answers several project questions in one RAG round-trip
+Embeds all questions together, runs one vector search and one LLM synthesis call
+"""
+
+from crewai.tools import BaseTool
+from typing import List, Union
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BatchKnowledgeBaseTool(BaseTool):
+    """
+    Batched variant of the project knowledge base query tool. Agents that need
+    many facts from the uploaded documents ask for all of them in a single call.
+    """
+    name: str = "Batch Knowledge Base Query Tool"
+    description: str = (
+        "Use this tool to ask SEVERAL questions about the client's project documents at once. "
+        "Pass all questions in a single call, one question per line. Answers are returned in "
+        "the same order. This is much faster than asking the questions one at a time."
+    )
+
+    def __init__(self, rag_service=None, **kwargs):
+        super().__init__(**kwargs)
+        # Use private attribute to avoid Pydantic validation
+        self._rag_service = rag_service
+
+    @property
+    def rag_service(self):
+        return self._rag_service
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def run(self, questions: Union[str, List[str]]) -> str:
+        """Executes all questions against the RAG service in one batch."""
+        if not self.rag_service:
+            return "Error: RAG service not initialized"
+
+        if isinstance(questions, str):
+            questions = questions.splitlines()
+        questions = [question.strip() for question in questions if question and question.strip()]
+        if not questions:
+            return "Error: no questions given. Pass one question per line."
+
+        try:
+            logger.debug(f"BatchKnowledgeBaseTool received {len(questions)} questions")
+            answers = self.rag_service.batch_query(questions)
+            return "\n\n".join(
+                f"Q{n}: {question}\nA{n}: {answer}"
+                for n, (question, answer) in enumerate(zip(questions, answers), start=1)
+            )
+        except Exception as e:
+            logger.error(f"Error in BatchKnowledgeBaseTool: {e}")
+            return f"Error querying knowledge base: {str(e)}"
+
+    def _run(self, questions: Union[str, List[str]]) -> str:
+        """Legacy method for older CrewAI versions."""
+        return self.run(questions)
+
+    async def _arun(self, questions: Union[str, List[str]]) -> str:
+        """Async version of _run; the blocking query runs in a worker thread."""
+        return await asyncio.to_thread(self.run, questions)
@@ -38,9 +38,10 @@ class GraphQueryTool(BaseTool):
             return "Error: Graph service not initialized"
         
         try:
-            logger.debug(f"GraphQueryTool received query: '{query}'")
+            logger.debug("GraphQueryTool received query: '%s'", query)
             result = self.graph_service.execute_query(query)
-            logger.debug(f"GraphQueryTool returning {len(str(result))} results")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("GraphQueryTool returning %d results", len(str(result)))
             return str(result)
         except Exception as e:
             logger.error(f"Error in GraphQueryTool: {e}")
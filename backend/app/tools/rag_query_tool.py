@@ -6,6 +6,7 @@ Moved from backend/app/core/crew.py for better organization
 from crewai.tools import BaseTool
 from typing import Optional, Any
 from pydantic import Field
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -41,9 +42,10 @@ class RAGQueryTool(BaseTool):
             return "Error: RAG service not initialized"
         
         try:
-            logger.debug(f"RAGQueryTool received query: '{question}'")
+            logger.debug("RAGQueryTool received query: '%s'", question)
             result = self.rag_service.query(question)
-            logger.debug(f"RAGQueryTool returning {len(str(result))} characters")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("RAGQueryTool returning %d characters", len(str(result)))
             return result
         except Exception as e:
             logger.error(f"Error in RAGQueryTool: {e}")
@@ -53,6 +55,6 @@ class RAGQueryTool(BaseTool):
         """Legacy method for older CrewAI versions."""
         return self.run(question)
 
-    def _arun(self, question: str) -> str:
-        """Async version of _run."""
-        return self.run(question)
+    async def _arun(self, question: str) -> str:
+        """Async version of _run; the blocking query runs in a worker thread."""
+        return await asyncio.to_thread(self.run, question)
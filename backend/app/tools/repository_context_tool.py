@@ -0,0 +1,52 @@
+"""
+Repository Context Search Tool - On-demand semantic search over project documents
+Wraps RAGQueryTool so that embedding + vector search only runs for semantic questions
+"""
+
+import re
+import logging
+from .rag_query_tool import RAGQueryTool
+
+logger = logging.getLogger(__name__)
+
+# Queries this short carry too little meaning for a useful embedding
+MIN_QUERY_TOKENS = 4
+
+# Structural requests ("give me the graph", "list the dependencies of X") are answered
+# by the graph tool; embedding them only costs a vector search with no benefit
+GRAPH_REQUEST_PATTERN = re.compile(
+    r"^\s*(give me|show(?: me)?|list|get|return|fetch)\b.*\b(graph|dependenc(?:y|ies)|relationships?|nodes|edges)\b",
+    re.IGNORECASE
+)
+
+
+class RepositoryContextSearchTool(RAGQueryTool):
+    """
+    Gated variant of RAGQueryTool exposed to agents that should only retrieve
+    document context on demand, instead of searching on every turn.
+    """
+    name: str = "search_repository_context"
+    description: str = (
+        "Semantic search over the uploaded project documents. Call this tool only when you need "
+        "descriptive context (business drivers, requirements, constraints, audit findings) that is "
+        "not already in your task context. Do NOT use it for structural questions about dependencies "
+        "or relationships between systems - use the Project Graph Database Query Tool for those."
+    )
+
+    def run(self, question: str) -> str:
+        """Skips the vector search for queries that do not benefit from it."""
+        if len(question.split()) < MIN_QUERY_TOKENS:
+            logger.debug("search_repository_context skipped short query: '%s'", question)
+            return (
+                "Query too short for semantic search. Ask a specific, complete question "
+                "about the project documents."
+            )
+
+        if GRAPH_REQUEST_PATTERN.search(question):
+            logger.debug("search_repository_context redirected structural query: '%s'", question)
+            return (
+                "This is a structural question. Use the Project Graph Database Query Tool "
+                "to explore dependencies and relationships."
+            )
+
+        return super().run(question)
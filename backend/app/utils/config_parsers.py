@@ -13,6 +13,9 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader when available; uploaded manifests can be large
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 class ConfigurationParser:
     """Parse various configuration file formats"""
     
@@ -242,7 +245,7 @@ class ConfigurationParser:
         elif filename.endswith(('.yml', '.yaml')):
             # Parse YAML file
             try:
-                yaml_data = yaml.safe_load(content)
+                yaml_data = yaml.load(content, Loader=_YAML_LOADER)
                 if isinstance(yaml_data, dict):
                     # Extract server port
                     if 'server' in yaml_data and 'port' in yaml_data['server']:
@@ -278,7 +281,7 @@ class ConfigurationParser:
         
         if 'docker-compose' in filename.lower():
             try:
-                docker_compose = yaml.safe_load(content)
+                docker_compose = yaml.load(content, Loader=_YAML_LOADER)
                 if 'services' in docker_compose:
                     for service_name, service_config in docker_compose['services'].items():
                         service_info = {'name': service_name}
@@ -319,7 +322,7 @@ class ConfigurationParser:
         }
         
         try:
-            k8s_resources = list(yaml.safe_load_all(content))
+            k8s_resources = list(yaml.load_all(content, Loader=_YAML_LOADER))
             
             for resource in k8s_resources:
                 if not resource:
@@ -34,8 +34,8 @@ class SemanticChunker:
         
         # Initialize sentence transformer if available
         try:
-            from sentence_transformers import SentenceTransformer
-            self.sentence_model = SentenceTransformer(model_name)
+            from app.core.embedding_service import EmbeddingModelRegistry
+            self.sentence_model = EmbeddingModelRegistry.get(model_name)
             logger.info(f"Initialized SentenceTransformer with model: {model_name}")
         except ImportError:
             logger.warning("sentence-transformers not available, falling back to rule-based chunking")
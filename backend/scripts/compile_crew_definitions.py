@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Compile crew_definitions.yaml into app/core/crew_definitions_compiled.py
+The loader imports the generated literal instead of parsing YAML while the module is newer than the YAML file
+"""
+
+import ast
+import os
+import pprint
+import sys
+import tempfile
+
+import yaml
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+YAML_PATH = os.path.join(BACKEND_DIR, "crew_definitions.yaml")
+OUTPUT_PATH = os.path.join(BACKEND_DIR, "app", "core", "crew_definitions_compiled.py")
+
+HEADER = (
+    '"""\n'
+    'Crew definitions compiled from crew_definitions.yaml\n'
+    'Generated by scripts/compile_crew_definitions.py; do not edit\n'
+    '"""\n\n'
+)
+
+
+def compile_crew_definitions(yaml_path: str = YAML_PATH, output_path: str = OUTPUT_PATH) -> str:
+    """Write the parsed YAML as a Python literal module and return the output path"""
+    with open(yaml_path, 'rb') as file:
+        config = yaml.load(file, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+    literal = pprint.pformat(config, width=120, sort_dicts=False)
+    # Only plain str/number/bool/None/list/dict values can round-trip through a literal
+    if ast.literal_eval(literal) != config:
+        raise ValueError(f"{yaml_path} contains values that cannot be written as a Python literal")
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(output_path), prefix='.crew_definitions_compiled.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(HEADER + f"CONFIG = {literal}\n")
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return output_path
+
+
+if __name__ == "__main__":
+    try:
+        print(f"Compiled crew definitions to {compile_crew_definitions(*sys.argv[1:3])}")
+    except Exception as e:
+        print(f"Error compiling crew definitions: {e}")
+        sys.exit(1)
@@ -18,6 +18,13 @@ os.environ['SERVICE_AUTH_TOKEN'] = 'service-backend-token'
 # Remove OpenAI dependency - using local embeddings
 # os.environ['OPENAI_API_KEY'] = 'your-openai-key-here'
 
+# Precompile crew definitions so the crew loader imports them instead of parsing YAML
+try:
+    from scripts.compile_crew_definitions import compile_crew_definitions
+    print(f"Compiled crew definitions to {compile_crew_definitions()}")
+except Exception as e:
+    print(f"Crew definitions not compiled, YAML will be parsed at startup: {e}")
+
 try:
     print("Starting backend import process...")
     from app.main import app
@@ -25,7 +32,7 @@ try:
 
     print("Starting uvicorn server...")
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, ws="websockets", ws_per_message_deflate=True)
 
 except Exception as e:
     print(f"Error starting backend: {e}")
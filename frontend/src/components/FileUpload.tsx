@@ -3,7 +3,7 @@ import { Button, Group, Stack, Text, Paper, Loader, Table, Badge, Card, Divider,
 import { Dropzone } from "@mantine/dropzone";
 import { IconFile, IconFolder, IconUpload, IconRefresh, IconAlertCircle, IconSettings, IconTestPipe, IconChevronDown, IconRobot, IconDatabase, IconCheck, IconList, IconGrid3x3, IconLayoutGrid, IconTrash, IconEye, IconEyeOff, IconDownload, IconPlayerPlay } from "@tabler/icons-react";
 import { v4 as uuidv4 } from "uuid";
-import { apiService, ProjectFile } from "../services/api";
+import { apiService, ProjectFile, withBatchedFrames } from "../services/api";
 import { notifications } from "@mantine/notifications";
 import LiveConsole from "./LiveConsole";
 import ReportDisplay from "./ReportDisplay";
@@ -46,6 +46,7 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
   const [logs, setLogs] = useState<string[]>([]);
   const [finalReport, setFinalReport] = useState<string>("");
   const [isReportStreaming, setIsReportStreaming] = useState<boolean>(false);
+  const [architectureDraft, setArchitectureDraft] = useState<string>("");
   const [loadingFiles, setLoadingFiles] = useState(false);
   const [assessmentStartTime, setAssessmentStartTime] = useState<Date | null>(null);
   const [showDetailedFileList, setShowDetailedFileList] = useState(false);
@@ -135,6 +136,7 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
     setLogs([]);
     setFinalReport("");
     setIsReportStreaming(false);
+    setArchitectureDraft("");
   };
 
   const handleFolderUpload = (event: React.ChangeEvent<HTMLInputElement>) => {
@@ -402,6 +404,7 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
       setIsAssessing(true);
       setAssessmentStartTime(new Date());
       setAgenticLogs([]);
+      setArchitectureDraft("");
 
       // Auto-show assessment progress
       setShowAssessmentProgress(true);
@@ -425,7 +428,7 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
       const ws = apiService.createAssessmentWebSocket(projectId);
       wsRef.current = ws;
 
-      ws.onmessage = (event) => {
+      ws.onmessage = withBatchedFrames((event) => {
         const msg = event.data;
         console.log('WebSocket message received:', msg); // Debug logging
 
@@ -443,6 +446,17 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
             setLogs(prev => [...prev, `[${parsedMessage.source}] ${parsedMessage.message}`]);
             return;
           }
+          if (parsedMessage.type === 'token' && parsedMessage.stream === 'architecture') {
+            // Streamed target architecture draft, shown until the report starts
+            setArchitectureDraft(prev => prev + parsedMessage.delta);
+            return;
+          }
+          if (parsedMessage.type === 'token') {
+            // Streamed report tokens; replaced by the full report between the FINAL_REPORT markers
+            setIsReportStreaming(true);
+            setFinalReport(prev => prev + parsedMessage.delta);
+            return;
+          }
         } catch {
           // If not JSON, continue with regular processing
         }
@@ -513,7 +527,7 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
           // Also add to global assessment context
           addLog(msg);
         }
-      };
+      });
 
       ws.onclose = () => {
         setIsAssessing(false);
@@ -584,6 +598,7 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
     setLogs([`Starting assessment with ${currentProject.llm_provider}/${currentProject.llm_model}...`]);
     setFinalReport("");
     setIsReportStreaming(false);
+    setArchitectureDraft("");
     setAgenticLogs([]);
 
     // Start assessment in global context
@@ -594,7 +609,7 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
       const ws = apiService.createAssessmentWebSocket(projectId);
       wsRef.current = ws;
 
-      ws.onmessage = (event) => {
+      ws.onmessage = withBatchedFrames((event) => {
         const msg = event.data;
         console.log('WebSocket message received:', msg); // Debug logging
 
@@ -612,6 +627,17 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
             setLogs(prev => [...prev, `[${parsedMessage.source}] ${parsedMessage.message}`]);
             return;
           }
+          if (parsedMessage.type === 'token' && parsedMessage.stream === 'architecture') {
+            // Streamed target architecture draft, shown until the report starts
+            setArchitectureDraft(prev => prev + parsedMessage.delta);
+            return;
+          }
+          if (parsedMessage.type === 'token') {
+            // Streamed report tokens; replaced by the full report between the FINAL_REPORT markers
+            setIsReportStreaming(true);
+            setFinalReport(prev => prev + parsedMessage.delta);
+            return;
+          }
         } catch {
           // If not JSON, continue with regular processing
         }
@@ -652,7 +678,7 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
           // Also add to global assessment context
           addLog(msg);
         }
-      };
+      });
 
       ws.onclose = () => {
         setIsAssessing(false);
@@ -772,13 +798,14 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
     setLogs(["Starting assessment with project-specific LLM configuration..."]);
     setFinalReport("");
     setIsReportStreaming(false);
+    setArchitectureDraft("");
 
     try {
       // Start assessment via WebSocket for existing files
       const ws = apiService.createAssessmentWebSocket(projectId);
       wsRef.current = ws;
 
-      ws.onmessage = (event) => {
+      ws.onmessage = withBatchedFrames((event) => {
         const msg = event.data;
 
         // Parse message to determine if it's agentic interaction
@@ -793,6 +820,17 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
             }]);
             return;
           }
+          if (parsedMessage.type === 'token' && parsedMessage.stream === 'architecture') {
+            // Streamed target architecture draft, shown until the report starts
+            setArchitectureDraft(prev => prev + parsedMessage.delta);
+            return;
+          }
+          if (parsedMessage.type === 'token') {
+            // Streamed report tokens; replaced by the full report between the FINAL_REPORT markers
+            setIsReportStreaming(true);
+            setFinalReport(prev => prev + parsedMessage.delta);
+            return;
+          }
         } catch {
           // If not JSON, continue with regular processing
         }
@@ -826,7 +864,7 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
         } else {
           setLogs((prev) => [...prev, msg]);
         }
-      };
+      });
 
       ws.onclose = () => setIsAssessing(false);
       ws.onerror = () => {
@@ -1690,6 +1728,16 @@ const FileUpload: React.FC<FileUploadProps> = ({ projectId: propProjectId, onFil
 
 
 
+      {/* Target architecture draft, streamed while the architect is writing */}
+      {architectureDraft && !finalReport && (
+        <Card shadow="sm" p="lg" radius="md" withBorder>
+          <Text size="lg" fw={600} mb="md">
+            Target Architecture (draft)
+          </Text>
+          <ReportDisplay report={architectureDraft} />
+        </Card>
+      )}
+
       {/* Final Report */}
       {finalReport && (
         <Card shadow="sm" p="lg" radius="md" withBorder>
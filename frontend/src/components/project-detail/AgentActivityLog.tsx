@@ -15,6 +15,7 @@ import {
   Box
 } from '@mantine/core';
 import { IconChevronDown, IconChevronRight, IconRobot, IconTool, IconAlertCircle, IconCheck } from '@tabler/icons-react';
+import { withBatchedFrames } from '../../services/api';
 
 interface AgentLogEntry {
   type: 'agent_action' | 'tool_result' | 'tool_error' | 'agent_finish' | 'agent_start';
@@ -51,7 +52,7 @@ const AgentActivityLog: React.FC<AgentActivityLogProps> = ({ projectId, isAssess
       // Connect to the assessment WebSocket to receive real-time logs
       const ws = new WebSocket(`ws://localhost:8000/ws/run_assessment/${projectId}`);
 
-      ws.onmessage = (event) => {
+      ws.onmessage = withBatchedFrames((event) => {
         try {
           const data = JSON.parse(event.data);
 
@@ -62,7 +63,7 @@ const AgentActivityLog: React.FC<AgentActivityLogProps> = ({ projectId, isAssess
         } catch (error) {
           // Ignore non-JSON messages (status updates, etc.)
         }
-      };
+      });
 
       ws.onclose = () => {
         setWebsocket(null);
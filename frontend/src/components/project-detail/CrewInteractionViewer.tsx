@@ -400,7 +400,9 @@ const CrewInteractionViewer: React.FC<CrewInteractionViewerProps> = ({ projectId
         i.tool_name?.toLowerCase().includes(query) ||
         i.function_name?.toLowerCase().includes(query) ||
         i.request_text?.toLowerCase().includes(query) ||
-        i.response_text?.toLowerCase().includes(query)
+        i.response_text?.toLowerCase().includes(query) ||
+        (i.request_data != null && JSON.stringify(i.request_data).toLowerCase().includes(query)) ||
+        (i.response_data != null && JSON.stringify(i.response_data).toLowerCase().includes(query))
       );
     }
 
@@ -377,6 +377,28 @@ class ApiService {
   }
 }
 
+/**
+ * Agent log messages on the assessment WebSocket are batched by the backend into a
+ * single frame holding a JSON array of the original messages. Wraps an onmessage
+ * handler so it is called once per original message, exactly as before batching.
+ */
+export function withBatchedFrames(handler: (event: MessageEvent) => void): (event: MessageEvent) => void {
+  return (event: MessageEvent) => {
+    if (typeof event.data === 'string' && event.data.startsWith('[')) {
+      try {
+        const frames = JSON.parse(event.data);
+        if (Array.isArray(frames) && frames.every(frame => typeof frame === 'string')) {
+          frames.forEach(frame => handler(new MessageEvent('message', { data: frame })));
+          return;
+        }
+      } catch {
+        // Not a batch, handle as a single message
+      }
+    }
+    handler(event);
+  };
+}
+
 // Export singleton instance
 export const apiService = new ApiService();
 export default apiService;